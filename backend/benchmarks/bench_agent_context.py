@@ -0,0 +1,61 @@
+"""Agent prompt size per loop iteration.
+
+Runs agent mode against the fake model backend (answering scoring prompts
+with the recorded Gemini response) in both output formats, for a score
+that stops after scoring, one that adds the outreach message and one that
+also notifies. Prints the size of the agent prompt sent in each iteration:
+only the first carries the profile and job, follow-ups carry the compact
+agent state and should stay flat.
+
+Usage:
+    python backend/benchmarks/bench_agent_context.py [--scores 40,70,95]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+# Every run must reach the model, so keep the result cache out of the measurement
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+os.environ.setdefault('NOTIFY_TRANSPORT', 'log')
+
+import recruitment_agent  # noqa: E402
+from recruitment_metrics import trace_analysis  # noqa: E402
+from recruitment_models import set_model  # noqa: E402
+from bench_agent_modes import fixture_backend  # noqa: E402
+
+
+def run_format(output_format, score, profile, job_description):
+    set_model(fixture_backend(0, score))
+    recruitment_agent.AGENT_OUTPUT_FORMAT = output_format
+    with trace_analysis() as trace:
+        result = recruitment_agent.run_recruitment_agent(profile, job_description, mode='agent', use_cache=False)
+    assert result['success'], result
+    return trace.to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scores', default='40,70,95', help='comma-separated match scores the model returns')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    print(f"{'format':<8}{'score':>6}  {'agent prompt chars per iteration':<40}{'total prompt chars':>19}")
+    for output_format in ('text', 'json'):
+        for score in (int(value) for value in args.scores.split(',')):
+            stats = run_format(output_format, score, profile, job_description)
+            sizes = ' '.join(f"{chars:>6}" for chars in stats['agent_prompt_chars'])
+            print(f"{output_format:<8}{score:>6}  {sizes:<40}{stats['prompt_chars']:>19}")
+
+
+if __name__ == '__main__':
+    main()
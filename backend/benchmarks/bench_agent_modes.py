@@ -0,0 +1,78 @@
+"""Compare LLM calls and latency per profile for the agent and pipeline modes.
+
+Runs run_recruitment_agent against the fake model backend, which answers the
+way the live model does in outputlog.txt, sleeping a fixed latency per call.
+No API key or network access is needed.
+
+Usage:
+    python backend/benchmarks/bench_agent_modes.py [--runs 5] [--latency 0.2] [--score 85]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+# Every run must reach the model, so keep the result cache out of the measurement
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+
+import recruitment_agent  # noqa: E402
+from recruitment_models import FakeBackend, set_model  # noqa: E402
+
+# Latency of one orchestration round trip observed in outputlog.txt
+OBSERVED_CALL_SECONDS = 11.0
+
+
+def fixture_backend(latency: float, score: int) -> FakeBackend:
+    """Fake Gemini answering scoring prompts with the recorded markdown response."""
+    with open(os.path.join(FIXTURES_DIR, 'gemini_score_response.md'), encoding='utf-8') as f:
+        markdown = f.read().replace('**Score:** 85', '**Score:** {score}')
+    return FakeBackend(latency=latency, score=score, score_markdown=markdown)
+
+
+def run_mode(mode, model, profile, job_description, runs):
+    set_model(model)
+    model.calls = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = recruitment_agent.run_recruitment_agent(profile, job_description, mode=mode)
+        assert result['success'], result
+    elapsed = time.perf_counter() - start
+    return model.calls / runs, elapsed / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.2, help='simulated seconds per LLM call')
+    parser.add_argument('--score', type=int, default=85, help='match score the model returns')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    model = fixture_backend(args.latency, args.score)
+    print(f"score={args.score} runs={args.runs} simulated latency={args.latency:.3f}s/call")
+    print(f"{'mode':<10}{'LLM calls':>12}{'s/profile':>12}{'projected s':>14}")
+    rows = {}
+    for mode in recruitment_agent.AGENT_MODES:
+        calls, seconds = run_mode(mode, model, profile, job_description, args.runs)
+        rows[mode] = (calls, seconds)
+        print(f"{mode:<10}{calls:>12.1f}{seconds:>12.3f}{calls * OBSERVED_CALL_SECONDS:>14.1f}")
+
+    agent_calls, agent_s = rows['agent']
+    pipeline_calls, pipeline_s = rows['pipeline']
+    print(f"pipeline saves {agent_calls - pipeline_calls:.1f} LLM calls "
+          f"({1 - pipeline_calls / agent_calls:.0%}) and {1 - pipeline_s / agent_s:.0%} latency per profile")
+    print(f"(projected column assumes {OBSERVED_CALL_SECONDS:.0f}s per call as in outputlog.txt)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Agent replies per output format when some of them come back malformed.
+
+Runs agent mode against the fake model backend with a share of its agent
+replies garbled (prose before the reply, truncated JSON, Python literals)
+and reports, per analysis, model calls, parse failures, repair calls and
+how often the repair budget ran out and the analysis finished as the
+pipeline. Every analysis must still succeed.
+
+Usage:
+    python backend/benchmarks/bench_agent_output.py [--runs 50] [--rates 0,0.1,0.3] [--score 95]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+# Every run must reach the model, so keep the result cache out of the measurement
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+os.environ.setdefault('NOTIFY_TRANSPORT', 'log')
+
+import recruitment_agent  # noqa: E402
+from recruitment_metrics import trace_analysis  # noqa: E402
+from recruitment_models import set_model  # noqa: E402
+from bench_agent_modes import fixture_backend  # noqa: E402
+
+
+def run_format(output_format, rate, score, profile, job_description, runs):
+    model = fixture_backend(0, score)
+    model.malformed_rate = rate
+    set_model(model)
+    recruitment_agent.AGENT_OUTPUT_FORMAT = output_format
+    fallbacks = 0
+    totals = {'llm_calls': 0, 'agent_parse_failures': 0, 'agent_repair_retries': 0, 'prompt_chars': 0}
+    for _ in range(runs):
+        with trace_analysis() as trace:
+            result = recruitment_agent.run_recruitment_agent(profile, job_description, mode='agent', use_cache=False)
+        assert result['success'], result
+        stats = trace.to_dict()
+        for key in totals:
+            totals[key] += stats[key]
+        fallbacks += stats['agent_outcome'] == 'fallback'
+    row = {key: value / runs for key, value in totals.items()}
+    row['fallback_pct'] = 100.0 * fallbacks / runs
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--rates', default='0,0.1,0.3', help='comma-separated shares of malformed agent replies')
+    parser.add_argument('--score', type=int, default=95, help='match score the model returns')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    print(f"per analysis, mean of {args.runs} runs, score {args.score}")
+    print(f"{'format':<8}{'malformed':>10}{'llm calls':>11}{'failures':>10}{'repairs':>9}{'fallback %':>12}"
+          f"{'prompt chars':>14}")
+    for output_format in ('text', 'json'):
+        for rate in (float(value) for value in args.rates.split(',')):
+            row = run_format(output_format, rate, args.score, profile, job_description, args.runs)
+            print(f"{output_format:<8}{rate:>10.2f}{row['llm_calls']:>11.2f}{row['agent_parse_failures']:>10.2f}"
+                  f"{row['agent_repair_retries']:>9.2f}{row['fallback_pct']:>12.1f}{row['prompt_chars']:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Measure /analyze_batch throughput at different concurrency settings.
+
+Posts one batch per concurrency level through Flask's test client, with the
+fake model backend standing in for Gemini.
+
+Usage:
+    python backend/benchmarks/bench_batch.py [--profiles 32] [--latency 0.2] [--levels 1,2,4,8]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from bench_agent_modes import FIXTURES_DIR, fixture_backend
+
+import recruitment_agent  # noqa: E402
+import recruitment_ai  # noqa: E402
+from recruitment_models import set_model  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.2, help='simulated seconds per LLM call')
+    parser.add_argument('--levels', default='1,2,4,8', help='comma separated concurrency levels')
+    parser.add_argument('--mode', default='pipeline', choices=recruitment_agent.AGENT_MODES)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    set_model(fixture_backend(args.latency, score=85))
+    recruitment_ai.BATCH_MAX_CONCURRENCY = max(int(level) for level in args.levels.split(','))
+    client = recruitment_ai.app.test_client()
+
+    print(f"profiles={args.profiles} mode={args.mode} simulated latency={args.latency:.3f}s/call")
+    print(f"{'concurrency':<12}{'seconds':>10}{'profiles/s':>12}{'speedup':>10}")
+    baseline = None
+    for level in (int(level) for level in args.levels.split(',')):
+        body = {
+            'profiles': [profile] * args.profiles,
+            'jobDescription': job_description,
+            'concurrency': level,
+            'mode': args.mode,
+            'bypassCache': True,
+        }
+        start = time.perf_counter()
+        response = client.post('/analyze_batch', json=body)
+        elapsed = time.perf_counter() - start
+        summary = response.get_json()['summary']
+        assert summary['failed'] == 0, summary
+        baseline = baseline or elapsed
+        print(f"{level:<12}{elapsed:>10.2f}{args.profiles / elapsed:>12.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Compare profile cleaning against the previous per-field BeautifulSoup version.
+
+Payloads:
+  text      the extension's innerText payload recorded in outputlog.txt
+  html      the same content wrapped in LinkedIn-style markup (rawHtml fallback)
+  html-min  the same markup without newlines between elements
+
+The cleaned text payload must match the previous version exactly; the run
+fails otherwise. HTML payloads may differ by design: block elements now
+break lines, so minified markup no longer runs adjacent blocks together.
+
+Usage:
+    python backend/benchmarks/bench_cleaning.py [--runs 50]
+"""
+import argparse
+import html
+import json
+import os
+import sys
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from recruitment_cleaning import clean_profile  # noqa: E402
+from recruitment_utils import prepare_score_content  # noqa: E402
+
+
+def legacy_clean_profile_data(profile_data):
+    """clean_profile_data as it was before recruitment_cleaning existed."""
+    if isinstance(profile_data, str):
+        text = BeautifulSoup(profile_data, 'html.parser').get_text()
+        text = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+        return text
+
+    if isinstance(profile_data, dict):
+        cleaned_data = {}
+        for key, value in profile_data.items():
+            if isinstance(value, str):
+                text = BeautifulSoup(value, 'html.parser').get_text()
+                cleaned_data[key] = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+            elif isinstance(value, list):
+                cleaned_data[key] = [
+                    '\n'.join(line.strip() for line in BeautifulSoup(item, 'html.parser').get_text().splitlines() if line.strip())
+                    if isinstance(item, str) else item
+                    for item in value
+                ]
+            else:
+                cleaned_data[key] = value
+        return cleaned_data
+
+    return profile_data
+
+
+def legacy_score_content(profile_content):
+    """Second BeautifulSoup pass calculate_profile_score used to make."""
+    text = BeautifulSoup(profile_content, 'html.parser').get_text()
+    return ' '.join(text.split())[:2000]
+
+
+def html_payload(profile, separator='\n'):
+    lines = profile['content'].splitlines()
+    markup = separator.join(
+        f'<div class="pvs-entity"><span aria-hidden="true">{html.escape(line)}</span>'
+        f'<span class="visually-hidden">{html.escape(line)}</span></div>'
+        for line in lines
+    )
+    page = f'<html><head><style>.a{{}}</style><script>var x = 1;</script></head><body><main>{markup}</main></body></html>'
+    return dict(profile, content=page, about=f'<p>{html.escape(profile["about"])}</p>')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    payloads = {'text': profile, 'html': html_payload(profile), 'html-min': html_payload(profile, separator='')}
+
+    print(f"{'payload':<10}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}{'same output':>13}")
+    for name, payload in payloads.items():
+        same = legacy_clean_profile_data(payload) == clean_profile(payload)
+        if name == 'text':
+            assert same, 'cleaned text payload differs from the previous implementation'
+
+        def legacy():
+            cleaned = legacy_clean_profile_data(payload)
+            legacy_score_content(cleaned['content'])
+
+        def new():
+            cleaned = clean_profile(payload)
+            prepare_score_content(cleaned['content'])
+
+        legacy_ms = min(timeit.repeat(legacy, number=1, repeat=args.runs)) * 1000
+        new_ms = min(timeit.repeat(new, number=1, repeat=args.runs)) * 1000
+        print(f"{name:<10}{legacy_ms:>12.3f}{new_ms:>10.3f}{legacy_ms / new_ms:>9.1f}x{'yes' if same else 'no':>13}")
+
+
+if __name__ == '__main__':
+    main()
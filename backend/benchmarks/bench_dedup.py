@@ -0,0 +1,147 @@
+"""Near-duplicate profile detection: accuracy on re-scraped pages and lookup cost at scale.
+
+Accuracy: the recorded LinkedIn profile is re-scraped with fresh counters,
+a different "People also viewed" block and a new feed item, and compared
+against the original and against other candidates whose page text is the
+same apart from their own fields (the hardest negatives).
+
+Scale: --entries synthetic signatures are loaded into an in-memory index
+spread over --jobs job descriptions, then --lookups queries are timed, half
+of them perturbed copies of stored signatures (should hit) and half random
+(should miss).
+
+Usage:
+    python backend/benchmarks/bench_dedup.py [--entries 100000] [--lookups 100000] [--jobs 20]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+from recruitment_agent import prepare_profile_content  # noqa: E402
+from recruitment_dedup import (  # noqa: E402
+    DEDUP_THRESHOLD, NUM_PERMUTATIONS, MinHashIndex, estimate_similarity, minhash_signature
+)
+
+FIRST_NAMES = ['Amit', 'Neha', 'Rahul', 'Sara', 'John', 'Priya', 'Wei', 'Maria']
+LAST_NAMES = ['Shah', 'Patel', 'Rao', 'Lee', 'Garcia', 'Kim']
+TITLES = ['Software Engineer', 'Data Scientist', 'Tech Lead', 'Engineering Manager']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli']
+
+
+def rescrape(profile, seed):
+    """The same profile as a later scrape would see it."""
+    rng = random.Random(seed)
+    content = re.sub(r'\d+', lambda m: str(rng.randint(1, 999)), profile['content'])
+    content = content.replace('Past 7 days', f'Past 7 days\nNew post from a connection #{seed}')
+    content += '\nPeople also viewed\n' + '\n'.join(
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} · 2nd\n{rng.choice(TITLES)} at {rng.choice(COMPANIES)}"
+        for _ in range(5)
+    )
+    return dict(profile, content=content)
+
+
+def other_candidate(profile, index):
+    name = f'{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index % len(LAST_NAMES)]}'
+    title = TITLES[index % len(TITLES)]
+    return dict(
+        profile, name=name, headline=f'{title} | Python, SQL',
+        about=f'{name} is a {title.lower()} working on data platforms.',
+        experience=[{'title': title, 'company': COMPANIES[index % len(COMPANIES)], 'duration': '2019 - Present',
+                     'description': f'{title} on the analytics team.'}],
+        skills=['Python', 'SQL', 'Airflow'],
+        content=profile['content'].replace(profile['name'], name),
+    )
+
+
+def accuracy(profile, samples):
+    base = minhash_signature(prepare_profile_content(profile))
+    same = [estimate_similarity(base, minhash_signature(prepare_profile_content(rescrape(profile, seed))))
+            for seed in range(samples)]
+    others = [estimate_similarity(base, minhash_signature(prepare_profile_content(other_candidate(profile, i))))
+              for i in range(samples)]
+    print(f"threshold {DEDUP_THRESHOLD}")
+    print(f"re-scraped same profile: similarity min {min(same):.3f} mean {np.mean(same):.3f}, "
+          f"detected {sum(s >= DEDUP_THRESHOLD for s in same)}/{samples}")
+    print(f"other candidates:        similarity max {max(others):.3f} mean {np.mean(others):.3f}, "
+          f"above threshold {sum(s >= DEDUP_THRESHOLD for s in others)}/{samples} "
+          f"(never matched in practice: entries are scoped by candidate name)")
+
+    text = prepare_profile_content(profile)
+    start = time.perf_counter()
+    for _ in range(200):
+        minhash_signature(text)
+    print(f"minhash_signature ({len(text)} chars): {(time.perf_counter() - start) / 200 * 1e6:.0f} us")
+
+
+def perturb(signature, rng, share=0.15):
+    """Copy of ``signature`` with ``share`` of its positions changed (~0.85 similarity)."""
+    copy = signature.copy()
+    positions = rng.choice(NUM_PERMUTATIONS, size=int(NUM_PERMUTATIONS * share), replace=False)
+    copy[positions] = rng.integers(0, 2 ** 32, size=len(positions), dtype=np.uint32)
+    return copy
+
+
+def scale(entries, lookups, jobs, seed):
+    rng = np.random.default_rng(seed)
+    index = MinHashIndex(':memory:')
+    signatures = rng.integers(0, 2 ** 32, size=(entries, NUM_PERMUTATIONS), dtype=np.uint32)
+    names = [f'candidate {i}' for i in range(entries)]
+    job_keys = [f'jd_{i % jobs}' for i in range(entries)]
+    result = {'success': True, 'matchScore': 80, 'match_analysis': '', 'key_qualifications': '', 'message': ''}
+
+    start = time.perf_counter()
+    for signature, job_key, name in zip(signatures, job_keys, names):
+        index.add_signature(signature, job_key, result, name)
+    print(f"\nloaded {entries} entries over {jobs} job(s) in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    hits = false_hits = 0
+    for i in range(lookups):
+        target = int(rng.integers(entries))
+        duplicate = i % 2 == 0
+        query = perturb(signatures[target], rng) if duplicate else \
+            rng.integers(0, 2 ** 32, size=NUM_PERMUTATIONS, dtype=np.uint32)
+        start = time.perf_counter()
+        match = index.find(query, job_keys[target], names[target])
+        timings.append(time.perf_counter() - start)
+        if duplicate and match is not None:
+            hits += 1
+        elif not duplicate and match is not None:
+            false_hits += 1
+
+    timings_us = np.array(timings) * 1e6
+    print(f"{lookups} lookups: p50 {np.percentile(timings_us, 50):.1f} us, p99 {np.percentile(timings_us, 99):.1f} us, "
+          f"max {timings_us.max():.1f} us")
+    print(f"near-duplicates found {hits}/{(lookups + 1) // 2}, false matches {false_hits}/{lookups // 2}")
+    print(f"avg candidates compared per lookup: {index.stats()['avg_candidates']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--samples', type=int, default=20, help='re-scrapes and other candidates for accuracy')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    accuracy(profile, args.samples)
+    scale(args.entries, args.lookups, args.jobs, args.seed)
+
+
+if __name__ == '__main__':
+    main()
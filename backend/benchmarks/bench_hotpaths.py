@@ -0,0 +1,216 @@
+"""Micro-benchmarks for the parsing and cleaning code that runs on every request.
+
+Each case is timed with timeit (median and best of --repeat runs, per call)
+and run once under tracemalloc for peak and retained bytes. Results are
+compared against baseline.json; a case is flagged when its best time (the
+least noisy estimate) or peak allocation grows more than --tolerance over
+the baseline.
+
+Fixtures: the recorded LinkedIn payload (legacy shape, with rawContent and
+pageContent copies), a 10x larger variant, LinkedIn-style raw HTML and the
+recorded Gemini scoring markdown.
+
+Usage:
+    python backend/benchmarks/bench_hotpaths.py                  # compare with baseline.json
+    python backend/benchmarks/bench_hotpaths.py --save           # record a new baseline
+    python backend/benchmarks/bench_hotpaths.py --filter extract --tolerance 0.5
+
+Exits with status 1 when any case regresses, so it can gate CI. Timings are
+machine dependent: record the baseline on the machine that compares against it.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(BACKEND_DIR, 'benchmarks')
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+sys.path.insert(0, BACKEND_DIR)
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+
+# recruitment_ai prints from its parsing helpers; keep that out of the report
+with contextlib.redirect_stdout(io.StringIO()):
+    import recruitment_ai  # noqa: E402
+from recruitment_actions import parse_agent_action  # noqa: E402
+from recruitment_agent import clean_profile_data, prepare_profile_content  # noqa: E402
+from recruitment_models import FakeBackend  # noqa: E402
+from recruitment_prompt import build_profile_prompt  # noqa: E402
+from recruitment_schema import normalize_profile  # noqa: E402
+from recruitment_utils import (  # noqa: E402
+    MarkdownSectionStream, build_score_prompt, extract_score, parse_score_response
+)
+
+
+def load_fixtures():
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.html'), encoding='utf-8') as f:
+        page_html = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'gemini_score_response.md'), encoding='utf-8') as f:
+        markdown = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    # outputlog.txt payloads run to hundreds of KB once the activity feed loads
+    large = dict(profile)
+    large['content'] = '\n'.join(profile['content'] for _ in range(10))
+    large['rawContent'] = dict(profile['rawContent'], fullPage=large['content'])
+    large['pageContent'] = dict(profile['pageContent'], text=large['content'])
+
+    # The replies the agent parses on its first iteration, in both output formats
+    profile_content = prepare_profile_content(profile)
+    agent_prompt = f"Query: Analyze profile:\nProfile: {json.dumps(profile_content)}\nJob: {job_description}"
+    function_call = FakeBackend(latency=0)._reply(agent_prompt)
+    json_action = FakeBackend(latency=0)._reply(agent_prompt, json_mode=True)
+
+    return {
+        'profile': profile,
+        'profile_large': large,
+        'compact': normalize_profile(profile),
+        'page_html': page_html,
+        'markdown': markdown,
+        'job_description': job_description,
+        'profile_content': profile_content,
+        'function_call': function_call,
+        'json_action': json_action,
+    }
+
+
+def stream_sections(markdown, chunk_size=64):
+    stream = MarkdownSectionStream()
+    for i in range(0, len(markdown), chunk_size):
+        stream.feed(markdown[i:i + chunk_size])
+    return stream.finish()
+
+
+def build_cases(fx):
+    """Case name -> zero-argument callable."""
+    return {
+        'clean_profile_data': lambda: clean_profile_data(fx['profile']),
+        'clean_profile_data[large]': lambda: clean_profile_data(fx['profile_large']),
+        'normalize_profile': lambda: normalize_profile(fx['profile']),
+        'normalize_profile[large]': lambda: normalize_profile(fx['profile_large']),
+        'build_profile_prompt': lambda: build_profile_prompt(fx['compact']),
+        'prepare_profile_content': lambda: prepare_profile_content(fx['compact']),
+        'build_score_prompt': lambda: build_score_prompt(fx['profile_content'], fx['job_description']),
+        'parse_agent_action[text]': lambda: parse_agent_action(fx['function_call'], 'text'),
+        'parse_agent_action[json]': lambda: parse_agent_action(fx['json_action'], 'json'),
+        'extract_score': lambda: extract_score(fx['markdown']),
+        'extract_score_from_text': lambda: recruitment_ai.extract_score_from_text(fx['markdown']),
+        'parse_score_response': lambda: parse_score_response(fx['markdown']),
+        'markdown_section_stream': lambda: stream_sections(fx['markdown']),
+        'extract_from_raw_html': lambda: recruitment_ai.extract_from_raw_html(fx['page_html']),
+    }
+
+
+def measure(func, repeat):
+    # Calibrate so one timing sample lasts roughly 20ms
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, number // 10)
+    samples = [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)]
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        func()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_before = tracemalloc.take_snapshot()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        # Reference cycles (BeautifulSoup trees) are garbage, not retained memory
+        gc.collect()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename')
+                    if stat.size_diff > 0)
+    return {
+        'median_us': round(statistics.median(samples) * 1e6, 2),
+        'best_us': round(min(samples) * 1e6, 2),
+        'peak_kb': round((peak - before) / 1024, 1),
+        'retained_kb': round(allocated / 1024, 1),
+    }
+
+
+def compare(name, result, baseline, tolerance):
+    """List of regression descriptions for one case."""
+    previous = baseline.get(name)
+    if not previous:
+        return []
+    regressions = []
+    # Sub-microsecond differences are timer noise
+    if result['best_us'] > max(previous['best_us'] * (1 + tolerance), previous['best_us'] + 1):
+        regressions.append(f"time {previous['best_us']:.1f} -> {result['best_us']:.1f} us")
+    # Ignore allocation noise below 4 KB
+    if result['peak_kb'] > max(previous['peak_kb'] * (1 + tolerance), previous['peak_kb'] + 4):
+        regressions.append(f"peak {previous['peak_kb']:.1f} -> {result['peak_kb']:.1f} KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=15, help='timing samples per case')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed growth before flagging')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='write results as the new baseline')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    fixtures = load_fixtures()
+    cases = {name: func for name, func in build_cases(fixtures).items() if args.filter in name}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f).get('cases', {})
+
+    results = {}
+    flagged = {}
+    print(f"{'case':<28}{'median us':>12}{'best us':>12}{'peak KB':>10}{'retained KB':>13}{'vs baseline':>13}")
+    for name, func in cases.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = measure(func, args.repeat)
+        results[name] = result
+        previous = baseline.get(name)
+        delta = f"{result['best_us'] / previous['best_us'] - 1:+.0%}" if previous else 'new'
+        regressions = compare(name, result, baseline, args.tolerance)
+        if regressions:
+            flagged[name] = regressions
+            delta += ' !'
+        print(f"{name:<28}{result['median_us']:>12.1f}{result['best_us']:>12.1f}"
+              f"{result['peak_kb']:>10.1f}{result['retained_kb']:>13.1f}{delta:>13}")
+
+    if args.save:
+        merged = dict(baseline, **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'cases': merged},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nSaved baseline for {len(results)} case(s) to {args.baseline}")
+        return 0
+
+    if flagged:
+        print(f"\n{len(flagged)} regression(s) beyond {args.tolerance:.0%}:")
+        for name, regressions in flagged.items():
+            print(f"  {name}: {'; '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Compare one /match_jobs call with one /analyze call per open role.
+
+Registers --roles synthetic job descriptions, then ranks the recorded
+LinkedIn profile against all of them both ways, with the fake model backend
+standing in for Gemini. Reports wall time and LLM calls for each.
+
+Usage:
+    python backend/benchmarks/bench_match_jobs.py [--roles 30] [--top-n 3] [--latency 0.2]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from bench_agent_modes import FIXTURES_DIR, fixture_backend
+
+import recruitment_ai  # noqa: E402
+from recruitment_models import set_model  # noqa: E402
+
+STACKS = ['Java, Spring Boot, Kafka', 'Python, Flask, FastAPI', 'Go, Kubernetes, gRPC', 'React, TypeScript, CSS',
+          'Python, PyTorch, LLM, RAG', 'AWS, Terraform, CI/CD', 'Node.js, MongoDB, Redis', 'SQL, dbt, Airflow']
+LEVELS = ['Junior', 'Senior', 'Staff', 'Lead']
+
+
+def synthetic_roles(count):
+    roles = []
+    for i in range(count):
+        stack = STACKS[i % len(STACKS)]
+        level = LEVELS[(i // len(STACKS)) % len(LEVELS)]
+        roles.append({
+            'title': f'{level} Engineer ({stack.split(",")[0]}) #{i}',
+            'text': f'We are hiring a {level.lower()} engineer. Required skills: {stack}. '
+                    f'{2 + i % 8}+ years of experience building production systems.',
+        })
+    return roles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--roles', type=int, default=30)
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.2, help='simulated seconds per LLM call')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+
+    model = fixture_backend(args.latency, score=85)
+    set_model(model)
+    client = recruitment_ai.app.test_client()
+    job_ids = []
+    for role in synthetic_roles(args.roles):
+        job_ids.append(client.post('/job_descriptions', json=role).get_json()['job_id'])
+
+    model.calls = 0
+    start = time.perf_counter()
+    for job_id in job_ids:
+        response = client.post('/analyze', json={'profile': profile, 'job_id': job_id, 'mode': 'pipeline',
+                                                 'bypassCache': True})
+        assert response.status_code == 200, response.get_json()
+    per_role = (time.perf_counter() - start, model.calls)
+
+    model.calls = 0
+    start = time.perf_counter()
+    response = client.post('/match_jobs', json={'profile': profile, 'job_ids': job_ids, 'topN': args.top_n,
+                                                'bypassCache': True})
+    assert response.status_code == 200, response.get_json()
+    matched = (time.perf_counter() - start, model.calls)
+    best = response.get_json()['results'][0]['roles'][:1]
+
+    print(f"roles={args.roles} top_n={args.top_n} simulated latency={args.latency:.3f}s/call")
+    print(f"{'approach':<26}{'seconds':>10}{'LLM calls':>11}")
+    print(f"{'/analyze per role':<26}{per_role[0]:>10.2f}{per_role[1]:>11}")
+    print(f"{'/match_jobs':<26}{matched[0]:>10.2f}{matched[1]:>11}")
+    print(f"speedup {per_role[0] / matched[0]:.1f}x; best role: {best[0]['title'] if best else '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Compare prompt content against the previous fixed character cuts.
+
+For the recorded LinkedIn profile, reports the size of the profile text in
+the agent query (old: content[:5000]) and in the scoring prompt (old:
+whitespace-collapsed [:2000]), how much of it is page chrome, and how many
+of the profile's signal terms (About/skills/experience vocabulary) survive.
+
+Usage:
+    python backend/benchmarks/bench_prompt.py [--runs 200]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+from recruitment_prompt import (  # noqa: E402
+    PROFILE_TOKEN_BUDGET, SCORE_TOKEN_BUDGET, build_profile_prompt, estimate_tokens, fit_text, is_boilerplate
+)
+from recruitment_schema import normalize_profile  # noqa: E402
+
+SIGNAL_TERMS = ['Senior Specialist Software Engineer', 'NICE', 'Java', 'Python', 'Go', 'AWS', 'Azure',
+                'Spring boot', 'Flask', 'FastAPI', 'Langchain', 'CrewAI', 'MySQL', 'DynamoDB', 'Neo4j',
+                'Qdrant', 'MongoDB', 'Redis', 'Text2Sql', 'Data Science', 'BITS', 'Generative AI', 'LLM', 'RAG']
+
+
+def legacy_profile_content(profile):
+    text = json.dumps(profile['content'])
+    return re.sub(r'\\n+', '\\n', text)[:5000]
+
+
+def legacy_score_content(content):
+    return ' '.join(content.split())[:2000]
+
+
+def describe(name, text):
+    lines = [line for line in re.split(r'\n|\\n', text) if line.strip()]
+    # The old scoring text is one whitespace-collapsed line, so chrome can't be counted per line
+    chrome = sum(1 for line in lines if is_boilerplate(line)) if len(lines) > 1 else '-'
+    found = sum(1 for term in SIGNAL_TERMS if re.search(rf'\b{re.escape(term)}\b', text, re.IGNORECASE))
+    print(f"{name:<18}{len(text):>8}{estimate_tokens(text):>9}{chrome:>14}{found:>10}/{len(SIGNAL_TERMS)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    compact = normalize_profile(profile)
+
+    old_profile = legacy_profile_content(profile)
+    old_score = legacy_score_content(old_profile)
+    new_profile, _ = build_profile_prompt(compact, PROFILE_TOKEN_BUDGET)
+    new_score, _ = fit_text(new_profile, SCORE_TOKEN_BUDGET)
+
+    print(f"{'prompt':<18}{'chars':>8}{'~tokens':>9}{'chrome lines':>14}{'signal':>13}")
+    describe('agent (old)', old_profile)
+    describe('agent (new)', new_profile)
+    describe('score (old)', old_score)
+    describe('score (new)', new_score)
+
+    build_ms = min(timeit.repeat(lambda: build_profile_prompt(compact), number=1, repeat=args.runs)) * 1000
+    print(f"\nbuild_profile_prompt: {build_ms:.3f} ms per profile")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Model quota governor and single-flight coalescing under concurrent recruiters.
+
+Two scenarios against the fake model backend:
+
+* Quota: --clients threads send pipeline analyses of different profiles
+  while the backend answers 429 past --backend-limit concurrent calls
+  (like an exhausted Gemini quota). Compares the governor off and on:
+  analyses that succeeded, 429s the backend returned, and latency.
+* Duplicates: --tabs identical analyses arrive at once (the same profile
+  and JD open in several tabs). Compares model calls with single-flight
+  coalescing off and on.
+
+Usage:
+    python backend/benchmarks/bench_quota.py [--clients 32] [--requests 256] [--backend-limit 4] [--tabs 8]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+# Every run must reach the model, so keep the result cache out of the measurement
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+
+import recruitment_agent  # noqa: E402
+import recruitment_quota  # noqa: E402
+import recruitment_resilience  # noqa: E402
+from recruitment_models import FakeBackend, set_model  # noqa: E402
+from recruitment_quota import QuotaGovernor, SingleFlight  # noqa: E402
+from recruitment_resilience import request_deadline  # noqa: E402
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def analyze(profile, job_description):
+    start = time.perf_counter()
+    try:
+        with request_deadline():
+            result = recruitment_agent.run_recruitment_agent(profile, job_description, mode='pipeline',
+                                                             use_cache=False)
+        success = bool(result.get('success'))
+    except Exception:
+        success = False
+    return success, time.perf_counter() - start
+
+
+def run_quota(enabled, args, profile):
+    recruitment_quota.LLM_QUOTA_ENABLED = enabled
+    recruitment_quota._governor = QuotaGovernor(max_concurrency=args.clients) if enabled else None
+    model = FakeBackend(latency=args.latency, score=40, max_concurrency=args.backend_limit)
+    set_model(model)
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        outcomes = list(pool.map(lambda i: analyze(profile, f"Backend engineer, team {i}"), range(args.requests)))
+    latencies = [seconds for _, seconds in outcomes]
+    return {
+        'success_pct': 100.0 * sum(success for success, _ in outcomes) / len(outcomes),
+        'rate_limited': model.rate_limited,
+        'p50_ms': percentile(latencies, 0.5) * 1e3,
+        'p95_ms': percentile(latencies, 0.95) * 1e3,
+    }
+
+
+def run_duplicates(enabled, args, profile):
+    recruitment_quota.LLM_SINGLE_FLIGHT_ENABLED = enabled
+    recruitment_quota._score_flights = SingleFlight()
+    model = FakeBackend(latency=args.latency, score=40)
+    set_model(model)
+    with ThreadPoolExecutor(max_workers=args.tabs) as pool:
+        list(pool.map(lambda _: analyze(profile, 'Senior Python engineer'), range(args.tabs)))
+    return model.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=256)
+    parser.add_argument('--backend-limit', type=int, default=4, help='concurrent calls before the fake answers 429')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per model call')
+    parser.add_argument('--tabs', type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    recruitment_resilience.LLM_BACKOFF_BASE_SECONDS = args.latency
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+
+    print(f"{args.requests} analyses from {args.clients} clients, backend 429s past {args.backend_limit} calls")
+    print(f"{'governor':<10}{'success %':>10}{'429s':>7}{'p50 ms':>9}{'p95 ms':>9}")
+    for enabled in (False, True):
+        row = run_quota(enabled, args, profile)
+        print(f"{'on' if enabled else 'off':<10}{row['success_pct']:>10.1f}{row['rate_limited']:>7}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}")
+
+    print(f"\n{args.tabs} identical concurrent analyses")
+    for enabled in (False, True):
+        print(f"single-flight {'on' if enabled else 'off':<4} {run_duplicates(enabled, args, profile)} model call(s)")
+
+
+if __name__ == '__main__':
+    main()
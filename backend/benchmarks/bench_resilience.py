@@ -0,0 +1,111 @@
+"""Success rate and tail latency of model calls under injected spikes and failures.
+
+Runs pipeline analyses against the fake model backend with a share of calls
+failing (503) and a share taking --spike-seconds longer, under three
+configurations: a single attempt per call, retries with jittered backoff,
+and retries plus hedging at the p95 of recent calls. Reports successful
+analyses, latency percentiles and model calls per analysis, after
+LLM_HEDGE_MIN_SAMPLES unmeasured warm-up analyses.
+
+Usage:
+    python backend/benchmarks/bench_resilience.py [--runs 300] [--latency 0.02] [--failure-rate 0.05]
+        [--spike-rate 0.02] [--spike-seconds 1.0] [--timeout 2.0]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+# Every run must reach the model, so keep the result cache out of the measurement
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+
+import recruitment_agent  # noqa: E402
+import recruitment_resilience  # noqa: E402
+from recruitment_models import FakeBackend, set_model  # noqa: E402
+from recruitment_resilience import LatencyTracker, request_deadline  # noqa: E402
+
+CONFIGURATIONS = [
+    ('single attempt', {'LLM_MAX_ATTEMPTS': 1, 'LLM_HEDGE_ENABLED': False}),
+    ('retries', {'LLM_MAX_ATTEMPTS': 3, 'LLM_HEDGE_ENABLED': False}),
+    ('retries + hedging', {'LLM_MAX_ATTEMPTS': 3, 'LLM_HEDGE_ENABLED': True}),
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_configuration(settings, args, profile, job_description):
+    for name, value in settings.items():
+        setattr(recruitment_resilience, name, value)
+    recruitment_resilience.LLM_CALL_TIMEOUT_SECONDS = args.timeout
+    recruitment_resilience.LLM_BACKOFF_BASE_SECONDS = args.latency
+    recruitment_resilience._latencies = LatencyTracker()
+    model = FakeBackend(latency=f'lognormal:{args.latency},0.25', score=40, failure_rate=args.failure_rate,
+                        spike=(args.spike_rate, args.spike_seconds), seed=args.seed)
+    set_model(model)
+
+    # Hedging needs LLM_HEDGE_MIN_SAMPLES latencies first; measure the steady state in every configuration
+    for _ in range(recruitment_resilience.LLM_HEDGE_MIN_SAMPLES):
+        try:
+            recruitment_agent.run_recruitment_agent(profile, job_description, mode='pipeline', use_cache=False)
+        except Exception:
+            pass
+    model.calls = 0
+
+    latencies, succeeded = [], 0
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        try:
+            with request_deadline(args.deadline):
+                result = recruitment_agent.run_recruitment_agent(profile, job_description, mode='pipeline',
+                                                                 use_cache=False)
+            succeeded += bool(result.get('success'))
+        except Exception:
+            # A spent deadline or a failure that exhausted its attempts
+            pass
+        latencies.append(time.perf_counter() - start)
+    return {
+        'success_pct': 100.0 * succeeded / args.runs,
+        'p50_ms': percentile(latencies, 0.50) * 1e3,
+        'p95_ms': percentile(latencies, 0.95) * 1e3,
+        'p99_ms': percentile(latencies, 0.99) * 1e3,
+        'calls': model.calls / args.runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.02, help='median seconds per model call')
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--spike-rate', type=float, default=0.02)
+    parser.add_argument('--spike-seconds', type=float, default=1.0)
+    parser.add_argument('--timeout', type=float, default=2.0, help='LLM_CALL_TIMEOUT_SECONDS')
+    parser.add_argument('--deadline', type=float, default=5.0, help='REQUEST_DEADLINE_SECONDS per analysis')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    print(f"{args.runs} pipeline analyses, {args.failure_rate:.0%} failed and {args.spike_rate:.0%} "
+          f"+{args.spike_seconds:g}s calls")
+    print(f"{'configuration':<20}{'success %':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'calls':>7}")
+    for label, settings in CONFIGURATIONS:
+        row = run_configuration(settings, args, profile, job_description)
+        print(f"{label:<20}{row['success_pct']:>10.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['calls']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
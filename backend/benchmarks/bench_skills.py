@@ -0,0 +1,126 @@
+"""Skill taxonomy matching and experience parsing throughput on one core.
+
+Builds --profiles synthetic profiles (the recorded LinkedIn page with a
+generated experience section: titles, skills, date ranges and duration
+labels), then times extract_skills with the compiled word trie against a
+single regex alternation of the same aliases (how skills were matched
+before), and feature_matrix, which adds date-range parsing and the years
+column.
+
+Usage:
+    python backend/benchmarks/bench_skills.py [--profiles 5000] [--runs 3]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+from recruitment_agent import prepare_profile_content  # noqa: E402
+from recruitment_skills import (  # noqa: E402
+    SKILL_ALIASES, SKILLS, YEARS_COLUMN, extract_skills, feature_matrix
+)
+
+TITLES = ['Software Engineer', 'Senior Data Scientist', 'Tech Lead', 'ML Engineer', 'Backend Developer']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+TODAY = (2024, 10)
+
+
+def regex_baseline():
+    """One alternation of every alias, longest first, as the matcher used to be built."""
+    aliases = sorted({alias for spellings in SKILL_ALIASES.values() for alias in spellings}, key=len, reverse=True)
+    pattern = re.compile(r'(?<![\w.+#])(' + '|'.join(re.escape(alias.lower()) for alias in aliases) + r')(?![\w+#])')
+    alias_to_skill = {alias.lower(): skill for skill, spellings in SKILL_ALIASES.items() for alias in spellings}
+    # Capitalised aliases only count when capitalised in the text, as in the trie
+    cased = {alias.lower() for alias in aliases if alias != alias.lower()}
+
+    def extract(text):
+        found = {}
+        lowered = text.lower()
+        for match in pattern.finditer(lowered):
+            alias = match.group(1)
+            # lower() keeps offsets for the ASCII text the aliases consist of
+            if alias in cased and not text[match.start(1)].isupper():
+                continue
+            found.setdefault(alias_to_skill[alias], None)
+        return list(found)
+    return extract
+
+
+def experience_section(rng):
+    """A LinkedIn-style experience block and the months it covers."""
+    lines, month, covered = ['Experience'], (TODAY[0] - rng.randint(3, 15)) * 12, 0
+    end_of_career = TODAY[0] * 12 + TODAY[1] - 1
+    while month < end_of_career:
+        length = min(rng.randint(8, 48), end_of_career - month)
+        end = month + length
+        finish = 'Present' if end >= end_of_career else f'{MONTHS[(end - 1) % 12]} {(end - 1) // 12}'
+        lines += [rng.choice(TITLES), f'{rng.choice(COMPANIES)} · Full-time',
+                  f'{MONTHS[month % 12]} {month // 12} - {finish} · {length // 12} yrs {length % 12} mos',
+                  f"Built services with {', '.join(rng.sample(SKILLS, 4))}."]
+        covered += length + (1 if finish == 'Present' else 0)
+        month = end + rng.randint(0, 4)
+    lines += ['Education', 'University of Somewhere', f'{TODAY[0] - 20} - {TODAY[0] - 16}']
+    return '\n'.join(lines), covered
+
+
+def best_of(runs, function, texts):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        page = prepare_profile_content(json.load(f))
+    rng = random.Random(args.seed)
+    texts, expected_months = [], []
+    for _ in range(args.profiles):
+        section, months = experience_section(rng)
+        texts.append(page + '\n' + section)
+        expected_months.append(months)
+    chars = sum(len(text) for text in texts) / len(texts)
+    print(f"{args.profiles} profiles, {chars:.0f} chars each on average, {len(SKILLS)} skills, "
+          f"{sum(len(spellings) for spellings in SKILL_ALIASES.values())} aliases")
+
+    baseline = regex_baseline()
+    sample = texts[:200]
+    print(f"skills found per profile: regex {sum(len(baseline(text)) for text in sample) / len(sample):.1f}, "
+          f"trie {sum(len(extract_skills(text)) for text in sample) / len(sample):.1f} "
+          f"(the trie also matches punctuation variants such as CI/CD and scikit-learn)")
+
+    print(f"\n{'stage':<36}{'seconds':>9}{'profiles/s':>12}")
+    for label, function in [
+        ('extract_skills, regex alternation', lambda batch: [baseline(text) for text in batch]),
+        ('extract_skills, word trie', lambda batch: [extract_skills(text) for text in batch]),
+        ('feature_matrix (skills + years)', lambda batch: feature_matrix(batch, TODAY)),
+    ]:
+        seconds = best_of(args.runs, function, texts)
+        print(f"{label:<36}{seconds:>9.3f}{args.profiles / seconds:>12,.0f}")
+
+    features = feature_matrix(texts, TODAY)
+    errors = [abs(features[i, YEARS_COLUMN] * 12 - months) for i, months in enumerate(expected_months)]
+    print(f"\nyears of experience: exact for {sum(error < 0.5 for error in errors)}/{len(errors)} profiles, "
+          f"max error {max(errors):.1f} months")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Cold-start cost of a worker process: imports, app creation and first requests.
+
+Each run starts a fresh interpreter that imports recruitment_ai, builds the
+app and sends a /prescreen (scikit-learn) and two /analyze requests
+(model client, stores) through the test client, with the fake model
+backend answering instantly and throwaway databases. The current tree is
+measured with warmup off (everything initialized by the first request) and
+with sync warmup (paid inside create_app, before the worker takes
+traffic). --backend-dir measures another checkout the same way, e.g. a
+`git worktree` of an older commit for before/after numbers; a tree without
+create_app is measured through its module-level app.
+
+Usage:
+    python backend/benchmarks/bench_startup.py [--runs 5] [--backend-dir /path/to/old/backend]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+
+CHILD = r'''
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, os.environ['BENCH_BACKEND_DIR'])
+import recruitment_ai
+imported = time.perf_counter()
+create_app = getattr(recruitment_ai, 'create_app', None)
+app = create_app(os.environ['BENCH_WARMUP']) if create_app else recruitment_ai.app
+created = time.perf_counter()
+client = app.test_client()
+with open(os.environ['BENCH_PROFILE'], encoding='utf-8') as f:
+    profile = json.load(f)
+
+def timed(path, body):
+    start = time.perf_counter()
+    response = client.post(path, json=body)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return time.perf_counter() - start
+
+analyze = {'profile': profile, 'jobDescription': 'Senior Python engineer with AWS, 5+ years',
+           'mode': 'pipeline', 'bypassCache': True}
+timings = {
+    'import': imported - started,
+    'create_app': created - imported,
+    'first_prescreen': timed('/prescreen', {'profiles': [profile], 'jobDescription': 'Python engineer'}),
+    'first_analyze': timed('/analyze', analyze),
+    'second_analyze': timed('/analyze', analyze),
+}
+timings['first_response'] = timings['import'] + timings['create_app'] + timings['first_prescreen']
+print('BENCH ' + json.dumps(timings))
+'''
+
+COLUMNS = ['import', 'create_app', 'first_prescreen', 'first_analyze', 'second_analyze', 'first_response']
+
+
+def run_child(backend_dir, warmup):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BENCH_BACKEND_DIR=backend_dir, BENCH_WARMUP=warmup,
+                   BENCH_PROFILE=os.path.join(FIXTURES_DIR, 'linkedin_profile.json'),
+                   MODEL_BACKEND='fake', FAKE_MODEL_LATENCY='fixed:0', SHEETS_SINK='csv',
+                   SHEETS_LOCAL_PATH=os.path.join(tmp, 'sheet'), NOTIFY_TRANSPORT='log')
+        for name in ['JOB_QUEUE_PATH', 'NOTIFY_OUTBOX_PATH', 'RESULT_CACHE_PATH', 'JD_REGISTRY_PATH', 'DEDUP_PATH',
+                     'CANDIDATE_STORE_PATH', 'SHEETS_SPOOL_PATH']:
+            env[name] = os.path.join(tmp, name.lower() + '.db')
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD], env=env, cwd=backend_dir,
+                                capture_output=True, text=True, check=True).stdout
+    line = next(line for line in output.splitlines() if line.startswith('BENCH '))
+    return json.loads(line[len('BENCH '):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--backend-dir', help='another checkout of backend/ to measure alongside this one')
+    args = parser.parse_args()
+
+    variants = [('this tree, warmup off', BACKEND_DIR, 'off'), ('this tree, warmup sync', BACKEND_DIR, 'sync')]
+    if args.backend_dir:
+        variants.insert(0, (os.path.basename(os.path.dirname(os.path.abspath(args.backend_dir))) or 'other',
+                            os.path.abspath(args.backend_dir), 'off'))
+
+    print(f"median of {args.runs} fresh processes, milliseconds")
+    print(f"{'variant':<26}" + ''.join(f"{column:>17}" for column in COLUMNS))
+    for label, backend_dir, warmup in variants:
+        runs = [run_child(backend_dir, warmup) for _ in range(args.runs)]
+        medians = [statistics.median(run[column] for run in runs) * 1e3 for column in COLUMNS]
+        print(f"{label:<26}" + ''.join(f"{value:>17.1f}" for value in medians))
+
+
+if __name__ == '__main__':
+    main()
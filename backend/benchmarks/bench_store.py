@@ -0,0 +1,92 @@
+"""Candidate store search latency with hundreds of thousands of stored analyses.
+
+Loads --candidates synthetic analyses spread over --jobs job descriptions
+into a fresh store, then times the typical recruiter queries: top candidates
+for a job, for a job with a skill, with a free-text term, a deep page
+reached by cursor, and a full ndjson-style scan of one job.
+
+Usage:
+    python backend/benchmarks/bench_store.py [--candidates 200000] [--jobs 50] [--repeat 200]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from recruitment_store import CandidateStore  # noqa: E402
+
+SKILLS = ['Python', 'Java', 'Go', 'Kubernetes', 'React', 'TypeScript', 'AWS', 'GCP', 'SQL', 'Kafka', 'Spark',
+          'PyTorch', 'Terraform', 'Node.js', 'Redis', 'MongoDB', 'Docker', 'Airflow', 'Rust', 'C++']
+TITLES = ['Software Engineer', 'Data Scientist', 'Tech Lead', 'Engineering Manager', 'SRE', 'ML Engineer']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka']
+WORDS = ['scalable', 'distributed', 'payments', 'search', 'ranking', 'observability', 'latency', 'streaming',
+         'platform', 'migration', 'compliance', 'fraud', 'recommendation', 'billing', 'analytics']
+
+
+def synthetic_candidate(rng, i):
+    skills = rng.sample(SKILLS, 4)
+    title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+    profile = {'name': f'Candidate {i}', 'headline': f'{title} at {company}', 'skills': skills}
+    text = (f"{title} at {company}. Built {' '.join(rng.sample(WORDS, 4))} systems with "
+            f"{', '.join(skills)}. {rng.randint(1, 15)} years of experience.")
+    result = {'matchScore': rng.randint(0, 100), 'match_analysis': f"Strong {rng.choice(WORDS)} background.",
+              'key_qualifications': f"- {skills[0]}\n- {skills[1]}", 'message': ''}
+    return profile, text, result
+
+
+def timed(label, repeat, query):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = query()
+        timings.append(time.perf_counter() - start)
+    timings_ms = np.array(timings) * 1e3
+    print(f"{label:<40}{np.percentile(timings_ms, 50):>9.2f}{np.percentile(timings_ms, 99):>9.2f}{rows:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=200000)
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandidateStore(os.path.join(tmp, 'candidates.db'))
+        start = time.perf_counter()
+        for i in range(args.candidates):
+            profile, text, result = synthetic_candidate(rng, i)
+            store.record(f'candidate-{i}', f'jd_{i % args.jobs}', profile, text, result)
+        elapsed = time.perf_counter() - start
+        print(f"recorded {args.candidates} candidates over {args.jobs} job(s) in {elapsed:.1f}s "
+              f"({args.candidates / elapsed:.0f}/s), {store.stats()['db_bytes'] / 1e6:.0f} MB")
+
+        deep_cursor = None
+        for _ in range(20):
+            _, deep_cursor = store.search(job_key='jd_7', limit=100, cursor=deep_cursor)
+
+        print(f"\n{'query (page of 50)':<40}{'p50 ms':>9}{'p99 ms':>9}{'rows':>9}")
+        timed('top for job', args.repeat, lambda: len(store.search(job_key='jd_7')[0]))
+        timed('top for job + skill', args.repeat, lambda: len(store.search(job_key='jd_7', skills=['kubernetes'])[0]))
+        timed('top for job + 2 skills + minScore', args.repeat,
+              lambda: len(store.search(job_key='jd_7', skills=['python', 'aws'], min_score=60)[0]))
+        timed('top for job + free text', args.repeat, lambda: len(store.search(job_key='jd_7', text='fraud')[0]))
+        timed('most recent, any job + skill', args.repeat,
+              lambda: len(store.search(skills=['rust'], sort='recent')[0]))
+        timed('page 21 of job by cursor', args.repeat, lambda: len(store.search(job_key='jd_7', cursor=deep_cursor)[0]))
+        timed('stream whole job', max(1, args.repeat // 20), lambda: sum(1 for _ in store.iter_search(job_key='jd_7')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Measure time to first useful event on /analyze_stream against /analyze.
+
+Both endpoints run the pipeline mode against the fake model backend, which
+streams its scoring markdown in chunks spread over the simulated latency.
+
+Usage:
+    python backend/benchmarks/bench_streaming.py [--runs 5] [--latency 2.0]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from bench_agent_modes import FIXTURES_DIR, fixture_backend
+
+import recruitment_ai  # noqa: E402
+from recruitment_models import set_model  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=2.0, help='simulated seconds per LLM call')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    set_model(fixture_backend(args.latency, score=85))
+    client = recruitment_ai.app.test_client()
+    body = {'profile': profile, 'jobDescription': job_description, 'mode': 'pipeline'}
+
+    blocking = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        assert client.post('/analyze', json=body).get_json()['success']
+        blocking.append(time.perf_counter() - start)
+
+    first_score, first_section, total = [], [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        response = client.post('/analyze_stream', json=body, buffered=False)
+        seen = {}
+        for line in response.response:
+            line = line.decode() if isinstance(line, bytes) else line
+            for part in line.splitlines():
+                if part.startswith('event: ') and part[7:] not in seen:
+                    seen[part[7:]] = time.perf_counter() - start
+        first_score.append(seen['score'])
+        first_section.append(seen['section'])
+        total.append(seen['result'])
+
+    mean = lambda values: sum(values) / len(values)
+    print(f"runs={args.runs} simulated latency={args.latency:.2f}s/call")
+    print(f"/analyze         full response  {mean(blocking):.3f}s")
+    print(f"/analyze_stream  first score    {mean(first_score):.3f}s")
+    print(f"/analyze_stream  first section  {mean(first_section):.3f}s")
+    print(f"/analyze_stream  final result   {mean(total):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
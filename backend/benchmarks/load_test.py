@@ -0,0 +1,123 @@
+"""Load-test /analyze at fixed concurrency and report throughput and latency percentiles.
+
+By default the Flask app runs in-process with the fake model backend, so
+the numbers cover request parsing, prompt building, orchestration and the
+simulated LLM latency without an API key. Pass --url to drive a running
+server instead (start it with MODEL_BACKEND=fake for an offline run).
+
+Every request carries a distinct profile so the result cache never answers.
+
+Usage:
+    python backend/benchmarks/load_test.py [--requests 200] [--concurrency 16]
+        [--latency lognormal:0.8,0.35] [--mode pipeline] [--url http://localhost:5000]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+from recruitment_agent import AGENT_MODES  # noqa: E402
+from recruitment_models import FakeBackend, LatencyDistribution, set_model  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def make_sender(url):
+    """Callable posting one JSON body to /analyze and returning the HTTP status."""
+    if url:
+        endpoint = url.rstrip('/') + '/analyze'
+
+        def send(body):
+            data = json.dumps(body).encode('utf-8')
+            req = urllib.request.Request(endpoint, data=data, headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(req, timeout=300) as response:
+                    response.read()
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+        return send
+
+    import recruitment_ai
+    local = threading.local()
+
+    def send(body):
+        # Flask test clients are not shared between threads
+        if not hasattr(local, 'client'):
+            local.client = recruitment_ai.app.test_client()
+        return local.client.post('/analyze', json=body).status_code
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency', default='lognormal:0.8,0.35',
+                        help='fake model latency spec (in-process only), e.g. fixed:0.2 or uniform:0.5,2')
+    parser.add_argument('--score', type=int, default=None, help='fixed match score from the fake model')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mode', default='pipeline', choices=AGENT_MODES)
+    parser.add_argument('--url', default=None, help='drive a running server instead of the in-process app')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(os.path.join(FIXTURES_DIR, 'linkedin_profile.json'), encoding='utf-8') as f:
+        profile = json.load(f)
+    with open(os.path.join(FIXTURES_DIR, 'job_description.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+
+    backend = None
+    if not args.url:
+        backend = FakeBackend(latency=LatencyDistribution.parse(args.latency, seed=args.seed),
+                              score=args.score, seed=args.seed)
+        set_model(backend)
+    send = make_sender(args.url)
+
+    def one(index):
+        body = {
+            'profile': dict(profile, headline=f"{profile['headline']} #{index}"),
+            'jobDescription': job_description,
+            'mode': args.mode,
+        }
+        start = time.perf_counter()
+        status = send(body)
+        return status, time.perf_counter() - start
+
+    target = args.url or f'in-process app, fake model {args.latency}'
+    print(f"requests={args.requests} concurrency={args.concurrency} mode={args.mode} target={target}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    latencies = [seconds for status, seconds in results if status == 200]
+    print(f"elapsed      {elapsed:8.2f}s")
+    print(f"throughput   {args.requests / elapsed:8.2f} req/s")
+    print(f"status codes {dict(statuses)}")
+    for pct in (50, 95, 99):
+        print(f"p{pct:<11}{percentile(latencies, pct):8.3f}s")
+    print(f"max          {max(latencies, default=0.0):8.3f}s")
+    if backend is not None:
+        print(f"model calls  {backend.calls:8d} ({backend.calls / args.requests:.1f} per request)")
+
+
+if __name__ == '__main__':
+    main()
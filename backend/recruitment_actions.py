@@ -0,0 +1,132 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+# Configuration (overridable through .env)
+# "json" asks the model for a schema-constrained JSON action; "text" keeps the FUNCTION_CALL/FINAL_ANSWER protocol
+AGENT_OUTPUT_FORMAT = os.getenv('AGENT_OUTPUT_FORMAT', 'json')
+AGENT_OUTPUT_FORMATS = ('json', 'text')
+# Extra model calls per analysis spent asking the model to fix an unusable reply
+AGENT_REPAIR_RETRIES = int(os.getenv('AGENT_REPAIR_RETRIES', 2))
+
+FINAL_ANSWER = 'final_answer'
+# Arguments each step accepts and their types; the values run are bound from the analysis state
+ACTION_ARGUMENTS = {
+    'calculate_profile_score': {'profile_content': str, 'job_description': str},
+    'generate_outreach_message': {'name': str, 'score': int, 'message_section': str},
+    'send_notifications': {'profile_data': str, 'score': int, 'message_section': str},
+    FINAL_ANSWER: {},
+}
+# Steps that need a score, i.e. must come after calculate_profile_score
+NEEDS_SCORE = ('generate_outreach_message', 'send_notifications', FINAL_ANSWER)
+
+# response_schema for the model's JSON mode (the OpenAPI subset Gemini accepts). Only the
+# step is chosen by the model; the profile, job, score and message are bound server side.
+ACTION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'action': {'type': 'string', 'enum': list(ACTION_ARGUMENTS)},
+    },
+    'required': ['action'],
+}
+
+_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+
+class ActionParseError(ValueError):
+    """An agent reply that cannot be executed; ``reason`` is a short label for metrics."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+@dataclass
+class AgentAction:
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+def _load_object(text: str, what: str) -> Dict[str, Any]:
+    fenced = _FENCE_PATTERN.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ActionParseError('invalid_json', f"{what} is not valid JSON: {e}")
+    if not isinstance(value, dict):
+        raise ActionParseError('not_object', f"{what} must be a JSON object")
+    return value
+
+
+def _validate_arguments(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    if name not in ACTION_ARGUMENTS:
+        raise ActionParseError('unknown_action', f"Unknown action {name!r}; expected one of {list(ACTION_ARGUMENTS)}")
+    if name == FINAL_ANSWER:
+        # The final answer is built from the analysis state, not from what the model restates
+        return {}
+    expected = ACTION_ARGUMENTS[name]
+    unexpected = sorted(set(arguments) - set(expected))
+    if unexpected:
+        raise ActionParseError('bad_arguments', f"{name} does not take {', '.join(unexpected)}")
+    validated = {}
+    for key, value in arguments.items():
+        if expected[key] is int:
+            if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).strip().isdigit():
+                raise ActionParseError('bad_arguments', f"{name}.{key} must be an integer")
+            value = int(value)
+        elif not isinstance(value, str):
+            raise ActionParseError('bad_arguments', f"{name}.{key} must be a string")
+        validated[key] = value
+    return validated
+
+
+def parse_agent_action(text: str, output_format: str = AGENT_OUTPUT_FORMAT, scored: bool = False) -> AgentAction:
+    """The one parser for agent replies in either output format.
+
+    ``json``: an object ``{"action": ...}`` (fenced code blocks are
+    tolerated). ``text``: ``FUNCTION_CALL: name|{json arguments}`` or
+    ``FINAL_ANSWER: {json}``. Arguments are checked against
+    ACTION_ARGUMENTS, and steps in NEEDS_SCORE are rejected until
+    ``scored``. Raises ActionParseError; nothing is ever eval'ed.
+    """
+    text = (text or '').strip()
+    if not text:
+        raise ActionParseError('empty', 'Empty reply')
+    if output_format == 'json':
+        reply = _load_object(text, 'Reply')
+        name = reply.pop('action', None)
+        if not isinstance(name, str):
+            raise ActionParseError('missing_action', 'Reply has no "action" string')
+        arguments = reply.pop('arguments', {})
+        if not isinstance(arguments, dict):
+            raise ActionParseError('bad_arguments', '"arguments" must be an object')
+        action = AgentAction(name, _validate_arguments(name, dict(reply, **arguments)))
+    elif text.startswith('FUNCTION_CALL:'):
+        name, separator, arguments = text[len('FUNCTION_CALL:'):].partition('|')
+        name = name.strip()
+        arguments = _load_object(arguments.strip(), f'{name} arguments') if separator else {}
+        if name == FINAL_ANSWER:
+            raise ActionParseError('unknown_action', 'final_answer is not a function; reply with FINAL_ANSWER:')
+        action = AgentAction(name, _validate_arguments(name, arguments))
+    elif text.startswith('FINAL_ANSWER:'):
+        _load_object(text[len('FINAL_ANSWER:'):].strip(), 'FINAL_ANSWER')
+        action = AgentAction(FINAL_ANSWER)
+    else:
+        raise ActionParseError('no_prefix', 'Reply starts with neither FUNCTION_CALL: nor FINAL_ANSWER:')
+
+    if action.name in NEEDS_SCORE and not scored:
+        raise ActionParseError('out_of_order', f"{action.name} needs a score; call calculate_profile_score first")
+    return action
+
+
+def repair_prompt(prompt: str, reply: str, error: ActionParseError, output_format: str = AGENT_OUTPUT_FORMAT) -> str:
+    """``prompt`` plus the rejected reply and why, asking for one valid reply."""
+    expected = 'one JSON object {"action": ...}' if output_format == 'json' else \
+        'exactly one FUNCTION_CALL: or FINAL_ANSWER: line with valid JSON'
+    return (f"{prompt}\n\nYour previous reply could not be used: {error}\n"
+            f"Previous reply: {reply[:500]}\n"
+            f"Reply again with {expected} and nothing else.")
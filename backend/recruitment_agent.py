@@ -1,15 +1,33 @@
 import logging
 import json
-from typing import Dict, Any
-from bs4 import BeautifulSoup
+import os
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from recruitment_cleaning import clean_profile
+from recruitment_prompt import PROFILE_TOKEN_BUDGET, build_profile_prompt, digest_text, estimate_tokens
 from recruitment_utils import (
     calculate_profile_score,
     generate_outreach_message,
     send_notifications,
-    model
+    stream_profile_score
 )
-import re
-import pdb
+from recruitment_actions import (
+    ACTION_SCHEMA,
+    AGENT_OUTPUT_FORMAT,
+    AGENT_OUTPUT_FORMATS,
+    AGENT_REPAIR_RETRIES,
+    FINAL_ANSWER,
+    ActionParseError,
+    AgentAction,
+    parse_agent_action,
+    repair_prompt
+)
+from recruitment_metrics import record_agent_iterations, record_agent_parse_failure, record_agent_prompt, span
+from recruitment_models import generate_text
+from recruitment_notifications import candidate_key
+from recruitment_registry import job_key_for
+from recruitment_resilience import check_deadline
 
 # Configure logging
 logging.basicConfig(
@@ -18,59 +36,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger('RecruitmentAgent')
 
+# Orchestration modes: "agent" lets Gemini pick each step, "pipeline" runs the
+# fixed score -> outreach -> notify sequence locally.
+AGENT_MODES = ("agent", "pipeline")
+DEFAULT_AGENT_MODE = os.getenv('AGENT_MODE', 'agent')
+
+# Score thresholds for the follow-up steps
+OUTREACH_THRESHOLD = 50
+NOTIFY_THRESHOLD = 90
+
+# Characters of the score analysis the agent state carries into follow-up prompts
+AGENT_DIGEST_CHARS = int(os.getenv('AGENT_DIGEST_CHARS', 300))
+
 def clean_profile_data(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     """Clean HTML from profile data and extract plain text."""
-    if isinstance(profile_data, str):
-        # Clean direct string content
-        text = BeautifulSoup(profile_data, 'html.parser').get_text()
-        # Replace multiple newlines with single newline
-        text = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
-        return text
-    
-    if isinstance(profile_data, dict):
-        cleaned_data = {}
-        for key, value in profile_data.items():
-            if isinstance(value, str):
-                # Clean HTML and newlines from string values
-                text = BeautifulSoup(value, 'html.parser').get_text()
-                cleaned_data[key] = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
-            elif isinstance(value, list):
-                # Clean HTML and newlines from list items
-                cleaned_data[key] = [
-                    '\n'.join(line.strip() for line in BeautifulSoup(item, 'html.parser').get_text().splitlines() if line.strip())
-                    if isinstance(item, str) else item 
-                    for item in value
-                ]
-            else:
-                cleaned_data[key] = value
-        return cleaned_data
-    
-    return profile_data
-
-def safe_eval_params(params_str: str) -> Dict[str, Any]:
-    """Safely evaluate parameters string to dict."""
-    try:
-        # Clean up and escape the string
-        cleaned = params_str.strip()
-        logger.debug(f"Original params: {cleaned}")
-        
-        # Fix common formatting issues
-        cleaned = cleaned.replace('None', 'null')
-        cleaned = cleaned.replace('True', 'true')
-        cleaned = cleaned.replace('False', 'false')
-        
-        # Handle nested quotes
-        cleaned = re.sub(r'(?<!\\)"([^"]*)"', r'"\1"', cleaned)
-        
-        logger.debug(f"Cleaned params: {cleaned}")
-        return json.loads(cleaned)
-    except Exception as e:
-        logger.error(f"❌ Parameter parsing failed: {e}")
-        logger.error(f"Problem string: {params_str}")
-        raise ValueError(f"Invalid parameters format: {e}")
-
-def function_caller(func_name: str, params: Dict[str, Any]) -> Any:
-    """Maps function names to actual functions"""
+    return clean_profile(profile_data)
+
+def function_caller(func_name: str, params: Dict[str, Any], use_cache: bool = True,
+                    notify_keys: Optional[Dict[str, str]] = None) -> Any:
+    """Maps function names to actual functions
+
+    ``notify_keys`` (see notification_keys) identifies the real candidate and
+    job for send_notifications, whatever profile_data the LLM passed.
+    """
     logger.info("=" * 80)
     logger.info(f"🔄 FUNCTION CALL: {func_name}")
     logger.info(f"📥 INPUT PARAMETERS:")
@@ -85,7 +73,13 @@ def function_caller(func_name: str, params: Dict[str, Any]) -> Any:
     
     if func_name in function_map:
         try:
-            result = function_map[func_name](**params)
+            with span(f"function.{func_name}"):
+                if func_name == "calculate_profile_score":
+                    result = calculate_profile_score(**params, use_cache=use_cache)
+                elif func_name == "send_notifications":
+                    result = send_notifications(**dict(params, **(notify_keys or {})))
+                else:
+                    result = function_map[func_name](**params)
             logger.info(f"📤 OUTPUT:")
             if isinstance(result, tuple):
                 for i, item in enumerate(result):
@@ -117,181 +111,356 @@ def function_caller(func_name: str, params: Dict[str, Any]) -> Any:
         logger.warning(f"⚠️ Function {func_name} not found")
         return f"Function {func_name} not found"
 
-def run_recruitment_agent(profile_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
-    logger.info("\n" + "=" * 80)
-    logger.info("🚀 STARTING RECRUITMENT AGENT ANALYSIS")
-    #pdb.set_trace()  # Debug: Initial data
-    
+def prepare_profile_content(profile_data: Dict[str, Any]) -> str:
+    """Clean profile data and build the token-budgeted profile text sent to the LLM."""
     # Clean profile data before processing
-    cleaned_profile_data_res = clean_profile_data(profile_data)
+    with span("clean_profile"):
+        cleaned_profile_data_res = clean_profile_data(profile_data)
     #pdb.set_trace()  # Debug: After cleaning
     
     logger.info("🧹 Cleaned profile data of HTML tags")
-    print("Received profile data:", json.dumps(cleaned_profile_data_res, indent=2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Received profile data: {json.dumps(cleaned_profile_data_res, indent=2)}")
     
-    cleaned_profile_data_res = str(json.dumps(cleaned_profile_data_res['content']))
-    # Clean up multiple newlines in the JSON string
-    cleaned_profile_data_res = re.sub(r'\\n+', '\\n', cleaned_profile_data_res)
-
-    # Limit profile data length if needed
-    if isinstance(cleaned_profile_data_res, str):
-        cleaned_profile_data_res = cleaned_profile_data_res[:5000]
-    elif isinstance(cleaned_profile_data_res, dict):
-        cleaned_profile_data_res = {k: str(v)[:5000] if isinstance(v, str) else v 
-                              for k, v in cleaned_profile_data_res.items()}
-    
-    logger.info(f"📄 Processing cleaned profile with {len(str(cleaned_profile_data_res))} characters")
-    
-    system_prompt = """You are a recruitment agent analyzing profiles. Respond with EXACTLY ONE of these formats:
-    1. FUNCTION_CALL: function_name|{"profile_content": "content", "job_description": "description"}
-    2. FUNCTION_CALL: generate_outreach_message|{"name": "candidate_name", "score": score_value, "message_section": "message"}
-    3. FUNCTION_CALL: send_notifications|{"profile_data": "profile", "score": score_value, "message_section": "message"}
-    4. FINAL_ANSWER: {
-        "success": true,
-        "matchScore": score_value,
-        "match_analysis": "analysis",
-        "key_qualifications": "qualifications",
-        "message": "message"
+    with span("build_profile_prompt"):
+        profile_content, stats = build_profile_prompt(cleaned_profile_data_res, PROFILE_TOKEN_BUDGET)
+    logger.info(f"📄 Built profile prompt: {stats['input_chars']} -> {stats['output_chars']} characters "
+                f"(~{stats['estimated_tokens']}/{stats['token_budget']} tokens, "
+                f"{stats['boilerplate_lines']} boilerplate and {stats['duplicate_lines']} duplicate lines dropped)")
+    return profile_content
+
+def notification_keys(profile_data: Dict[str, Any], job_description: str,
+                      job_key: Optional[str] = None) -> Dict[str, str]:
+    """Dedup identity for send_notifications: the candidate and the job.
+
+    ``job_key`` is the registered job_id when there is one; otherwise the
+    key is derived from the JD text the same way the registry derives IDs.
+    """
+    return {'candidate': candidate_key(profile_data), 'job_key': job_key or job_key_for(job_description)}
+
+def get_candidate_name(profile_data: Dict[str, Any]) -> str:
+    """Best-effort candidate name from the extension payload."""
+    if isinstance(profile_data, dict):
+        name = profile_data.get('name') or (profile_data.get('intro') or {}).get('name')
+        if name:
+            return str(name).strip()
+    return 'Candidate'
+
+def build_final_answer(score: int, analysis: str, qualifications_text: str, message: str) -> Dict[str, Any]:
+    """Build the FINAL_ANSWER dict returned to the extension."""
+    # Extract key qualifications
+    key_qualifications = ""
+    if '#### Key Qualifications' in qualifications_text:
+        key_quals = qualifications_text.split('#### Key Qualifications')[1]
+        key_quals = key_quals.split('####')[0].strip()
+        key_qualifications = key_quals
+
+    return {
+        "success": True,
+        "matchScore": score,
+        "match_analysis": analysis.strip(),
+        "key_qualifications": key_qualifications,
+        "message": message
     }
 
+def finish_pipeline(profile_data: Dict[str, Any], profile_content: str, score: int,
+                    analysis: str, qualifications: str, message_section: str,
+                    notify_keys: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Run the outreach/notify steps that follow scoring and build the final answer."""
+    message = message_section
+
+    if score > OUTREACH_THRESHOLD:
+        message = function_caller(
+            "generate_outreach_message",
+            {"name": get_candidate_name(profile_data), "score": score, "message_section": message_section}
+        )
+
+    if score > NOTIFY_THRESHOLD:
+        function_caller(
+            "send_notifications",
+            {"profile_data": profile_content, "score": score, "message_section": message_section},
+            notify_keys=notify_keys
+        )
+
+    final_result = build_final_answer(score, analysis, qualifications, message)
+    logger.info(f"📊 Final result: {json.dumps(final_result, indent=2)}")
+    return final_result
+
+def run_direct_pipeline(profile_data: Dict[str, Any], job_description: str,
+                        use_cache: bool = True, job_key: Optional[str] = None,
+                        profile_content: Optional[str] = None) -> Dict[str, Any]:
+    """Run score -> outreach -> notify as a local state machine.
+
+    Executes the same function_caller steps the LLM is instructed to pick, but
+    without asking Gemini which one comes next, so calculate_profile_score is
+    the only LLM call per profile. ``profile_content`` is the output of
+    prepare_profile_content when the caller already built it.
+    """
+    logger.info("\n" + "=" * 80)
+    logger.info("🚀 STARTING RECRUITMENT PIPELINE ANALYSIS")
+
+    if profile_content is None:
+        profile_content = prepare_profile_content(profile_data)
+
+    score, analysis, qualifications, message_section = function_caller(
+        "calculate_profile_score",
+        {"profile_content": profile_content, "job_description": job_description},
+        use_cache=use_cache
+    )
+    return finish_pipeline(profile_data, profile_content, score, analysis, qualifications, message_section,
+                           notify_keys=notification_keys(profile_data, job_description, job_key))
+
+def stream_direct_pipeline(profile_data: Dict[str, Any], job_description: str, use_cache: bool = True,
+                           job_key: Optional[str] = None):
+    """Streaming variant of run_direct_pipeline.
+
+    Yields the ``score``/``section`` events of stream_profile_score while
+    Gemini is still generating, then ``('result', final_answer)`` with the
+    same dict run_direct_pipeline returns.
+    """
+    logger.info("\n" + "=" * 80)
+    logger.info("🚀 STARTING STREAMING PIPELINE ANALYSIS")
+
+    profile_content = prepare_profile_content(profile_data)
+
+    for event, data in stream_profile_score(profile_content, job_description, use_cache=use_cache):
+        if event == 'scored':
+            score, analysis, qualifications, message_section = data
+            logger.info(f"✅ Streamed calculate_profile_score, score {score}")
+        else:
+            yield event, data
+
+    yield 'result', finish_pipeline(profile_data, profile_content, score, analysis, qualifications, message_section,
+                                    notify_keys=notification_keys(profile_data, job_description, job_key))
+
+AGENT_SYSTEM_PROMPTS = {
+    'json': """You are a recruitment agent analyzing profiles. Each turn, pick the next step and reply with
+    a JSON object {"action": "<step>"}. The server supplies the profile, job description, score and
+    message to each step; do not repeat them.
+
+    Steps:
+    - calculate_profile_score: scores the profile against the job. Always the first step.
+    - generate_outreach_message: writes the outreach message. Required if score > 50.
+    - send_notifications: notifies the recruiters. Required if score > 90, after the outreach message.
+    - final_answer: ends the analysis. Only once the required steps are done.
+
+    After the first step the query carries the analysis State: the score, a digest of the analysis,
+    the steps done and the steps still pending.
+    """,
+    'text': """You are a recruitment agent analyzing profiles. Respond with EXACTLY ONE of these formats:
+    1. FUNCTION_CALL: calculate_profile_score|{}
+    2. FUNCTION_CALL: generate_outreach_message|{}
+    3. FUNCTION_CALL: send_notifications|{}
+    4. FINAL_ANSWER: {}
+
     Available functions:
     1. calculate_profile_score(profile_content: str, job_description: str) -> Returns tuple(score, analysis, qualifications, message)
     2. generate_outreach_message(name: str, score: int, message_section: str) -> Returns str
     3. send_notifications(profile_data: str, score: int, message_section: str) -> None
-    
+    The server passes the profile, job description, score and message to each function and builds the
+    final answer; do not repeat them. After the first call the query carries the analysis State: the
+    score, a digest of the analysis, the functions done and the ones still pending.
+
     Follow these steps EXACTLY:
     1. First, call calculate_profile_score
     2. Based on the score:
        - If score > 50: call generate_outreach_message in next iteration
-       - If score > 50: also call send_notifications after outreach message in next iteration
+       - If score > 90: also call send_notifications after outreach message in next iteration
     3. Only return FINAL_ANSWER after completing all required function calls
-    
-    
-    Current score and analysis must be used for subsequent function calls.
+
+    Arguments and FINAL_ANSWER must be valid JSON (double quotes, true/false/null).
     DO NOT provide any other text apart from asked for and verify your answer before answering
     DO NOT enclose the output in ```json or another
+    """,
+}
+
+def bind_arguments(action: AgentAction, profile_data: Dict[str, Any], profile_content: str,
+                   job_description: str, score: Optional[int], message_section: Optional[str]) -> Dict[str, Any]:
+    """Arguments for ``action``: the analysis state, over anything the model restated.
+
+    The profile, job, score and message the steps run on always come from
+    this analysis, so a model that paraphrases or truncates them cannot
+    change what gets scored or sent.
+    """
+    if action.name == "calculate_profile_score":
+        state = {"profile_content": profile_content, "job_description": job_description}
+    elif action.name == "generate_outreach_message":
+        state = {"name": get_candidate_name(profile_data), "score": score, "message_section": message_section}
+    else:
+        state = {"profile_data": profile_content, "score": score, "message_section": message_section}
+    return dict(action.arguments, **state)
+
+@dataclass
+class AgentState:
+    """What the agent loop tells the model after the first iteration.
+
+    The profile and job are sent once, in the first prompt; follow-ups
+    refer to them by ``profile_ref``/``job_ref`` and carry the score, a
+    digest of the analysis and the steps done, so their size does not grow
+    with the number of steps. Full step results stay in the loop.
     """
+    profile_ref: str
+    job_ref: str
+    score: Optional[int] = None
+    analysis_digest: str = ''
+    done: List[str] = field(default_factory=list)
+
+    def pending(self) -> List[str]:
+        """Steps the score still requires, in order."""
+        if self.score is None:
+            return ["calculate_profile_score"]
+        required = []
+        if self.score > OUTREACH_THRESHOLD:
+            required.append("generate_outreach_message")
+        if self.score > NOTIFY_THRESHOLD:
+            required.append("send_notifications")
+        return [step for step in required if step not in self.done]
+
+    def query(self) -> str:
+        state = {"score": self.score, "analysis": self.analysis_digest, "done": self.done,
+                 "pending": self.pending()}
+        return (f"Profile: {self.profile_ref}\nJob: {self.job_ref}\n"
+                f"State: {json.dumps(state, ensure_ascii=False)}\nWhat should I do next?")
+
+def run_recruitment_agent(profile_data: Dict[str, Any], job_description: str,
+                          mode: Optional[str] = None, use_cache: bool = True,
+                          job_key: Optional[str] = None, profile_content: Optional[str] = None) -> Dict[str, Any]:
+    """Analyze one profile in ``mode``; ``job_key`` dedups notifications per job.
+
+    Pass ``profile_content`` when prepare_profile_content already ran for
+    this request, so the profile is not cleaned and built twice.
+    """
+    mode = mode or DEFAULT_AGENT_MODE
+    if mode not in AGENT_MODES:
+        raise ValueError(f"Unknown agent mode: {mode}")
+    if mode == "pipeline":
+        return run_direct_pipeline(profile_data, job_description, use_cache=use_cache, job_key=job_key,
+                                   profile_content=profile_content)
+
+    logger.info("\n" + "=" * 80)
+    logger.info("🚀 STARTING RECRUITMENT AGENT ANALYSIS")
+    #pdb.set_trace()  # Debug: Initial data
+    
+    cleaned_profile_data_res = profile_content
+    if cleaned_profile_data_res is None:
+        cleaned_profile_data_res = prepare_profile_content(profile_data)
+    notify_keys = notification_keys(profile_data, job_description, job_key)
+    
+    output_format = AGENT_OUTPUT_FORMAT
+    if output_format not in AGENT_OUTPUT_FORMATS:
+        raise ValueError(f"AGENT_OUTPUT_FORMAT must be one of {list(AGENT_OUTPUT_FORMATS)}")
+    system_prompt = AGENT_SYSTEM_PROMPTS[output_format]
+    response_schema = ACTION_SCHEMA if output_format == 'json' else None
 
     max_iterations = 7
-    last_response = None
     iteration = 0
-    iteration_responses = []
+    repairs = 0
+    state = AgentState(
+        profile_ref=f"{get_candidate_name(profile_data)} "
+                    f"(~{estimate_tokens(cleaned_profile_data_res)} tokens, sent in the first query)",
+        job_ref=f"{digest_text(job_description, 80)} (~{estimate_tokens(job_description)} tokens, "
+                f"sent in the first query)")
     score = None
-    message = None
-    
+    analysis = qualifications = message_section = message = None
+
     while iteration < max_iterations:
-        #pdb.set_trace()  # Debug: Start of iteration
         logger.info(f"\n=== 🔄 Starting Iteration {iteration + 1}/{max_iterations} ===")
-        
-        if last_response is None:
-            current_query = f"Analyze profile:\nProfile: {cleaned_profile_data_res}\nJob: {job_description}"
+        check_deadline("agent iteration")
+
+        # The profile and job go out once; every later query is the compact state
+        if score is None:
+            current_query = f"Analyze profile:\nProfile: {json.dumps(cleaned_profile_data_res)}\nJob: {job_description}"
             logger.info("📝 Initial query created")
         else:
-            current_query = f"{current_query}\n\n" + " ".join(iteration_responses) + "\nWhat should I do next?"
-            logger.info("📝 Follow-up query created with previous results")
+            current_query = state.query()
+            logger.info("📝 Follow-up query created from the agent state")
 
-        logger.info("🤖 Requesting LLM response")
         prompt = f"{system_prompt}\n\nQuery: {current_query}"
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        record_agent_prompt(iteration + 1, len(prompt))
+        logger.info(f"🤖 Requesting LLM response ({len(prompt)} chars, ~{estimate_tokens(prompt)} tokens)")
+        response_text = generate_text(prompt, purpose="agent", response_schema=response_schema).strip()
         logger.info(f"📥 Received response: {response_text[:100]}...")
 
-        if response_text.startswith("FUNCTION_CALL:"):
-            #pdb.set_trace()  # Debug: Before function call
-            logger.info("🔍 Function call detected")
+        # Unusable replies are sent back with the parse error, within a per-analysis budget
+        while True:
             try:
-                _, function_info = response_text.split(":", 1)
-                func_name, params_str = [x.strip() for x in function_info.split("|", 1)]
-                logger.info(f"📋 Parsed function call: {func_name}")
-                
-                # Add more robust parameter preprocessing
-                params_str = params_str.strip()
-                if params_str.startswith('"') and params_str.endswith('"'):
-                    params_str = params_str[1:-1]
-                
-                # Log the parameters for debugging
-                logger.debug(f"Raw parameters: {params_str}")
-                
-                params = safe_eval_params(params_str)
-                #pdb.set_trace()  # Debug: After params processing
-                
-                iteration_result = function_caller(func_name, params)
-                #pdb.set_trace()  # Debug: After function execution
-                
-                last_response = iteration_result
-                iteration_responses.append(f"Called {func_name} with {json.dumps(params)}, got result: {iteration_result}")
-                logger.info(f"✅ Function executed successfully")
-
-                # Store important results for next iterations
-                if func_name == "calculate_profile_score" and isinstance(iteration_result, tuple):
-                    score, analysis, qualifications, message = iteration_result
-                    # Signal next steps in the query
-                    if score > 90:
-                        iteration_responses.append("Score > 90, need to generate message and send notification")
-                    elif score > 50:
-                        iteration_responses.append("Score > 50, need to generate message")
-                
-                elif func_name == "generate_outreach_message":
-                    message = iteration_result
-                    if score > 90:  # Use the stored score
-                        iteration_responses.append("Message generated, need to send notification")
-
-            except Exception as e:
-                logger.error(f"❌ Error in function execution: {str(e)}")
-                logger.error(f"Raw params string: {params_str}")
-                raise
-
-        elif response_text.startswith("FINAL_ANSWER:"):
+                with span("agent.parse_action"):
+                    action = parse_agent_action(response_text, output_format, scored=score is not None)
+                break
+            except ActionParseError as e:
+                record_agent_parse_failure(output_format, e.reason)
+                logger.warning(f"⚠️ Unusable agent reply ({e.reason}): {e}")
+                if repairs >= AGENT_REPAIR_RETRIES:
+                    return finish_agent_fallback(profile_data, cleaned_profile_data_res, job_description,
+                                                 use_cache, notify_keys, iteration + 1, repairs, state,
+                                                 analysis, qualifications, message_section, message)
+                repairs += 1
+                logger.info(f"🔧 Requesting repaired reply ({repairs}/{AGENT_REPAIR_RETRIES})")
+                response_text = generate_text(repair_prompt(prompt, response_text, e, output_format),
+                                              purpose="agent_repair", response_schema=response_schema).strip()
+
+        if action.name == FINAL_ANSWER:
             logger.info("🏁 Final answer received")
-            try:
-                _, result = response_text.split(":", 1)
-                # Replace javascript-style booleans with Python booleans
-                result = result.replace('false', 'False').replace('true', 'True')
-                result = result.strip()
-                
-                # Get the most recent analysis result
-                if last_response and isinstance(last_response, tuple):
-                    score, analysis, qualifications_text, message = last_response
-                    
-                    # Extract key qualifications
-                    key_qualifications = ""
-                    if '#### Key Qualifications' in qualifications_text:
-                        key_quals = qualifications_text.split('#### Key Qualifications')[1]
-                        key_quals = key_quals.split('####')[0].strip()
-                        key_qualifications = key_quals
-
-                    final_result = {
-                        "success": True,
-                        "matchScore": score,
-                        "match_analysis": analysis.strip(),
-                        "key_qualifications": key_qualifications,
-                        "message": message
-                    }
-                else:
-                    # Parse the provided result
-                    try:
-                        final_result = json.loads(result)
-                    except json.JSONDecodeError:
-                        final_result = eval(result)
-                
-                logger.info(f"📊 Final result: {json.dumps(final_result, indent=2)}")
-                return final_result
-            except Exception as e:
-                logger.error(f"❌ Error evaluating final result: {str(e)}")
-                return {
-                    "success": False,
-                    "matchScore": 0,
-                    "match_analysis": "",
-                    "key_qualifications": "",
-                    "message": f"Error processing result: {str(e)}"
-                }
+            final_result = build_final_answer(score, analysis, qualifications, message or message_section)
+            logger.info(f"📊 Final result: {json.dumps(final_result, indent=2)}")
+            record_agent_iterations(iteration + 1, 'final_answer', repairs)
+            return final_result
+
+        logger.info(f"🔍 Function call detected: {action.name}")
+        params = bind_arguments(action, profile_data, cleaned_profile_data_res, job_description,
+                                score, message_section)
+        iteration_result = function_caller(action.name, params, use_cache=use_cache, notify_keys=notify_keys)
+        logger.info(f"✅ Function executed successfully")
+
+        # Keep full results here; the model only sees the state
+        if action.name not in state.done:
+            state.done.append(action.name)
+        if action.name == "calculate_profile_score":
+            score, analysis, qualifications, message_section = iteration_result
+            state.score = score
+            state.analysis_digest = digest_text(analysis, AGENT_DIGEST_CHARS)
+
+        elif action.name == "generate_outreach_message":
+            message = iteration_result
 
         iteration += 1
         logger.info(f"➡️ Completed iteration {iteration}")
 
     logger.warning("⚠️ Max iterations reached without conclusion")
+    record_agent_iterations(iteration, 'max_iterations', repairs)
     return {
         "success": False,
         "matchScore": 0,
         "message": "Max iterations reached without conclusion"
     }
+
+def finish_agent_fallback(profile_data: Dict[str, Any], profile_content: str, job_description: str,
+                          use_cache: bool, notify_keys: Dict[str, str], iterations: int, repairs: int,
+                          state: AgentState, analysis: Optional[str], qualifications: Optional[str],
+                          message_section: Optional[str], message: Optional[str]) -> Dict[str, Any]:
+    """Finish an analysis whose agent ran out of repair retries, as the pipeline would.
+
+    Only the steps still pending in ``state`` run: an existing score is
+    kept and an outreach message already generated is not regenerated,
+    but a score above NOTIFY_THRESHOLD still notifies if the agent had not.
+    """
+    logger.warning(f"⚠️ Agent repair budget exhausted after {repairs} retries, finishing as pipeline")
+    record_agent_iterations(iterations, 'fallback', repairs)
+    if state.score is None:
+        state.score, analysis, qualifications, message_section = function_caller(
+            "calculate_profile_score",
+            {"profile_content": profile_content, "job_description": job_description},
+            use_cache=use_cache
+        )
+        state.done.append("calculate_profile_score")
+    for step in state.pending():
+        params = bind_arguments(AgentAction(step), profile_data, profile_content, job_description,
+                                state.score, message_section)
+        result = function_caller(step, params, use_cache=use_cache, notify_keys=notify_keys)
+        state.done.append(step)
+        if step == "generate_outreach_message":
+            message = result
+
+    final_result = build_final_answer(state.score, analysis, qualifications, message or message_section)
+    logger.info(f"📊 Final result: {json.dumps(final_result, indent=2)}")
+    return final_result
@@ -1,38 +1,76 @@
 # Make sure to install dependencies first:
 # pip install -r ../requirements.txt
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    raise ImportError("Please install google-generativeai: pip install google-generativeai")
-
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Request, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from werkzeug.exceptions import BadRequest
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import json
+import logging
 import os
+import time
 import traceback
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 from recruitment_utils import (
     calculate_profile_score,
     generate_outreach_message,
-    send_notifications,
-    model
+    send_notifications
+)
+from recruitment_agent import (
+    AGENT_MODES,
+    DEFAULT_AGENT_MODE,
+    get_candidate_name,
+    prepare_profile_content,
+    run_recruitment_agent,
+    stream_direct_pipeline
 )
-from recruitment_agent import run_recruitment_agent
-import pdb
+from recruitment_cache import get_result_cache
+from recruitment_dedup import get_dedup_index
+from recruitment_jobs import get_job_queue
+from recruitment_matching import MATCH_MAX_JOBS, MATCH_MAX_PROFILES, clamp_top_n, match_jobs, supplied_job_entry
+from recruitment_prescreen import prescreen_candidates, similarity_scores
+from recruitment_registry import get_registry, job_key_for
+from recruitment_quota import get_quota_stats, is_rate_limited
+from recruitment_resilience import RequestDeadlineExceeded, get_resilience_stats, request_deadline
+from recruitment_notifications import candidate_key, get_notification_outbox, peek_notification_outbox
+from recruitment_models import get_model
+from recruitment_metrics import record_http_request, render_metrics, span, trace_analysis
+from recruitment_prompt import get_prompt_stats
+from recruitment_schema import (
+    MAX_REQUEST_BYTES,
+    PayloadTooLarge,
+    decode_body,
+    get_schema_stats,
+    normalize_profile,
+    record_parse_time
+)
+from recruitment_sheets import get_sheet_writer, peek_sheet_writer
+from recruitment_store import SEARCH_DEFAULT_LIMIT, get_candidate_store
+from recruitment_warmup import WARMUP_MODE, Warmup
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+logger = logging.getLogger('RecruitmentAI')
+
+class GzipAwareRequest(Request):
+    """Request whose body is transparently inflated when sent with Content-Encoding: gzip."""
+
+    def get_data(self, cache=True, as_text=False, parse_form_data=False):
+        if getattr(self, '_decoded_body', None) is None:
+            raw = super().get_data(cache=True, parse_form_data=parse_form_data)
+            self._decoded_body = decode_body(raw, self.headers.get('Content-Encoding'))
+        return self._decoded_body.decode('utf-8') if as_text else self._decoded_body
+
+# Every route lives on this blueprint; create_app() mounts it on a configured Flask app
+api = Blueprint('recruitment', __name__)
+
+# Upper bounds for /analyze_batch; requests may ask for less concurrency, never more
+BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 8))
+BATCH_MAX_PROFILES = int(os.getenv('BATCH_MAX_PROFILES', 500))
+# Pre-screening is local TF-IDF, so it can take far larger candidate sets
+PRESCREEN_MAX_PROFILES = int(os.getenv('PRESCREEN_MAX_PROFILES', 20000))
 
 def extract_score_from_text(text: str) -> tuple[int, str]:
     """Extract score and reasoning from Gemini output."""
@@ -70,6 +108,7 @@ def extract_score_from_text(text: str) -> tuple[int, str]:
 def extract_from_raw_html(html: str) -> Dict[str, str]:
     """Extract profile data from raw HTML if structured extraction fails."""
     try:
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'html.parser')
         name_element = soup.select_one('h1')
         headline_element = soup.select_one('div.text-body-medium')
@@ -87,61 +126,277 @@ def extract_from_raw_html(html: str) -> Dict[str, str]:
         print(f"Error parsing raw HTML: {e}")
         return {}
 
-def analyze_profile(profile_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
-    """Analyze profile data against job description using agent."""
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_metrics(response):
+    # Streamed responses are timed up to their headers
+    started = g.get('request_started')
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        record_http_request(endpoint, request.method, response.status_code, time.perf_counter() - started)
+    return response
+
+@api.before_app_request
+def decode_request_body():
+    """Decode and parse JSON bodies up front so encoding errors map to 400/413."""
+    if request.method != 'POST' or not request.is_json:
+        return None
+    start = time.perf_counter()
     try:
-        #print("Received profile data:", json.dumps(profile_data, indent=2))
-        
-        # Convert string profile data to dict format
-        if isinstance(profile_data, str):
-            profile_data = {
-                'content': profile_data,
-                'intro': {'name': 'Candidate', 'headline': ''}
-            }
-        
-        #profile_data =  json.dumps(profile_data)
-        # Use the recruitment agent to analyze the profile
-        result = run_recruitment_agent(profile_data, job_description)
-        
-        return result
+        request.get_json()
+    except PayloadTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except (BadRequest, ValueError) as e:
+        return jsonify({'error': f'Invalid request body: {e}'}), 400
+    finally:
+        record_parse_time(time.perf_counter() - start)
+    return None
 
-    except Exception as e:
-        print(f"Analysis error: {str(e)}")
+def resolve_job_description(data: Dict[str, Any]):
+    """Job description text and registry entry for a request body.
+
+    A ``job_id`` refers to a registered JD and resolves to its stored text,
+    so the prompt and cache key match a request sending that text as
+    ``jobDescription``; otherwise ``jobDescription`` is used as sent.
+    Raises LookupError for an unknown ID and ValueError when neither is given.
+    """
+    job_id = data.get('job_id')
+    if job_id:
+        entry = get_registry().get(job_id)
+        if entry is None:
+            raise LookupError(f"Unknown job_id: {job_id}")
+        return entry.text, entry
+    if not data.get('jobDescription'):
+        raise ValueError('jobDescription or job_id is required')
+    return data['jobDescription'], None
+
+def to_profile_dict(profile_data: Any) -> Dict[str, Any]:
+    """Convert string profile data to dict format."""
+    if isinstance(profile_data, str):
         return {
-            'success': False,
-            'error': str(e),
-            'matchScore': 0,
-            'scoreReasoning': "Analysis failed",
-            'analysis': "",
-            'message': ""
+            'content': profile_data,
+            'intro': {'name': 'Candidate', 'headline': ''}
         }
+    return profile_data
+
+def analyze_or_reuse(profile_data: Dict[str, Any], job_description: str, mode: str = None,
+                     use_cache: bool = True, job_key: str = None) -> Dict[str, Any]:
+    """run_recruitment_agent, unless a near-duplicate of this profile was already analysed for the job.
+
+    Re-scraped pages differ in counters, feeds and "People also viewed", so
+    the exact-match result cache misses them; the MinHash index catches them
+    before any LLM call. ``use_cache=False`` skips the lookup as well.
+    Profiles without a name are never reused: the index is scoped by name,
+    and they would all share the placeholder one.
+    Fresh successful analyses are recorded in the searchable candidate store.
+    """
+    name = get_candidate_name(profile_data)
+    index = get_dedup_index() if use_cache and name != 'Candidate' else None
+    store = get_candidate_store()
+    if index is None and store is None:
+        return run_recruitment_agent(profile_data, job_description, mode=mode, use_cache=use_cache,
+                                     job_key=job_key)
+
+    profile_content = prepare_profile_content(profile_data)
+    analysis_job_key = job_key or job_key_for(job_description)
+    if index is not None:
+        with span("dedup.lookup"):
+            reused = index.lookup(profile_content, analysis_job_key, name)
+        if reused is not None:
+            logger.info(f"♻️ Reused analysis of a near-duplicate profile "
+                        f"({reused['nearDuplicate']['similarity']:.0%} similar)")
+            return reused
+
+    result = run_recruitment_agent(profile_data, job_description, mode=mode, use_cache=use_cache, job_key=job_key,
+                                   profile_content=profile_content)
+    if result.get('success'):
+        if index is not None:
+            index.add(profile_content, analysis_job_key, result, name)
+        if store is not None:
+            with span("store.record"):
+                try:
+                    store.record(candidate_key(profile_data), analysis_job_key, profile_data, profile_content, result)
+                except Exception as e:
+                    logger.error(f"❌ Error recording candidate: {str(e)}")
+    return result
 
-def extract_skills(text: str) -> list[str]:
-    """Extract skills from text."""
-    # Implement skill extraction logic
-    return []
+def run_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job queue handler; exceptions (a spent deadline included) mark the job as failed."""
+    with trace_analysis() as trace, request_deadline():
+        result = analyze_or_reuse(
+            to_profile_dict(payload['profile']), payload['jobDescription'],
+            mode=payload.get('mode'), use_cache=payload.get('useCache', True), job_key=payload.get('jobKey')
+        )
+    if payload.get('timings'):
+        result['timings'] = trace.to_dict()
+    return result
+
+def analyze_profile(profile_data: Dict[str, Any], job_description: str,
+                    mode: str = None, use_cache: bool = True, timings: bool = False,
+                    job_key: str = None) -> Dict[str, Any]:
+    """Analyze profile data against job description using agent.
+
+    With ``timings`` the result carries a per-stage breakdown of this analysis.
+    ``job_key`` is the registered job_id, used to dedup notifications.
+    The analysis runs within REQUEST_DEADLINE_SECONDS; running out of it is
+    reported with ``deadlineExceeded``, running out of model quota with ``rateLimited``.
+    """
+    with trace_analysis() as trace, request_deadline():
+        try:
+            #print("Received profile data:", json.dumps(profile_data, indent=2))
+            
+            profile_data = to_profile_dict(profile_data)
+            
+            #profile_data =  json.dumps(profile_data)
+            # Use the recruitment agent to analyze the profile
+            result = analyze_or_reuse(profile_data, job_description, mode=mode, use_cache=use_cache,
+                                      job_key=job_key)
+
+        except RequestDeadlineExceeded as e:
+            print(f"Analysis deadline exceeded: {str(e)}")
+            result = {
+                'success': False,
+                'error': str(e),
+                'deadlineExceeded': True,
+                'matchScore': 0,
+                'scoreReasoning': "Analysis timed out",
+                'analysis': "",
+                'message': ""
+            }
+        except Exception as e:
+            print(f"Analysis error: {str(e)}")
+            result = {
+                'success': False,
+                'error': str(e),
+                'matchScore': 0,
+                'scoreReasoning': "Analysis failed",
+                'analysis': "",
+                'message': ""
+            }
+            if is_rate_limited(e):
+                result['rateLimited'] = True
+    if timings:
+        result['timings'] = trace.to_dict()
+    return result
 
-def extract_years_required(text: str) -> int:
-    """Extract required years of experience."""
-    # Implement years extraction logic
-    return 0
+def batch_worker_count(concurrency: int, total: int) -> int:
+    """Clamp the requested concurrency to the server cap and the batch size."""
+    return max(1, min(concurrency, BATCH_MAX_CONCURRENCY, total))
 
-def extract_years_from_experience(text: str) -> int:
-    """Extract years from experience text."""
-    # Implement experience years extraction logic
-    return 0
+def analyze_batch(profiles: list, job_description: str, concurrency: int = BATCH_MAX_CONCURRENCY,
+                  mode: str = None, use_cache: bool = True,
+                  prescreen: Dict[str, Any] = None, job_entry=None,
+                  timings: bool = False) -> list[Dict[str, Any]]:
+    """Analyze many profiles against one job description on a bounded thread pool.
 
-@app.route('/analyze', methods=['POST'])
+    Results keep the input order. analyze_profile reports failures per item,
+    so one bad profile never fails the whole batch. With ``prescreen``
+    (``top_k``/``threshold``) only the TF-IDF shortlist reaches the agent;
+    the rest are returned as ``screened_out``. ``job_entry`` is the
+    registered JD, if any, whose extracted skills and years are reused.
+    """
+    indices = list(range(len(profiles)))
+    similarities = None
+    if prescreen:
+        screening = prescreen_candidates(profiles, job_description, job_entry=job_entry, **prescreen)
+        indices = [item['index'] for item in screening['shortlist']]
+        similarities = screening['similarities']
+
+    job_key = job_entry.job_id if job_entry is not None else None
+    workers = batch_worker_count(concurrency, len(indices))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analyze-batch') as pool:
+        analyzed = dict(zip(indices, pool.map(
+            lambda i: analyze_profile(profiles[i], job_description, mode=mode, use_cache=use_cache,
+                                      timings=timings, job_key=job_key),
+            indices
+        )))
+
+    results = []
+    for i in range(len(profiles)):
+        if i in analyzed:
+            result = {'index': i, **analyzed[i]}
+        else:
+            result = {'index': i, 'success': False, 'screened_out': True, 'matchScore': None}
+        if similarities is not None:
+            result['similarity'] = similarities[i]
+        results.append(result)
+    return results
+
+def parse_prescreen_options(options: Any, max_top_k: int = None) -> Dict[str, Any]:
+    """Validate ``{"topK": int, "threshold": float}`` from a request body."""
+    if not isinstance(options, dict):
+        raise ValueError('prescreen must be an object')
+    top_k = options.get('topK')
+    threshold = options.get('threshold')
+    if top_k is not None:
+        top_k = int(top_k)
+        if top_k < 1:
+            raise ValueError('topK must be at least 1')
+    if threshold is not None:
+        threshold = float(threshold)
+    if max_top_k is not None:
+        top_k = min(top_k or max_top_k, max_top_k)
+    return {'top_k': top_k, 'threshold': threshold}
+
+def wants_timings(data: Dict[str, Any]) -> bool:
+    """Per-request timing breakdown, requested with ``"timings": true`` or ``?timings=1``."""
+    return bool(data.get('timings')) or request.args.get('timings') == '1'
+
+@api.route('/analyze', methods=['POST'])
 def analyze_profile_endpoint():
     try:
         #pdb.set_trace()  # Debug: API request received
         data = request.json
-        if not data or 'profile' not in data or 'jobDescription' not in data:
+        if not data or 'profile' not in data:
             return jsonify({'error': 'Invalid request data'}), 400
+        try:
+            job_description, job_entry = resolve_job_description(data)
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
+        except ValueError as e:
+            return jsonify({'error': f'Invalid request data: {e}'}), 400
+        job_key = job_entry.job_id if job_entry is not None else None
+
+        # Drop the legacy duplicate page copies before anything else touches the payload
+        profile = normalize_profile(data['profile'])
+
+        # "agent" (LLM-driven) or "pipeline" (local state machine); AGENT_MODE env sets the default
+        mode = data.get('mode')
+        if mode is not None and mode not in AGENT_MODES:
+            return jsonify({'error': f"Invalid mode, expected one of {list(AGENT_MODES)}"}), 400
             
-        analysis_result = analyze_profile(data['profile'], data['jobDescription'])
+        use_cache = not data.get('bypassCache', False)
+
+        # Submit/poll mode: queue the analysis and return a job ID right away
+        if data.get('async') or request.args.get('async') == '1':
+            job_id = get_job_queue(run_analysis_job).submit({
+                'profile': profile,
+                'jobDescription': job_description,
+                'mode': mode,
+                'useCache': use_cache,
+                'timings': wants_timings(data),
+                'jobKey': job_key
+            })
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/jobs/{job_id}'
+            }), 202
+
+        analysis_result = analyze_profile(
+            profile, job_description,
+            mode=mode, use_cache=use_cache, timings=wants_timings(data), job_key=job_key
+        )
         #pdb.set_trace()  # Debug: Before sending response
         
+        if analysis_result.get('deadlineExceeded'):
+            return jsonify(analysis_result), 504
+        if analysis_result.get('rateLimited'):
+            return jsonify(analysis_result), 429
         return jsonify(analysis_result)
     except Exception as e:
         #pdb.set_trace()  # Debug: Error handling
@@ -153,22 +408,454 @@ def analyze_profile_endpoint():
             'details': str(e)
         }), 500
 
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@api.route('/analyze_stream', methods=['POST'])
+def analyze_stream_endpoint():
+    """Stream the analysis as Server-Sent Events.
+
+    In pipeline mode, emits ``score`` and ``section`` events while Gemini is
+    generating and a final ``result`` event carrying the same dict as
+    /analyze. Agent mode (``mode`` or AGENT_MODE, as for /analyze) picks its
+    steps one model reply at a time, so it has nothing to stream: it runs as
+    /analyze does and sends the single ``result`` (or ``error``) event.
+    """
+    data = request.json
+    if not data or 'profile' not in data:
+        return jsonify({'error': 'Invalid request data'}), 400
+    mode = data.get('mode') or DEFAULT_AGENT_MODE
+    if mode not in AGENT_MODES:
+        return jsonify({'error': f"Invalid mode, expected one of {list(AGENT_MODES)}"}), 400
+    try:
+        job_description, job_entry = resolve_job_description(data)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': f'Invalid request data: {e}'}), 400
+    job_key = job_entry.job_id if job_entry is not None else None
+
+    profile_data = to_profile_dict(normalize_profile(data['profile']))
+    use_cache = not data.get('bypassCache', False)
+
+    def generate():
+        if mode != 'pipeline':
+            yield format_sse('status', {'stage': mode})
+            result = analyze_profile(profile_data, job_description, mode=mode, use_cache=use_cache, job_key=job_key)
+            if result.get('success'):
+                yield format_sse('result', result)
+            else:
+                yield format_sse('error', {'success': False, 'error': 'Analysis failed', 'details': result.get('error')})
+            return
+
+        yield format_sse('status', {'stage': 'scoring'})
+        try:
+            with request_deadline():
+                for event, payload in stream_direct_pipeline(profile_data, job_description, use_cache=use_cache,
+                                                             job_key=job_key):
+                    yield format_sse(event, payload)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print(traceback.format_exc())
+            yield format_sse('error', {'success': False, 'error': 'Analysis failed', 'details': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api.route('/analyze_batch', methods=['POST'])
+def analyze_batch_endpoint():
+    try:
+        data = request.json
+        if not data or not isinstance(data.get('profiles'), list):
+            return jsonify({'error': 'Invalid request data'}), 400
+        if not data['profiles']:
+            return jsonify({'error': 'profiles must not be empty'}), 400
+        # With pre-screening only the shortlist (at most BATCH_MAX_PROFILES) reaches the LLM
+        max_profiles = PRESCREEN_MAX_PROFILES if data.get('prescreen') else BATCH_MAX_PROFILES
+        if len(data['profiles']) > max_profiles:
+            return jsonify({'error': f"At most {max_profiles} profiles per batch"}), 400
+
+        mode = data.get('mode')
+        if mode is not None and mode not in AGENT_MODES:
+            return jsonify({'error': f"Invalid mode, expected one of {list(AGENT_MODES)}"}), 400
+
+        try:
+            job_description, job_entry = resolve_job_description(data)
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
+        except ValueError as e:
+            return jsonify({'error': f'Invalid request data: {e}'}), 400
+
+        try:
+            concurrency = int(data.get('concurrency', BATCH_MAX_CONCURRENCY))
+            prescreen = None
+            if data.get('prescreen'):
+                prescreen = parse_prescreen_options(data['prescreen'], max_top_k=BATCH_MAX_PROFILES)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid batch options: {e}'}), 400
+
+        start = time.perf_counter()
+        try:
+            results = analyze_batch(
+                [normalize_profile(profile) for profile in data['profiles']], job_description,
+                concurrency=concurrency, mode=mode, use_cache=not data.get('bypassCache', False),
+                prescreen=prescreen, job_entry=job_entry, timings=wants_timings(data)
+            )
+        except ValueError as e:
+            # Only the TF-IDF prescreen raises here; per-profile failures are reported in the results
+            return jsonify({'error': f'Invalid request data: {e}'}), 400
+        succeeded = sum(1 for result in results if result.get('success'))
+        screened_out = sum(1 for result in results if result.get('screened_out'))
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'summary': {
+                'total': len(results),
+                'succeeded': succeeded,
+                'failed': len(results) - succeeded - screened_out,
+                'screened_out': screened_out,
+                'concurrency': batch_worker_count(concurrency, len(results) - screened_out),
+                'elapsed_seconds': round(time.perf_counter() - start, 3)
+            }
+        })
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': 'Batch analysis failed',
+            'details': str(e)
+        }), 500
+
+@api.route('/prescreen', methods=['POST'])
+def prescreen_endpoint():
+    """Rank candidates by TF-IDF similarity to the job description; no LLM calls."""
+    data = request.json
+    if not data or not isinstance(data.get('profiles'), list):
+        return jsonify({'error': 'Invalid request data'}), 400
+    if len(data['profiles']) > PRESCREEN_MAX_PROFILES:
+        return jsonify({'error': f"At most {PRESCREEN_MAX_PROFILES} profiles per request"}), 400
+    try:
+        job_description, job_entry = resolve_job_description(data)
+        options = parse_prescreen_options(data.get('prescreen') or {})
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid prescreen options: {e}'}), 400
+
+    profiles = [normalize_profile(profile) for profile in data['profiles']]
+    try:
+        screening = prescreen_candidates(profiles, job_description, job_entry=job_entry, **options)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid request data: {e}'}), 400
+    return jsonify({'success': True, 'shortlist': screening['shortlist'],
+                    'total': len(data['profiles']), 'elapsed_seconds': screening['elapsed_seconds']})
+
+def resolve_match_jobs(data: Dict[str, Any]) -> list:
+    """Roles for /match_jobs: ``job_ids`` and/or ``jobDescriptions``, else every registered JD.
+
+    Raises LookupError for an unknown ID and ValueError for bad input.
+    """
+    job_ids = data.get('job_ids')
+    supplied = data.get('jobDescriptions')
+    if job_ids is None and supplied is None:
+        jobs = get_registry().list()
+        if not jobs:
+            raise ValueError('no job descriptions registered; send job_ids or jobDescriptions')
+        return jobs
+
+    jobs = []
+    if job_ids is not None:
+        if not isinstance(job_ids, list):
+            raise ValueError('job_ids must be a list')
+        for job_id in job_ids:
+            entry = get_registry().get(job_id)
+            if entry is None:
+                raise LookupError(f"Unknown job_id: {job_id}")
+            jobs.append(entry)
+    if supplied is not None:
+        if not isinstance(supplied, list):
+            raise ValueError('jobDescriptions must be a list')
+        jobs.extend(supplied_job_entry(job) for job in supplied)
+    if not jobs:
+        raise ValueError('job_ids or jobDescriptions must not be empty')
+    return jobs
+
+@api.route('/match_jobs', methods=['POST'])
+def match_jobs_endpoint():
+    """Rank roles for each candidate: one TF-IDF pass over all JDs, one LLM call for the top ``topN``."""
+    data = request.json
+    if not data or not ('profile' in data or isinstance(data.get('profiles'), list)):
+        return jsonify({'error': 'Invalid request data'}), 400
+    profiles = data['profiles'] if 'profiles' in data else [data['profile']]
+    if not profiles:
+        return jsonify({'error': 'profiles must not be empty'}), 400
+    if len(profiles) > MATCH_MAX_PROFILES:
+        return jsonify({'error': f"At most {MATCH_MAX_PROFILES} profiles per request"}), 400
+    try:
+        jobs = resolve_match_jobs(data)
+        top_n = clamp_top_n(data.get('topN'))
+        concurrency = int(data.get('concurrency', BATCH_MAX_CONCURRENCY))
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request data: {e}'}), 400
+    if len(jobs) > MATCH_MAX_JOBS:
+        return jsonify({'error': f"At most {MATCH_MAX_JOBS} job descriptions per request"}), 400
+
+    start = time.perf_counter()
+    try:
+        results = match_jobs(
+            [to_profile_dict(normalize_profile(profile)) for profile in profiles], jobs, top_n=top_n,
+            use_cache=not data.get('bypassCache', False), concurrency=concurrency
+        )
+    except ValueError as e:
+        return jsonify({'error': f'Invalid request data: {e}'}), 400
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': 'Job matching failed', 'details': str(e)}), 500
+    return jsonify({
+        'success': True,
+        'results': results,
+        'summary': {
+            'profiles': len(results),
+            'jobs': len(jobs),
+            'llm_scored_per_profile': min(top_n, len(jobs)),
+            'elapsed_seconds': round(time.perf_counter() - start, 3)
+        }
+    })
+
+@api.route('/candidates/search', methods=['GET'])
+def search_candidates_endpoint():
+    """Stored candidates filtered by job, skills, free text and score, best first.
+
+    Query parameters: ``job_id``, ``skill`` (repeatable, all required),
+    ``q``, ``minScore``, ``sort`` (``score`` or ``recent``), ``limit`` and
+    ``cursor`` from the previous page. ``format=ndjson`` streams every match
+    (up to ``limit`` if given) as one JSON object per line instead.
+    """
+    store = get_candidate_store()
+    if store is None:
+        return jsonify({'error': 'Candidate store is disabled'}), 404
+    args = request.args
+    filters = {
+        'job_key': args.get('job_id') or None,
+        'skills': [skill for skill in args.getlist('skill') if skill.strip()],
+        'text': args.get('q', ''),
+        'sort': args.get('sort', 'score'),
+    }
+    try:
+        filters['min_score'] = int(args['minScore']) if 'minScore' in args else None
+        limit = int(args['limit']) if 'limit' in args else None
+        if limit is not None and limit < 1:
+            raise ValueError('limit must be positive')
+        if args.get('format') == 'ndjson':
+            # Fetch the first page eagerly so bad filters are a 400, not a broken stream
+            rows = store.iter_search(max_results=limit, cursor=args.get('cursor'), **filters)
+            first = next(rows, None)
+        else:
+            page, next_cursor = store.search(limit=limit or SEARCH_DEFAULT_LIMIT, cursor=args.get('cursor'),
+                                             **filters)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid request data: {e}'}), 400
+
+    if args.get('format') != 'ndjson':
+        return jsonify({'candidates': page, 'next_cursor': next_cursor})
+
+    def generate():
+        if first is None:
+            return
+        yield json.dumps(first) + '\n'
+        for row in rows:
+            yield json.dumps(row) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no'})
+
+@api.route('/candidates/<int:candidate_id>', methods=['GET'])
+def get_candidate_endpoint(candidate_id):
+    store = get_candidate_store()
+    candidate = store.get(candidate_id) if store is not None else None
+    if candidate is None:
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify(candidate)
+
+@api.route('/candidates/stats', methods=['GET'])
+def candidates_stats_endpoint():
+    """Stored candidates, distinct jobs, database size and search latency."""
+    store = get_candidate_store()
+    if store is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **store.stats()})
+
+@api.route('/job_descriptions', methods=['POST'])
+def register_job_description_endpoint():
+    """Register a JD once; later requests reference it by ``job_id``."""
+    data = request.json
+    if not data or not isinstance(data.get('text'), str):
+        return jsonify({'error': 'Invalid request data'}), 400
+    try:
+        entry = get_registry().register(data['text'], title=data.get('title', ''), job_id=data.get('job_id'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'success': True, **entry.to_dict()}), 201
+
+@api.route('/job_descriptions', methods=['GET'])
+def list_job_descriptions_endpoint():
+    return jsonify({'job_descriptions': [entry.to_dict() for entry in get_registry().list()]})
+
+@api.route('/job_descriptions/<job_id>', methods=['GET'])
+def get_job_description_endpoint(job_id):
+    entry = get_registry().get(job_id)
+    if entry is None:
+        return jsonify({'error': 'Job description not found'}), 404
+    return jsonify(entry.to_dict(include_text=True))
+
+@api.route('/job_descriptions/<job_id>', methods=['DELETE'])
+def delete_job_description_endpoint(job_id):
+    if not get_registry().delete(job_id):
+        return jsonify({'error': 'Job description not found'}), 404
+    return jsonify({'success': True})
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def job_status_endpoint(job_id):
+    job = get_job_queue(run_analysis_job).get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@api.route('/queue/stats', methods=['GET'])
+def queue_stats_endpoint():
+    return jsonify(get_job_queue(run_analysis_job).stats())
+
+@api.route('/schema/stats', methods=['GET'])
+def schema_stats_endpoint():
+    """Request body sizes, gzip usage and fields dropped/truncated by normalization."""
+    return jsonify(get_schema_stats())
+
+@api.route('/prompt/stats', methods=['GET'])
+def prompt_stats_endpoint():
+    """Prompt sizes after boilerplate stripping, deduplication and budget fitting."""
+    return jsonify(get_prompt_stats())
+
+@api.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text format: stage/LLM/HTTP histograms plus cache, queue, schema, prompt, model call latency and quota, dedup, sheets, outbox and candidate store stats."""
+    sources = {
+        'queue': get_job_queue(run_analysis_job).stats(),
+        'schema': get_schema_stats(),
+        'prompt': get_prompt_stats(),
+        'resilience': get_resilience_stats(),
+        'quota': get_quota_stats(),
+    }
+    cache = get_result_cache()
+    if cache is not None:
+        sources['cache'] = cache.stats()
+    writer = peek_sheet_writer()
+    if writer is not None:
+        sources['sheets'] = writer.stats()
+    dedup = get_dedup_index()
+    if dedup is not None:
+        sources['dedup'] = dedup.stats()
+    outbox = peek_notification_outbox()
+    if outbox is not None:
+        sources['notifications'] = outbox.stats()
+    store = get_candidate_store()
+    if store is not None:
+        sources['candidates'] = store.stats()
+    return Response(render_metrics(sources), mimetype='text/plain; version=0.0.4')
+
+@api.route('/sheets/stats', methods=['GET'])
+def sheets_stats_endpoint():
+    """Sheet writer spool depth, flush counts and the last sink error."""
+    writer = peek_sheet_writer()
+    if writer is None:
+        return jsonify({'started': False})
+    return jsonify({'started': True, **writer.stats()})
+
+@api.route('/notifications/stats', methods=['GET'])
+def notifications_stats_endpoint():
+    """Outbox depth and lag per channel, dedup hits, retries and delivery failures."""
+    outbox = peek_notification_outbox()
+    if outbox is None:
+        return jsonify({'started': False})
+    return jsonify({'started': True, **outbox.stats()})
+
+@api.route('/dedup/stats', methods=['GET'])
+def dedup_stats_endpoint():
+    """Near-duplicate index size, hit rate and lookup cost."""
+    index = get_dedup_index()
+    if index is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **index.stats()})
+
+@api.route('/ready', methods=['GET'])
+def ready_endpoint():
+    """Readiness probe: 503 while this worker is warming up or if a warmup step failed."""
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@api.route('/cache/stats', methods=['GET'])
+def cache_stats_endpoint():
+    cache = get_result_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **cache.stats()})
+
+@api.route('/quota/stats', methods=['GET'])
+def quota_stats_endpoint():
+    return jsonify(get_quota_stats())
+
 def update_sheet(profile, analysis, message):
-    # Google Sheets integration code
-    SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-    SPREADSHEET_ID = os.getenv('GOOGLE_SPREADSHEET_ID')
-    
-    creds = Credentials.from_authorized_user_file('credentials.json', SCOPES)
-    service = build('sheets', 'v4', credentials=creds)
-    
-    values = [[profile, analysis, message]]
-    body = {'values': values}
-    service.spreadsheets().values().append(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Sheet1!A1',
-        valueInputOption='RAW',
-        body=body
-    ).execute()
+    """Queue one row for the sheet; the background writer batches and sends it."""
+    get_sheet_writer().enqueue([profile, analysis, message])
+
+def start_stores():
+    get_result_cache()
+    get_dedup_index()
+    get_candidate_store()
+
+def start_workers():
+    # Jobs and notifications queued before a restart resume without waiting for the first request
+    get_job_queue(run_analysis_job)
+    get_notification_outbox()
+
+# Everything a first request would otherwise pay for: the model client, scikit-learn
+# (imported and run once), the JD registry, SQLite stores and background workers
+warmup = Warmup([
+    ('model', get_model),
+    ('sklearn', lambda: similarity_scores(['warm up the vectorizer'], 'warm up')),
+    ('registry', get_registry),
+    ('stores', start_stores),
+    ('workers', start_workers),
+])
+
+def create_app(warmup_mode: str = None) -> Flask:
+    """Application factory for WSGI servers (see wsgi.py) and tests.
+
+    ``warmup_mode`` defaults to WARMUP_MODE: ``background`` starts warming
+    this process up in a thread and /ready answers 503 until it is done,
+    ``sync`` warms up before returning, ``off`` leaves everything to
+    initialize on first use.
+    """
+    app = Flask(__name__)
+    app.request_class = GzipAwareRequest
+    # Compressed bodies are capped here, decompressed ones in decode_body
+    app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+    CORS(app)  # Enable CORS for all routes
+    app.register_blueprint(api)
+    warmup.start(WARMUP_MODE if warmup_mode is None else warmup_mode)
+    return app
+
+# For the development server and in-process clients (benchmarks); WSGI servers call create_app()
+app = create_app(warmup_mode='off')
 
 if __name__ == '__main__':
+    warmup.start(WARMUP_MODE)
     app.run(port=int(os.getenv('PORT', 5000)))
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('RecruitmentCache')
+
+# Configuration (overridable through .env)
+CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_PATH = os.getenv(
+    'RESULT_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_cache.db')
+)
+CACHE_TTL_SECONDS = int(os.getenv('RESULT_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+CACHE_MEMORY_ENTRIES = int(os.getenv('RESULT_CACHE_MEMORY_ENTRIES', 1024))
+CACHE_DISK_ENTRIES = int(os.getenv('RESULT_CACHE_DISK_ENTRIES', 100000))
+
+# Run disk eviction every N writes instead of counting rows on each one
+_DISK_EVICTION_INTERVAL = 100
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting noise doesn't change the cache key."""
+    return ' '.join(str(text).split())
+
+
+def make_cache_key(profile_content: str, job_description: str, prompt_version: str, model_name: str) -> str:
+    """Content-addressed key for one scoring request."""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, normalize_text(job_description), normalize_text(profile_content)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache: in-process LRU in front of a persistent SQLite store.
+
+    Values must be JSON serializable. Entries expire after ``ttl_seconds`` in
+    both tiers; each tier is also capped by entry count, evicting the least
+    recently used entries first.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = CACHE_TTL_SECONDS,
+                 max_memory_entries: int = CACHE_MEMORY_ENTRIES,
+                 max_disk_entries: int = CACHE_DISK_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+        }
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS result_cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' expires_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_result_cache_accessed ON result_cache(accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+                self._stats['expirations'] += 1
+
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM result_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            if row[1] <= now:
+                self._conn.execute('DELETE FROM result_cache WHERE key = ?', (key,))
+                self._conn.commit()
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            value = json.loads(row[0])
+            self._conn.execute('UPDATE result_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self._remember(key, row[1], value)
+            self._stats['disk_hits'] += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO result_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._conn.commit()
+            self._stats['sets'] += 1
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= _DISK_EVICTION_INTERVAL:
+                self._evict_disk(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute('DELETE FROM result_cache')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries = self._conn.execute('SELECT COUNT(*) FROM result_cache').fetchone()[0]
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        stats['disk_entries'] = disk_entries
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        """Insert into the memory tier; caller holds the lock."""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows over the cap; caller holds the lock."""
+        self._writes_since_eviction = 0
+        expired = self._conn.execute('DELETE FROM result_cache WHERE expires_at <= ?', (now,)).rowcount
+        self._stats['expirations'] += expired
+        overflow = self._conn.execute('SELECT COUNT(*) FROM result_cache').fetchone()[0] - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM result_cache WHERE key IN '
+                '(SELECT key FROM result_cache ORDER BY accessed_at ASC LIMIT ?)', (overflow,)
+            )
+            self._stats['evictions'] += overflow
+        self._conn.commit()
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide cache instance, or None when RESULT_CACHE_ENABLED is false."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                logger.info(f"Opening result cache at {CACHE_PATH}")
+                _cache = ResultCache(CACHE_PATH)
+    return _cache
@@ -0,0 +1,91 @@
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict
+
+# A tag opener, comment/doctype, or character reference; plain text has none
+_MARKUP_PATTERN = re.compile(r'<[A-Za-z/!?]|&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z]+);')
+_SKIPPED_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+_BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'td', 'th', 'tr', 'ul',
+})
+
+
+def has_markup(text: str) -> bool:
+    return _MARKUP_PATTERN.search(text) is not None
+
+
+def collapse_lines(text: str) -> str:
+    """Strip every line and drop blank ones."""
+    return '\n'.join(line for line in map(str.strip, text.splitlines()) if line)
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text nodes in one pass, breaking lines at block elements."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ''.join(parser.parts)
+
+
+def clean_text(text: str) -> str:
+    """Plain text with one non-blank line per line.
+
+    Strings without markup (e.g. the extension's ``innerText`` fields) skip
+    HTML parsing entirely and come out as BeautifulSoup's get_text gave
+    them. Genuine HTML is parsed once and intentionally differs: block
+    elements break lines, so ``<div>Senior Engineer</div><div>Acme</div>``
+    gives two lines instead of ``Senior EngineerAcme``, and script/style
+    text is dropped. Cache keys of HTML payloads change accordingly.
+    """
+    if has_markup(text):
+        text = html_to_text(text)
+    return collapse_lines(text)
+
+
+def clean_profile(profile_data: Any) -> Any:
+    """Clean HTML from top-level string values and string list items of a profile."""
+    if isinstance(profile_data, str):
+        return clean_text(profile_data)
+
+    if isinstance(profile_data, dict):
+        cleaned_data: Dict[str, Any] = {}
+        for key, value in profile_data.items():
+            if isinstance(value, str):
+                cleaned_data[key] = clean_text(value)
+            elif isinstance(value, list):
+                cleaned_data[key] = [clean_text(item) if isinstance(item, str) else item for item in value]
+            else:
+                cleaned_data[key] = value
+        return cleaned_data
+
+    return profile_data
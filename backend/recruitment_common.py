@@ -0,0 +1,32 @@
+import os
+import sqlite3
+from typing import Optional
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank ``pct`` percentile of ``values`` rounded to ms, 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def process_alive(pid: Optional[int]) -> bool:
+    """Whether another process with ``pid`` is running on this host."""
+    if pid is None or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def add_owner_column(conn: sqlite3.Connection, table: str) -> None:
+    """Add the ``owner`` (claiming process ID) column to tables created before it existed."""
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+    if 'owner' not in columns:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN owner INTEGER')
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('RecruitmentDedup')
+
+# Configuration (overridable through .env)
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+DEDUP_PATH = os.getenv(
+    'DEDUP_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_dedup.db')
+)
+# Estimated Jaccard similarity of word trigrams at which a profile counts as already analysed
+DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', 0.8))
+DEDUP_TTL_SECONDS = int(os.getenv('DEDUP_TTL_SECONDS', 7 * 24 * 3600))
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+# LSH banding: 16 bands of 8 rows make pairs above ~0.7 similarity candidates with high probability
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+_TOKEN_PATTERN = re.compile(r'[^\W\d_]+', re.UNICODE)
+# Odd multipliers for combining word hashes into shingle hashes
+_SHINGLE_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+_PERMUTATION_SEEDS = np.random.default_rng(20240611).integers(
+    0, np.iinfo(np.uint64).max, size=NUM_PERMUTATIONS, dtype=np.uint64, endpoint=True
+)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, so every output bit depends on every input bit."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """64-bit hashes of the distinct word trigrams of ``text``.
+
+    Tokens are lowercased letter runs: numbers (follower and notification
+    counts, "3d ago" timestamps) and punctuation are ignored so they don't
+    make a re-scraped page look different. Stable across processes.
+    """
+    words = _TOKEN_PATTERN.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = {word: _word_hash(word) for word in set(words)}
+    word_hashes = np.fromiter((hashes[word] for word in words), dtype=np.uint64, count=len(words))
+    size = min(SHINGLE_SIZE, len(words))
+    shingles = np.zeros(len(words) - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        shingles += word_hashes[offset:offset + len(shingles)] * _SHINGLE_MULTIPLIERS[offset]
+    return np.unique(shingles)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """NUM_PERMUTATIONS 32-bit minimums; equal positions estimate Jaccard similarity."""
+    shingles = shingle_hashes(text)
+    if not len(shingles):
+        return np.full(NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+    permuted = _mix(shingles[:, None] ^ _PERMUTATION_SEEDS[None, :]) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def _scope(job_key: str, name: str) -> str:
+    return f"{job_key}\x00{' '.join(name.lower().split())}"
+
+
+class MinHashIndex:
+    """Near-duplicate lookup of analysis results by MinHash signature.
+
+    Entries are scoped to a job and a candidate name, so a different person
+    with a similar page never matches. Signatures live in one growable
+    numpy matrix; each is bucketed under LSH_BANDS band hashes, a lookup
+    gathers the bucket members for the query's bands and scores them all
+    with one vectorized comparison. Results are kept in SQLite and only
+    read back on a hit; entries older than ``ttl_seconds`` are ignored and
+    purged on startup.
+    """
+
+    def __init__(self, db_path: str, threshold: float = DEDUP_THRESHOLD, ttl_seconds: int = DEDUP_TTL_SECONDS):
+        if not 0 < threshold <= 1:
+            raise ValueError('threshold must be in (0, 1]')
+        self.db_path = db_path
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._signatures = np.zeros((1024, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._created = np.zeros(1024, dtype=np.float64)
+        self._row_ids: List[int] = []
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._stats = {'lookups': 0, 'hits': 0, 'misses': 0, 'added': 0, 'candidates_compared': 0}
+        self._lookup_seconds = 0.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS signatures ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' scope TEXT NOT NULL,'
+            ' signature BLOB NOT NULL,'
+            ' result TEXT NOT NULL,'
+            ' created_at REAL NOT NULL)'
+        )
+        self._conn.execute('DELETE FROM signatures WHERE created_at < ?', (time.time() - ttl_seconds,))
+        self._conn.commit()
+        for row_id, scope, signature, created_at in self._conn.execute(
+                'SELECT id, scope, signature, created_at FROM signatures ORDER BY id'):
+            self._insert(row_id, scope, np.frombuffer(signature, dtype=np.uint32), created_at)
+        logger.info(f"🧬 Loaded {len(self._row_ids)} profile signature(s) from {db_path}")
+
+    def __len__(self) -> int:
+        return len(self._row_ids)
+
+    @staticmethod
+    def _band_keys(scope: str, signature: np.ndarray) -> List[tuple]:
+        return [(scope, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+                for band in range(LSH_BANDS)]
+
+    def _insert(self, row_id: int, scope: str, signature: np.ndarray, created_at: float) -> None:
+        """Add one signature to the in-memory index; caller holds the lock."""
+        position = len(self._row_ids)
+        if position == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.zeros_like(self._signatures)])
+            self._created = np.concatenate([self._created, np.zeros_like(self._created)])
+        self._signatures[position] = signature
+        self._created[position] = created_at
+        self._row_ids.append(row_id)
+        for key in self._band_keys(scope, signature):
+            self._buckets.setdefault(key, []).append(position)
+
+    def find(self, signature: np.ndarray, job_key: str, name: str = '') -> Optional[Tuple[int, float, float]]:
+        """Most similar live entry at or above threshold as ``(row_id, similarity, created_at)``."""
+        start = time.perf_counter()
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(_scope(job_key, name), signature):
+                candidates.update(self._buckets.get(key, ()))
+            match = None
+            if candidates:
+                positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                similarities = (self._signatures[positions] == signature).mean(axis=1)
+                # Expired entries are out of the running
+                similarities[self._created[positions] < time.time() - self.ttl_seconds] = 0.0
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    position = int(positions[best])
+                    match = (self._row_ids[position], float(similarities[best]), float(self._created[position]))
+            self._stats['lookups'] += 1
+            self._stats['hits' if match else 'misses'] += 1
+            self._stats['candidates_compared'] += len(candidates)
+            self._lookup_seconds += time.perf_counter() - start
+        return match
+
+    def lookup(self, text: str, job_key: str, name: str = '') -> Optional[Dict[str, Any]]:
+        """Stored result of a near-duplicate of ``text`` analysed for ``job_key``, if any.
+
+        The result carries a ``nearDuplicate`` block with the estimated
+        similarity and the age of the original analysis.
+        """
+        match = self.find(minhash_signature(text), job_key, name)
+        if match is None:
+            return None
+        row_id, similarity, created_at = match
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM signatures WHERE id = ?', (row_id,)).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        result['nearDuplicate'] = {'similarity': round(similarity, 3),
+                                   'ageSeconds': round(time.time() - created_at, 1)}
+        return result
+
+    def add(self, text: str, job_key: str, result: Dict[str, Any], name: str = '') -> None:
+        """Remember ``result`` for ``text`` analysed for ``job_key``."""
+        self.add_signature(minhash_signature(text), job_key, result, name)
+
+    def add_signature(self, signature: np.ndarray, job_key: str, result: Dict[str, Any], name: str = '') -> None:
+        scope = _scope(job_key, name)
+        created_at = time.time()
+        with self._lock:
+            row_id = self._conn.execute(
+                'INSERT INTO signatures (scope, signature, result, created_at) VALUES (?, ?, ?, ?)',
+                (scope, signature.astype(np.uint32).tobytes(), json.dumps(result), created_at)
+            ).lastrowid
+            self._conn.commit()
+            self._insert(row_id, scope, signature, created_at)
+            self._stats['added'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['lookups']
+            stats.update({
+                'entries': len(self._row_ids),
+                'threshold': self.threshold,
+                'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+                'avg_lookup_us': round(self._lookup_seconds / lookups * 1e6, 2) if lookups else 0.0,
+                'avg_candidates': round(stats['candidates_compared'] / lookups, 2) if lookups else 0.0,
+            })
+        return stats
+
+
+_index: Optional[MinHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index() -> Optional[MinHashIndex]:
+    """Process-wide index, or None when DEDUP_ENABLED is false."""
+    global _index
+    if not DEDUP_ENABLED:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MinHashIndex(DEDUP_PATH)
+    return _index
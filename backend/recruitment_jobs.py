@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from recruitment_common import add_owner_column, percentile, process_alive
+
+logger = logging.getLogger('RecruitmentJobs')
+
+# Configuration (overridable through .env)
+JOB_QUEUE_PATH = os.getenv(
+    'JOB_QUEUE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_jobs.db')
+)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 24 * 3600))
+
+# Number of finished jobs kept in memory for timing statistics
+_TIMING_WINDOW = 200
+# Workers re-check the table at least this often even without a wakeup
+_POLL_SECONDS = 1.0
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+class JobQueue:
+    """SQLite-backed analysis queue drained by a pool of worker threads.
+
+    ``handler`` receives the submitted payload dict and returns a JSON
+    serializable result. Several processes (WSGI workers) may share one
+    database: claims are a single conditional UPDATE, and each running job
+    records the claiming process, so on startup only jobs whose process has
+    died are re-queued. Finished jobs are purged after ``retention_seconds``.
+    """
+
+    def __init__(self, db_path: str, handler: Callable[[Dict[str, Any]], Any],
+                 workers: int = JOB_WORKERS, retention_seconds: int = JOB_RETENTION_SECONDS):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._threads: list[threading.Thread] = []
+        self._in_flight = 0
+        self._queue_waits = deque(maxlen=_TIMING_WINDOW)
+        self._run_times = deque(maxlen=_TIMING_WINDOW)
+        self._last_purge = 0.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY,'
+            ' status TEXT NOT NULL,'
+            ' payload TEXT NOT NULL,'
+            ' result TEXT,'
+            ' error TEXT,'
+            ' created_at REAL NOT NULL,'
+            ' started_at REAL,'
+            ' finished_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)')
+        add_owner_column(self._conn, 'jobs')
+        # Running jobs whose process is gone were interrupted; live sibling processes keep theirs
+        orphaned = [(row_id,) for row_id, owner in self._conn.execute(
+            "SELECT id, owner FROM jobs WHERE status = 'running'") if not process_alive(owner)]
+        self._conn.executemany(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL WHERE id = ? AND status = 'running'",
+            orphaned
+        )
+        recovered = len(orphaned)
+        self._conn.commit()
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted job(s)")
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} job worker(s) on {self.db_path}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        with self._wakeup:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, 'queued', ?, ?)",
+                (job_id, json.dumps(payload), time.time())
+            )
+            self._conn.commit()
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, result, error, created_at, started_at, finished_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result, error, created_at, started_at, finished_at = row
+        return {
+            'job_id': job_id,
+            'status': status,
+            'result': json.loads(result) if result is not None else None,
+            'error': error,
+            'timings': self._timings(created_at, started_at, finished_at),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+            queue_waits = list(self._queue_waits)
+            run_times = list(self._run_times)
+            in_flight = self._in_flight
+        return {
+            'workers': self.workers,
+            'queue_depth': counts.get('queued', 0),
+            'in_flight': in_flight,
+            'completed': counts.get('completed', 0),
+            'failed': counts.get('failed', 0),
+            'oldest_queued_age_seconds': round(time.time() - oldest, 3) if oldest else 0.0,
+            'queue_wait_seconds': {'p50': percentile(queue_waits, 50), 'p95': percentile(queue_waits, 95)},
+            'run_seconds': {'p50': percentile(run_times, 50), 'p95': percentile(run_times, 95)},
+        }
+
+    def _timings(self, created_at, started_at, finished_at) -> Dict[str, Optional[float]]:
+        now = time.time()
+        return {
+            'queue_wait_seconds': round((started_at or now) - created_at, 3),
+            'run_seconds': round((finished_at or now) - started_at, 3) if started_at else None,
+            'total_seconds': round((finished_at or now) - created_at, 3),
+        }
+
+    def _claim(self) -> Optional[tuple]:
+        """Move the oldest queued job to running; caller holds the lock.
+
+        One statement, so two processes can never claim the same job.
+        """
+        started_at = time.time()
+        row = self._conn.execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, owner = ? WHERE id = ("
+            " SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1)"
+            " RETURNING id, payload, created_at",
+            (started_at, os.getpid())
+        ).fetchone()
+        self._conn.commit()
+        if row is None:
+            return None
+        self._in_flight += 1
+        self._queue_waits.append(started_at - row[2])
+        return row[0], json.loads(row[1]), started_at
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._wakeup:
+                job = None
+                while not self._stopping:
+                    self._maybe_purge()
+                    job = self._claim()
+                    if job is not None:
+                        break
+                    self._wakeup.wait(_POLL_SECONDS)
+                if self._stopping:
+                    return
+
+            job_id, payload, started_at = job
+            result, error = None, None
+            try:
+                result = json.dumps(self.handler(payload))
+                status = 'completed'
+            except Exception as e:
+                logger.error(f"❌ Job {job_id} failed: {e}")
+                logger.error(traceback.format_exc())
+                status, error = 'failed', str(e)
+
+            finished_at = time.time()
+            with self._lock:
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+                    (status, result, error, finished_at, job_id)
+                )
+                self._conn.commit()
+                self._in_flight -= 1
+                self._run_times.append(finished_at - started_at)
+
+    def _maybe_purge(self) -> None:
+        """Delete finished jobs past retention; caller holds the lock."""
+        now = time.time()
+        if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = self._conn.execute(
+            "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND finished_at < ?",
+            (now - self.retention_seconds,)
+        ).rowcount
+        self._conn.commit()
+        if purged:
+            logger.info(f"Purged {purged} finished job(s) past retention")
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue(handler: Callable[[Dict[str, Any]], Any]) -> JobQueue:
+    """Process-wide queue, created and started on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = JobQueue(JOB_QUEUE_PATH, handler)
+                queue.start()
+                _queue = queue
+    return _queue
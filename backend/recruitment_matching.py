@@ -0,0 +1,106 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from recruitment_agent import get_candidate_name, prepare_profile_content
+from recruitment_metrics import span
+from recruitment_prescreen import rank_by_similarity, similarity_matrix
+from recruitment_registry import JobDescriptionEntry, build_entry, job_key_for
+from recruitment_resilience import request_deadline
+from recruitment_utils import calculate_multi_role_scores
+
+logger = logging.getLogger('RecruitmentMatching')
+
+# Configuration (overridable through .env)
+# Roles per candidate sent to the LLM; the rest are ranked by similarity only
+MATCH_TOP_N = int(os.getenv('MATCH_TOP_N', 3))
+MATCH_MAX_TOP_N = int(os.getenv('MATCH_MAX_TOP_N', 10))
+MATCH_MAX_JOBS = int(os.getenv('MATCH_MAX_JOBS', 200))
+MATCH_MAX_PROFILES = int(os.getenv('MATCH_MAX_PROFILES', 50))
+MATCH_MAX_CONCURRENCY = int(os.getenv('MATCH_MAX_CONCURRENCY', 8))
+
+
+def supplied_job_entry(job: Any) -> JobDescriptionEntry:
+    """Entry for a JD sent in the request body: a string or ``{"text", "title", "id"}``."""
+    if isinstance(job, str):
+        job = {'text': job}
+    if not isinstance(job, dict) or not isinstance(job.get('text'), str) or not job['text'].strip():
+        raise ValueError('each job description needs non-empty text')
+    return build_entry(job.get('id') or job_key_for(job['text']), job.get('title', ''), job['text'], time.time())
+
+
+def match_profile(profile_content: str, name: str, jobs: List[JobDescriptionEntry], similarities,
+                  top_n: int = MATCH_TOP_N, use_cache: bool = True) -> Dict[str, Any]:
+    """Ranked roles for one cleaned profile given its row of the similarity matrix.
+
+    The ``top_n`` most similar roles are scored by the LLM in one
+    multi-role call and ranked by score; the remaining roles follow in
+    ``other_roles``, ranked by similarity alone.
+    """
+    order = rank_by_similarity(similarities)
+    shortlist, rest = order[:top_n], order[top_n:]
+
+    scores = calculate_multi_role_scores(profile_content, [jobs[i].prompt_fragment for i in shortlist],
+                                         use_cache=use_cache) if shortlist else []
+    roles = []
+    for i, (score, analysis, qualifications) in zip(shortlist, scores):
+        roles.append({
+            'job_id': jobs[i].job_id,
+            'title': jobs[i].title,
+            'similarity': round(float(similarities[i]), 4),
+            'matchScore': score,
+            'match_analysis': analysis,
+            'key_qualifications': qualifications,
+        })
+    roles.sort(key=lambda role: (-role['matchScore'], -role['similarity']))
+    for rank, role in enumerate(roles):
+        role['rank'] = rank + 1
+
+    return {
+        'success': True,
+        'candidate': name,
+        'roles': roles,
+        'other_roles': [
+            {'job_id': jobs[i].job_id, 'title': jobs[i].title, 'similarity': round(float(similarities[i]), 4)}
+            for i in rest
+        ],
+    }
+
+
+def match_jobs(profiles: List[Dict[str, Any]], jobs: List[JobDescriptionEntry], top_n: int = MATCH_TOP_N,
+               use_cache: bool = True, concurrency: int = MATCH_MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Rank ``jobs`` for each profile.
+
+    Every profile is cleaned once; one TF-IDF fit gives the full
+    profiles x jobs similarity matrix, then each profile's shortlist is
+    scored with one LLM call on a bounded thread pool, each profile within
+    its own request deadline. Failures are reported per profile.
+    """
+    with span("match.clean"):
+        contents = [prepare_profile_content(profile) for profile in profiles]
+    with span("match.similarity"):
+        matrix = similarity_matrix(contents, [job.normalized_text for job in jobs])
+    logger.info(f"🧭 Matching {len(profiles)} profile(s) against {len(jobs)} role(s), LLM-scoring top {top_n}")
+
+    def run(i: int) -> Dict[str, Any]:
+        name = get_candidate_name(profiles[i])
+        try:
+            with request_deadline():
+                return match_profile(contents[i], name, jobs, matrix[i], top_n=top_n, use_cache=use_cache)
+        except Exception as e:
+            logger.error(f"❌ Matching profile {i} failed: {e}")
+            return {'success': False, 'candidate': name, 'error': str(e), 'roles': [], 'other_roles': []}
+
+    workers = max(1, min(concurrency, MATCH_MAX_CONCURRENCY, len(profiles)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='match-jobs') as pool:
+        results = list(pool.map(run, range(len(profiles))))
+    return [{'index': i, **result} for i, result in enumerate(results)]
+
+
+def clamp_top_n(top_n: Optional[Any]) -> int:
+    top_n = MATCH_TOP_N if top_n is None else int(top_n)
+    if top_n < 0:
+        raise ValueError('topN must not be negative')
+    return min(top_n, MATCH_MAX_TOP_N)
@@ -0,0 +1,294 @@
+import contextvars
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Seconds; Gemini round trips run from ~1s to the 40s worst cases seen in the logs
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+SIZE_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 7, 10)
+
+# Stats dict keys whose children are open-ended names (payload fields), rendered as labels
+_LABELED_STATS = {'dropped_fields': 'field', 'truncated_fields': 'field'}
+# At most this many label values per labeled stats key, largest first
+_MAX_LABEL_VALUES = 20
+_NAME_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        lines.extend(f'{self.name}{_format_labels(key)} {_format_value(value)}' for key, value in sorted(values.items()))
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets) + (math.inf,)
+        # label key -> [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: list(series) for key, series in self._values.items()}
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(key, ("le", _format_value(bound)))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {round(series[-2], 6)}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {series[-1]}')
+        return lines
+
+
+STAGE_SECONDS = Histogram('recruitment_stage_seconds', 'Time spent per analysis stage')
+LLM_CALLS = Counter('recruitment_llm_calls_total', 'Model calls by purpose and outcome')
+LLM_SECONDS = Histogram('recruitment_llm_seconds', 'Model call latency by purpose')
+LLM_PROMPT_CHARS = Histogram('recruitment_llm_prompt_chars', 'Prompt size in characters', SIZE_BUCKETS)
+LLM_RESPONSE_CHARS = Histogram('recruitment_llm_response_chars', 'Response size in characters', SIZE_BUCKETS)
+LLM_RETRIES = Counter('recruitment_llm_retries_total', 'Model call retries by purpose and failure reason')
+LLM_HEDGES = Counter('recruitment_llm_hedges_total', 'Hedged model calls by purpose, fired and won by the hedge')
+DEADLINES_EXCEEDED = Counter('recruitment_deadlines_exceeded_total', 'Analyses stopped by the request deadline')
+AGENT_ITERATIONS = Histogram('recruitment_agent_iterations', 'Agent loop iterations per analysis', COUNT_BUCKETS)
+AGENT_OUTCOMES = Counter('recruitment_agent_outcomes_total', 'Agent analyses by how the loop ended')
+AGENT_PARSE_FAILURES = Counter('recruitment_agent_parse_failures_total', 'Unusable agent replies by output format and reason')
+AGENT_REPAIR_RETRIES = Histogram('recruitment_agent_repair_retries', 'Repair calls per agent analysis', COUNT_BUCKETS)
+AGENT_PROMPT_CHARS = Histogram('recruitment_agent_prompt_chars', 'Agent prompt size per loop iteration', SIZE_BUCKETS)
+ANALYSIS_LLM_CALLS = Histogram('recruitment_analysis_llm_calls', 'Model calls per profile analysis', COUNT_BUCKETS)
+ANALYSIS_SECONDS = Histogram('recruitment_analysis_seconds', 'End-to-end profile analysis time')
+HTTP_REQUESTS = Counter('recruitment_http_requests_total', 'HTTP requests by endpoint and status')
+HTTP_SECONDS = Histogram('recruitment_http_request_seconds', 'HTTP request latency by endpoint')
+
+_METRICS = (STAGE_SECONDS, LLM_CALLS, LLM_SECONDS, LLM_PROMPT_CHARS, LLM_RESPONSE_CHARS, LLM_RETRIES, LLM_HEDGES,
+            DEADLINES_EXCEEDED, AGENT_ITERATIONS, AGENT_OUTCOMES, AGENT_PARSE_FAILURES, AGENT_REPAIR_RETRIES,
+            AGENT_PROMPT_CHARS, ANALYSIS_LLM_CALLS, ANALYSIS_SECONDS, HTTP_REQUESTS, HTTP_SECONDS)
+
+
+class AnalysisTrace:
+    """Per-analysis timing breakdown, collected while the trace is active."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.llm_calls = 0
+        self.prompt_chars = 0
+        self.response_chars = 0
+        self.llm_retries = 0
+        self.agent_iterations = 0
+        self.agent_parse_failures = 0
+        self.agent_repair_retries = 0
+        self.agent_outcome: Optional[str] = None
+        self.agent_prompt_chars: List[int] = []
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        stage = self.stages.setdefault(name, [0, 0.0])
+        stage[0] += 1
+        stage[1] += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 4),
+            'stages': {name: {'count': count, 'seconds': round(seconds, 4)}
+                       for name, (count, seconds) in self.stages.items()},
+            'llm_calls': self.llm_calls,
+            'prompt_chars': self.prompt_chars,
+            'response_chars': self.response_chars,
+            'llm_retries': self.llm_retries,
+            'agent_iterations': self.agent_iterations,
+            'agent_parse_failures': self.agent_parse_failures,
+            'agent_repair_retries': self.agent_repair_retries,
+            'agent_outcome': self.agent_outcome,
+            'agent_prompt_chars': self.agent_prompt_chars,
+        }
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('recruitment_trace', default=None)
+
+
+def current_trace() -> Optional[AnalysisTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_analysis() -> Iterator[AnalysisTrace]:
+    """Collect stages and model calls of one profile analysis on this thread."""
+    trace = AnalysisTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        ANALYSIS_SECONDS.observe(time.perf_counter() - trace.started)
+        ANALYSIS_LLM_CALLS.observe(trace.llm_calls)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time one stage into recruitment_stage_seconds and the active trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_stage(stage, elapsed)
+
+
+def record_llm_call(purpose: str, prompt_chars: int, response_chars: int, seconds: float,
+                    success: bool = True) -> None:
+    LLM_CALLS.inc(purpose=purpose, outcome='success' if success else 'error')
+    LLM_SECONDS.observe(seconds, purpose=purpose)
+    LLM_PROMPT_CHARS.observe(prompt_chars, purpose=purpose)
+    if success:
+        LLM_RESPONSE_CHARS.observe(response_chars, purpose=purpose)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.llm_calls += 1
+        trace.prompt_chars += prompt_chars
+        trace.response_chars += response_chars
+
+
+def record_llm_retry(purpose: str, reason: str) -> None:
+    LLM_RETRIES.inc(purpose=purpose, reason=reason)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.llm_retries += 1
+
+
+def record_llm_hedge(purpose: str, outcome: str) -> None:
+    LLM_HEDGES.inc(purpose=purpose, outcome=outcome)
+
+
+def record_deadline_exceeded(where: str) -> None:
+    DEADLINES_EXCEEDED.inc(where=where)
+
+
+def record_agent_iterations(iterations: int, outcome: str = 'final_answer', repair_retries: int = 0) -> None:
+    """One finished agent loop; ``outcome`` is final_answer, fallback or max_iterations."""
+    AGENT_ITERATIONS.observe(iterations)
+    AGENT_OUTCOMES.inc(outcome=outcome)
+    AGENT_REPAIR_RETRIES.observe(repair_retries)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.agent_iterations = iterations
+        trace.agent_repair_retries = repair_retries
+        trace.agent_outcome = outcome
+
+
+def record_agent_prompt(iteration: int, prompt_chars: int) -> None:
+    """Size of the prompt sent in agent loop ``iteration`` (1-based)."""
+    AGENT_PROMPT_CHARS.observe(prompt_chars, iteration=iteration)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.agent_prompt_chars.append(prompt_chars)
+
+
+def record_agent_parse_failure(output_format: str, reason: str) -> None:
+    AGENT_PARSE_FAILURES.inc(format=output_format, reason=reason)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.agent_parse_failures += 1
+
+
+def record_http_request(endpoint: str, method: str, status: int, seconds: float) -> None:
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=method, status=status)
+    HTTP_SECONDS.observe(seconds, endpoint=endpoint)
+
+
+def _sanitize(name: Any) -> str:
+    return _NAME_PATTERN.sub('_', str(name))
+
+
+def _stats_lines(name: str, value: Any, seen: set) -> List[str]:
+    """Gauge lines for the numeric leaves of a stats dict, named by their path."""
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, (int, float)):
+        header = [] if name in seen else [f'# TYPE {name} gauge']
+        seen.add(name)
+        return header + [f'{name} {_format_value(value)}']
+    if not isinstance(value, dict):
+        return []
+    lines = []
+    for key, item in value.items():
+        label = _LABELED_STATS.get(key)
+        child = f'{name}_{_sanitize(key)}'
+        if label and isinstance(item, dict):
+            top = sorted(item.items(), key=lambda pair: -pair[1])[:_MAX_LABEL_VALUES]
+            if top:
+                lines.append(f'# TYPE {child} gauge')
+            lines.extend(f'{child}{_format_labels(((label, str(field)),))} {count}' for field, count in top)
+        else:
+            lines.extend(_stats_lines(child, item, seen))
+    return lines
+
+
+def render_metrics(stats_sources: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Prometheus text exposition of all metrics plus gauges for ``stats_sources``.
+
+    ``stats_sources`` maps a short name (``cache``, ``queue``...) to a stats
+    dict such as ResultCache.stats(); numeric leaves become
+    ``recruitment_<name>_<path>`` gauges.
+    """
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    seen = set()
+    for source, stats in (stats_sources or {}).items():
+        lines.extend(_stats_lines(f'recruitment_{_sanitize(source)}', stats, seen))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,366 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from recruitment_metrics import record_llm_call, span
+from recruitment_quota import quota_slot
+from recruitment_resilience import call_with_retries
+
+load_dotenv()
+
+logger = logging.getLogger('RecruitmentModels')
+
+# Configuration (overridable through .env)
+# "gemini" calls the live API; "fake" answers locally for load tests and offline runs
+MODEL_BACKEND = os.getenv('MODEL_BACKEND', 'gemini')
+GEMINI_MODEL_NAME = os.getenv('GEMINI_MODEL_NAME', 'gemini-2.0-flash')
+# Latency spec for the fake backend, see LatencyDistribution.parse
+FAKE_MODEL_LATENCY = os.getenv('FAKE_MODEL_LATENCY', 'lognormal:0.8,0.35')
+# Fixed match score returned by the fake backend; unset derives one from the prompt
+FAKE_MODEL_SCORE = os.getenv('FAKE_MODEL_SCORE')
+FAKE_MODEL_SEED = int(os.getenv('FAKE_MODEL_SEED', 0))
+# Fraction of fake agent replies that come back malformed, to exercise the repair path
+FAKE_MODEL_MALFORMED_RATE = float(os.getenv('FAKE_MODEL_MALFORMED_RATE', 0))
+# Fault injection for the fake backend: share of calls failing with a 503, and "RATE,SECONDS" latency spikes
+FAKE_MODEL_FAILURE_RATE = float(os.getenv('FAKE_MODEL_FAILURE_RATE', 0))
+FAKE_MODEL_SPIKE = os.getenv('FAKE_MODEL_SPIKE', '0,0')
+# Concurrent calls the fake backend serves before answering 429, like an exhausted quota; 0 for no limit
+FAKE_MODEL_MAX_CONCURRENCY = int(os.getenv('FAKE_MODEL_MAX_CONCURRENCY', 0))
+
+FAKE_SCORE_MARKDOWN = """### Match Score
+**Score:** {score}
+
+### Match Analysis
+The candidate's experience overlaps with the core requirements of the role. Skills listed in the profile cover most of the required stack; depth in the remaining areas needs verification during screening.
+
+### Qualifications Analysis
+
+#### Key Qualifications
+- Relevant software engineering experience.
+- Hands-on work with the primary languages in the job description.
+
+#### Areas of Excellence
+- Breadth across frameworks and databases.
+
+#### Development Areas
+- Cloud experience is listed but not evidenced in project descriptions.
+
+### Personalized Message
+Hi {name},
+
+Your background looks like a strong fit for a role we're hiring for. Would you be open to a short conversation this week?
+
+Best regards,
+Recruitment Team
+"""
+
+FAKE_ROLE_MARKDOWN = """## Role {label}
+### Match Score
+**Score:** {score}
+### Match Analysis
+The profile covers part of this role's core stack; remaining requirements need verification during screening.
+### Key Qualifications
+- Hands-on work with the primary languages in the job description.
+"""
+
+
+class ModelResponse:
+    """Minimal stand-in for a Gemini response or stream chunk: only ``.text`` is used."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ModelUnavailableError(Exception):
+    """Transient backend failure; ``code`` mirrors google-api-core's HTTP status attribute."""
+
+    code = 503
+
+
+class ModelRateLimitedError(ModelUnavailableError):
+    """The backend refused the call for quota (HTTP 429)."""
+
+    code = 429
+
+
+class ModelBackend:
+    """What the agent and scorer need from an LLM.
+
+    ``generate_content(prompt)`` returns an object with ``.text``;
+    ``generate_content(prompt, stream=True)`` returns an iterator of such
+    chunks. This is the subset of ``genai.GenerativeModel`` the code uses,
+    including ``request_options={'timeout': seconds}`` to bound one call.
+    """
+
+    name = 'base'
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> Any:
+        raise NotImplementedError
+
+
+class GeminiBackend(ModelBackend):
+    def __init__(self, model_name: str = GEMINI_MODEL_NAME, api_key: Optional[str] = None):
+        # The client library pulls in gRPC and protobuf stubs; import it only when Gemini is actually used
+        import google.generativeai as genai
+        genai.configure(api_key=api_key or os.getenv('GEMINI_API_KEY'))
+        self.name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> Any:
+        return self._model.generate_content(prompt, stream=stream, **kwargs)
+
+
+class LatencyDistribution:
+    """Seeded latency sampler for the fake backend.
+
+    Specs: ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,STD`` and
+    ``lognormal:MEDIAN,SIGMA`` (seconds). A bare number means ``fixed``.
+    """
+
+    KINDS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+    def __init__(self, kind: str = 'fixed', params: tuple = (0.0,), seed: int = 0):
+        if kind not in self.KINDS:
+            raise ValueError(f'Unknown latency distribution: {kind}')
+        self.kind = kind
+        self.params = tuple(float(value) for value in params)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: str, seed: int = 0) -> 'LatencyDistribution':
+        kind, _, params = spec.partition(':')
+        if not params:
+            kind, params = 'fixed', kind
+        return cls(kind.strip().lower(), tuple(params.split(',')), seed=seed)
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == 'fixed':
+                value = self.params[0]
+            elif self.kind == 'uniform':
+                value = self._rng.uniform(*self.params[:2])
+            elif self.kind == 'normal':
+                value = self._rng.gauss(*self.params[:2])
+            else:
+                median, sigma = self.params[:2]
+                value = median * self._rng.lognormvariate(0, sigma)
+        return max(0.0, value)
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(f'{value:g}' for value in self.params)}"
+
+
+class FakeBackend(ModelBackend):
+    """Deterministic local stand-in for Gemini.
+
+    Answers scoring prompts (single or multi-role) with canned markdown
+    and agent prompts with the FUNCTION_CALL / FINAL_ANSWER sequence the
+    live model produces (or ``{"action": ...}`` objects when called with a
+    JSON ``generation_config``), sleeping a sampled latency per call
+    (spread across chunks when streaming). ``malformed_rate`` of the agent
+    replies are garbled the ways live replies go wrong; ``failure_rate`` of
+    the calls raise ModelUnavailableError and ``spike_rate`` of them take
+    ``spike_seconds`` longer. A call that would outlive its
+    ``request_options`` timeout raises TimeoutError once that has passed.
+    Past ``max_concurrency`` calls in flight it raises ModelRateLimitedError.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency: Any = FAKE_MODEL_LATENCY, score: Optional[int] = None,
+                 score_markdown: str = FAKE_SCORE_MARKDOWN, seed: int = FAKE_MODEL_SEED,
+                 malformed_rate: float = FAKE_MODEL_MALFORMED_RATE, failure_rate: float = FAKE_MODEL_FAILURE_RATE,
+                 spike: Any = FAKE_MODEL_SPIKE, max_concurrency: int = FAKE_MODEL_MAX_CONCURRENCY):
+        if isinstance(latency, (int, float)):
+            latency = LatencyDistribution('fixed', (latency,), seed=seed)
+        elif isinstance(latency, str):
+            latency = LatencyDistribution.parse(latency, seed=seed)
+        self.latency = latency
+        self.score = score
+        self.score_markdown = score_markdown
+        self.malformed_rate = malformed_rate
+        self.failure_rate = failure_rate
+        if isinstance(spike, str):
+            spike = tuple(float(value) for value in spike.split(','))
+        self.spike_rate, self.spike_seconds = spike
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> Any:
+        with self._lock:
+            self.calls += 1
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                self.rate_limited += 1
+                raise ModelRateLimitedError('Injected fake backend rate limit')
+            self.in_flight += 1
+        try:
+            result = self._generate(prompt, stream, **kwargs)
+        except BaseException:
+            self._finish()
+            raise
+        if stream:
+            return self._finish_after(result)
+        self._finish()
+        return result
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _finish_after(self, chunks: Iterator[ModelResponse]) -> Iterator[ModelResponse]:
+        try:
+            yield from chunks
+        finally:
+            self._finish()
+
+    def _generate(self, prompt: str, stream: bool = False, **kwargs) -> Any:
+        config = kwargs.get('generation_config') or {}
+        timeout = (kwargs.get('request_options') or {}).get('timeout')
+        text = self._reply(prompt, json_mode=config.get('response_mime_type') == 'application/json')
+        delay = self.latency.sample()
+        with self._lock:
+            if self.spike_rate and self._rng.random() < self.spike_rate:
+                delay += self.spike_seconds
+            failed = self.failure_rate and self._rng.random() < self.failure_rate
+        if failed:
+            raise ModelUnavailableError('Injected fake backend failure')
+        if stream:
+            return self._stream(text, delay, timeout)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f'Fake backend call timed out after {timeout:.2f}s')
+        time.sleep(delay)
+        return ModelResponse(text)
+
+    def _stream(self, text: str, delay: float, timeout: Optional[float] = None,
+                chunk_size: int = 64) -> Iterator[ModelResponse]:
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        waited = 0.0
+        for chunk in chunks:
+            step = delay / len(chunks)
+            if timeout is not None and waited + step > timeout:
+                time.sleep(max(0.0, timeout - waited))
+                raise TimeoutError(f'Fake backend stream timed out after {timeout:.2f}s')
+            time.sleep(step)
+            waited += step
+            yield ModelResponse(chunk)
+
+    def _score_for(self, prompt: str) -> int:
+        if self.score is not None:
+            return self.score
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        return 30 + digest[0] % 70
+
+    def _reply(self, prompt: str, json_mode: bool = False) -> str:
+        if 'against each of the roles below' in prompt:
+            labels = re.findall(r'^\s*Role (R\d+):', prompt, flags=re.MULTILINE)
+            return '\n'.join(FAKE_ROLE_MARKDOWN.format(label=label, score=self._score_for(f'{label}{prompt}'))
+                             for label in labels)
+        if 'As an expert recruiter' in prompt:
+            return self.score_markdown.format(score=self._score_for(prompt), name='there')
+
+        name, params = self._agent_step(prompt)
+        if json_mode:
+            reply = json.dumps({"action": name})
+        elif name == 'final_answer':
+            reply = f"FINAL_ANSWER: {json.dumps(params)}"
+        else:
+            reply = f"FUNCTION_CALL: {name}|{json.dumps(params)}"
+        with self._lock:
+            malformed = self.malformed_rate and self._rng.random() < self.malformed_rate
+        return self._garble(reply) if malformed else reply
+
+    def _agent_step(self, prompt: str):
+        # Repair prompts repeat the agent prompt with the rejected reply appended; answer the original
+        query = prompt.split('Query:', 1)[-1].split('\n\nYour previous reply could not be used:', 1)[0]
+        # Follow-up queries carry the agent state, see AgentState in recruitment_agent
+        state = re.search(r'^State: (\{.*\})$', query, flags=re.MULTILINE)
+        if state is None:
+            return 'calculate_profile_score', {}
+        pending = json.loads(state.group(1)).get('pending') or []
+        return (pending[0], {}) if pending else ('final_answer', {})
+
+    def _garble(self, reply: str) -> str:
+        with self._lock:
+            kind = self._rng.randrange(3)
+        if kind == 0:
+            return f"Sure, here is the next step:\n{reply}"
+        if kind == 1:
+            return reply[:len(reply) // 2]
+        # Python literals instead of JSON
+        return reply.replace('"', "'").replace('true', 'True')
+
+
+_model: Optional[ModelBackend] = None
+_model_lock = threading.Lock()
+
+
+def create_model(backend: str = MODEL_BACKEND) -> ModelBackend:
+    if backend == 'gemini':
+        return GeminiBackend()
+    if backend == 'fake':
+        score = int(FAKE_MODEL_SCORE) if FAKE_MODEL_SCORE else None
+        return FakeBackend(score=score)
+    raise ValueError(f'Unknown MODEL_BACKEND: {backend}')
+
+
+def get_model() -> ModelBackend:
+    """Process-wide model backend selected by MODEL_BACKEND, created on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = create_model()
+                logger.info(f"🤖 Using model backend {_model.name}")
+    return _model
+
+
+def set_model(backend: ModelBackend) -> None:
+    """Swap the process-wide backend (benchmarks, load tests)."""
+    global _model
+    with _model_lock:
+        _model = backend
+
+
+def generate_text(prompt: str, purpose: str, response_schema: Optional[dict] = None) -> str:
+    """One non-streaming call on the active backend, recording latency and sizes.
+
+    ``purpose`` (``agent``, ``score``...) labels the call in /metrics.
+    ``response_schema`` switches the model to JSON output constrained to
+    that schema. Each attempt is bounded by a timeout and the request
+    deadline, and transient failures are retried (see call_with_retries).
+    """
+    kwargs = {}
+    if response_schema is not None:
+        kwargs['generation_config'] = {'response_mime_type': 'application/json', 'response_schema': response_schema}
+
+    def attempt(timeout: float) -> str:
+        # Quota wait counts against the call timeout
+        with quota_slot(prompt, timeout) as slot:
+            response = get_model().generate_content(prompt, request_options={'timeout': slot.timeout}, **kwargs)
+            text = response.text if response else ''
+            slot.record(prompt, response, text)
+        return text
+
+    start = time.perf_counter()
+    try:
+        with span(f"llm.{purpose}"):
+            text = call_with_retries(attempt, purpose)
+    except Exception:
+        record_llm_call(purpose, len(prompt), 0, time.perf_counter() - start, success=False)
+        raise
+    record_llm_call(purpose, len(prompt), len(text or ''), time.perf_counter() - start)
+    return text
@@ -0,0 +1,465 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from recruitment_common import add_owner_column, percentile, process_alive
+from recruitment_models import LatencyDistribution
+from recruitment_ratelimit import TokenBucket
+from recruitment_resilience import backoff_delay
+
+logger = logging.getLogger('RecruitmentNotifications')
+
+# Configuration (overridable through .env)
+NOTIFY_OUTBOX_PATH = os.getenv(
+    'NOTIFY_OUTBOX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_notifications.db')
+)
+# "log" writes notifications to the log, "webhook" POSTs them to NOTIFY_WEBHOOK_URL, "fake" is for tests
+NOTIFY_TRANSPORT = os.getenv('NOTIFY_TRANSPORT', 'log')
+NOTIFY_WEBHOOK_URL = os.getenv('NOTIFY_WEBHOOK_URL', '')
+NOTIFY_CHANNELS = os.getenv('NOTIFY_CHANNELS', 'email,sms')
+# Deliveries per second per channel, e.g. "email:5,sms:0.5"; unlisted channels are not limited
+NOTIFY_RATE_LIMITS = os.getenv('NOTIFY_RATE_LIMITS', 'email:5,sms:1')
+NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS', 2))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', 5))
+NOTIFY_MAX_BACKOFF_SECONDS = float(os.getenv('NOTIFY_MAX_BACKOFF_SECONDS', 300))
+# A candidate is notified at most once per job and channel within this window
+NOTIFY_DEDUP_SECONDS = int(os.getenv('NOTIFY_DEDUP_SECONDS', 30 * 24 * 3600))
+NOTIFY_FAKE_LATENCY = os.getenv('NOTIFY_FAKE_LATENCY', 'fixed:0.05')
+NOTIFY_FAKE_FAILURE_RATE = float(os.getenv('NOTIFY_FAKE_FAILURE_RATE', 0))
+
+# Number of deliveries kept in memory for lag statistics
+_TIMING_WINDOW = 500
+# Workers re-check the outbox at least this often even without a wakeup
+_POLL_SECONDS = 1.0
+_PURGE_INTERVAL_SECONDS = 60.0
+# Due rows inspected per claim when looking for a channel with tokens left
+_CLAIM_SCAN_ROWS = 100
+_WHITESPACE = re.compile(r'\s+')
+
+
+class NotificationTransport:
+    """Delivers one notification; ``send`` returns on success and raises otherwise."""
+
+    name = 'base'
+
+    def send(self, channel: str, notification: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class LogTransport(NotificationTransport):
+    name = 'log'
+
+    def send(self, channel: str, notification: Dict[str, Any]) -> None:
+        logger.info(f"📣 [{channel}] {notification.get('candidate', 'Candidate')} "
+                    f"scored {notification.get('score')} for {notification.get('job_key')}")
+
+
+class WebhookTransport(NotificationTransport):
+    """POSTs ``{"channel": ..., "notification": {...}}`` as JSON; non-2xx responses raise."""
+
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        if not url:
+            raise ValueError('NOTIFY_WEBHOOK_URL is not set')
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, channel: str, notification: Dict[str, Any]) -> None:
+        body = json.dumps({'channel': channel, 'notification': notification}).encode('utf-8')
+        req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+
+class FakeTransport(NotificationTransport):
+    """Local transport for tests and load runs.
+
+    Sleeps a sampled latency per send, fails a seeded ``failure_rate`` share
+    of sends with ConnectionError and records the rest in ``sent``.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency: Any = NOTIFY_FAKE_LATENCY, failure_rate: float = NOTIFY_FAKE_FAILURE_RATE,
+                 seed: int = 0):
+        if isinstance(latency, (int, float)):
+            latency = LatencyDistribution('fixed', (latency,), seed=seed)
+        elif isinstance(latency, str):
+            latency = LatencyDistribution.parse(latency, seed=seed)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.sent: List[tuple] = []
+        self.attempts = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, channel: str, notification: Dict[str, Any]) -> None:
+        time.sleep(self.latency.sample())
+        with self._lock:
+            self.attempts += 1
+            if self._rng.random() < self.failure_rate:
+                raise ConnectionError(f'fake {channel} delivery failed')
+            self.sent.append((channel, notification))
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """``"email:5,sms:0.5"`` -> ``{"email": 5.0, "sms": 0.5}``."""
+    limits = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        channel, _, rate = item.partition(':')
+        limits[channel.strip()] = float(rate)
+    return limits
+
+
+def candidate_key(profile_data: Any) -> str:
+    """Stable identity for a candidate across re-analyses of the same profile.
+
+    Built from name, headline and experience titles/companies so new posts
+    or activity on the page don't count as a different person; profiles
+    without a name fall back to their full text.
+    """
+    if isinstance(profile_data, dict):
+        intro = profile_data.get('intro') or {}
+        name = profile_data.get('name') or intro.get('name') or ''
+        if name and name != 'Candidate':
+            parts = [name, profile_data.get('headline') or intro.get('headline') or '']
+            for item in profile_data.get('experience') or []:
+                if isinstance(item, dict):
+                    parts.extend([item.get('title') or '', item.get('company') or ''])
+            identity = '|'.join(parts)
+        else:
+            identity = str(profile_data.get('content') or json.dumps(profile_data, sort_keys=True, default=str))
+    else:
+        identity = str(profile_data)
+    identity = _WHITESPACE.sub(' ', identity).strip().lower()
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:24]
+
+
+def make_dedup_key(candidate: str, job_key: str, channel: str) -> str:
+    return hashlib.sha256(f'{candidate}|{job_key}|{channel}'.encode('utf-8')).hexdigest()[:32]
+
+
+class NotificationOutbox:
+    """SQLite-backed notification outbox drained by a pool of worker threads.
+
+    ``enqueue`` writes one row per channel and returns immediately; a row
+    whose dedup key (candidate, job, channel) is already queued, being sent
+    or sent is skipped, so re-analysing a candidate never notifies them
+    twice, while a key whose delivery failed is queued again. Workers
+    deliver through ``transport`` while respecting a token bucket per
+    channel, retry failures with jittered exponential backoff and give up
+    after ``max_attempts``. Rows being delivered by a process that has
+    since died are re-queued on startup (sibling WSGI workers keep theirs);
+    token buckets are per process. Delivered rows are kept for
+    ``dedup_seconds`` so their keys keep deduplicating.
+    """
+
+    def __init__(self, db_path: str, transport: NotificationTransport, channels: List[str],
+                 rate_limits: Optional[Dict[str, float]] = None, workers: int = NOTIFY_WORKERS,
+                 max_attempts: int = NOTIFY_MAX_ATTEMPTS, max_backoff_seconds: float = NOTIFY_MAX_BACKOFF_SECONDS,
+                 dedup_seconds: int = NOTIFY_DEDUP_SECONDS):
+        self.db_path = db_path
+        self.transport = transport
+        self.channels = list(channels)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.max_backoff_seconds = max_backoff_seconds
+        self.dedup_seconds = dedup_seconds
+        self._buckets = {channel: TokenBucket(rate) for channel, rate in (rate_limits or {}).items()
+                         if channel in self.channels}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._threads: list[threading.Thread] = []
+        self._in_flight = 0
+        self._delivery_lags = deque(maxlen=_TIMING_WINDOW)
+        self._send_times = deque(maxlen=_TIMING_WINDOW)
+        self._counts = Counter()
+        self._last_error: Optional[str] = None
+        self._last_purge = 0.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS outbox ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' dedup_key TEXT NOT NULL UNIQUE,'
+            ' channel TEXT NOT NULL,'
+            ' payload TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' next_attempt_at REAL NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' sent_at REAL,'
+            ' last_error TEXT)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status_next ON outbox(status, next_attempt_at)')
+        add_owner_column(self._conn, 'outbox')
+        # Rows mid-delivery in a process that died are sent again; delivery is at-least-once
+        orphaned = [(row_id,) for row_id, owner in self._conn.execute(
+            "SELECT id, owner FROM outbox WHERE status = 'sending'") if not process_alive(owner)]
+        self._conn.executemany(
+            "UPDATE outbox SET status = 'queued', owner = NULL WHERE id = ? AND status = 'sending'", orphaned
+        )
+        recovered = len(orphaned)
+        self._conn.commit()
+        if recovered:
+            logger.info(f"📣 Re-queued {recovered} interrupted notification(s)")
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f'notify-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"📣 Started {self.workers} notification worker(s) ({self.transport.name} transport)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def enqueue(self, notification: Dict[str, Any], candidate: str, job_key: str,
+                channels: Optional[List[str]] = None) -> List[str]:
+        """Queue ``notification`` on each channel; returns the channels actually queued."""
+        channels = self.channels if channels is None else channels
+        unknown = [channel for channel in channels if channel not in self.channels]
+        if unknown:
+            raise ValueError(f"Unknown notification channel(s): {', '.join(unknown)}")
+        now = time.time()
+        payload = json.dumps(dict(notification, job_key=job_key))
+        queued = []
+        with self._wakeup:
+            for channel in channels:
+                # Only a failed row is replaced; queued, sending and sent rows keep deduplicating
+                inserted = self._conn.execute(
+                    'INSERT INTO outbox (dedup_key, channel, payload, status, next_attempt_at, created_at)'
+                    " VALUES (?, ?, ?, 'queued', ?, ?)"
+                    " ON CONFLICT(dedup_key) DO UPDATE SET payload = excluded.payload, status = 'queued',"
+                    ' attempts = 0, next_attempt_at = excluded.next_attempt_at, created_at = excluded.created_at,'
+                    " sent_at = NULL, last_error = NULL, owner = NULL WHERE outbox.status = 'failed'",
+                    (make_dedup_key(candidate, job_key, channel), channel, payload, now, now)
+                ).rowcount
+                if inserted:
+                    queued.append(channel)
+                    self._counts['enqueued'] += 1
+                else:
+                    self._counts['deduplicated'] += 1
+            self._conn.commit()
+            if queued:
+                self._wakeup.notify(len(queued))
+        return queued
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is queued or being sent; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = self._conn.execute(
+                    "SELECT COUNT(*) FROM outbox WHERE status IN ('queued', 'sending')"
+                ).fetchone()[0]
+            if not pending:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT channel, status, COUNT(*), MIN(created_at) FROM outbox GROUP BY channel, status'
+            ).fetchall()
+            counts = dict(self._counts)
+            lags = list(self._delivery_lags)
+            send_times = list(self._send_times)
+            in_flight = self._in_flight
+            last_error = self._last_error
+
+        channels = {channel: {'queued': 0, 'sent': 0, 'failed': 0, 'oldest_queued_age_seconds': 0.0}
+                    for channel in self.channels}
+        oldest = None
+        for channel, status, count, created_at in rows:
+            stats = channels.setdefault(channel, {'queued': 0, 'sent': 0, 'failed': 0,
+                                                  'oldest_queued_age_seconds': 0.0})
+            if status in ('queued', 'sending'):
+                stats['queued'] += count
+                age = round(now - created_at, 3)
+                stats['oldest_queued_age_seconds'] = max(stats['oldest_queued_age_seconds'], age)
+                oldest = age if oldest is None else max(oldest, age)
+            else:
+                stats[status] = stats.get(status, 0) + count
+        for channel, bucket in self._buckets.items():
+            channels[channel]['rate_per_second'] = bucket.rate
+
+        return {
+            'transport': self.transport.name,
+            'workers': self.workers,
+            'queue_depth': sum(stats['queued'] for stats in channels.values()),
+            'in_flight': in_flight,
+            'enqueued': counts.get('enqueued', 0),
+            'deduplicated': counts.get('deduplicated', 0),
+            'delivered': counts.get('delivered', 0),
+            'retries': counts.get('retries', 0),
+            'failed': counts.get('failed', 0),
+            'oldest_queued_age_seconds': oldest or 0.0,
+            'delivery_lag_seconds': {'p50': percentile(lags, 50), 'p95': percentile(lags, 95)},
+            'send_seconds': {'p50': percentile(send_times, 50), 'p95': percentile(send_times, 95)},
+            'channels': channels,
+            'last_error': last_error,
+        }
+
+    def _claim(self) -> tuple:
+        """Mark the next due row whose channel has a token as sending; caller holds the lock.
+
+        Returns ``(row, None)`` or ``(None, seconds to wait)``.
+        """
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT id, channel, payload, attempts, created_at FROM outbox"
+            " WHERE status = 'queued' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+            (now, _CLAIM_SCAN_ROWS)
+        ).fetchall()
+        throttled = set()
+        for row in rows:
+            channel = row[1]
+            if channel in throttled:
+                continue
+            bucket = self._buckets.get(channel)
+            if bucket is not None and not bucket.try_acquire():
+                throttled.add(channel)
+                continue
+            # Conditional, so a row claimed by another process in the meantime is skipped
+            claimed = self._conn.execute(
+                "UPDATE outbox SET status = 'sending', attempts = attempts + 1, owner = ?"
+                " WHERE id = ? AND status = 'queued'",
+                (os.getpid(), row[0])
+            ).rowcount
+            self._conn.commit()
+            if not claimed:
+                if bucket is not None:
+                    bucket.refund()
+                continue
+            self._in_flight += 1
+            return row, None
+
+        wait = _POLL_SECONDS
+        for channel in throttled:
+            wait = min(wait, self._buckets[channel].wait_time())
+        next_due = self._conn.execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'queued' AND next_attempt_at > ?", (now,)
+        ).fetchone()[0]
+        if next_due is not None:
+            wait = min(wait, next_due - now)
+        return None, max(wait, 0.001)
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._wakeup:
+                row = None
+                while not self._stopping:
+                    self._maybe_purge()
+                    row, wait = self._claim()
+                    if row is not None:
+                        break
+                    self._wakeup.wait(wait)
+                if self._stopping:
+                    return
+
+            row_id, channel, payload, attempts, created_at = row
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                self.transport.send(channel, json.loads(payload))
+                error = None
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                now = time.time()
+                if error is None:
+                    self._conn.execute("UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL"
+                                       ' WHERE id = ?', (now, row_id))
+                    self._counts['delivered'] += 1
+                    self._delivery_lags.append(now - created_at)
+                elif attempts >= self.max_attempts:
+                    self._conn.execute("UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?",
+                                       (error, row_id))
+                    self._counts['failed'] += 1
+                    self._last_error = error
+                    logger.error(f"❌ {channel} notification {row_id} failed after {attempts} attempt(s): {error}")
+                else:
+                    delay = backoff_delay(attempts, base=1.0, max_delay=self.max_backoff_seconds,
+                                          min_share=0.5)
+                    self._conn.execute("UPDATE outbox SET status = 'queued', next_attempt_at = ?, last_error = ?"
+                                       ' WHERE id = ?', (now + delay, error, row_id))
+                    self._counts['retries'] += 1
+                    self._last_error = error
+                    logger.warning(f"⚠️ {channel} notification {row_id} failed ({error}); retrying in {delay:.1f}s")
+                self._conn.commit()
+                self._in_flight -= 1
+                self._send_times.append(elapsed)
+
+    def _maybe_purge(self) -> None:
+        """Delete finished rows past the dedup window; caller holds the lock."""
+        now = time.time()
+        if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = self._conn.execute(
+            "DELETE FROM outbox WHERE status IN ('sent', 'failed') AND created_at < ?",
+            (now - self.dedup_seconds,)
+        ).rowcount
+        self._conn.commit()
+        if purged:
+            logger.info(f"Purged {purged} notification(s) past the dedup window")
+
+
+def create_transport(kind: str = NOTIFY_TRANSPORT) -> NotificationTransport:
+    if kind == 'log':
+        return LogTransport()
+    if kind == 'webhook':
+        return WebhookTransport(NOTIFY_WEBHOOK_URL)
+    if kind == 'fake':
+        return FakeTransport()
+    raise ValueError(f'Unknown NOTIFY_TRANSPORT: {kind}')
+
+
+_outbox: Optional[NotificationOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """Process-wide outbox for NOTIFY_TRANSPORT, created and started on first use."""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                outbox = NotificationOutbox(
+                    NOTIFY_OUTBOX_PATH, create_transport(),
+                    [channel.strip() for channel in NOTIFY_CHANNELS.split(',') if channel.strip()],
+                    rate_limits=parse_rate_limits(NOTIFY_RATE_LIMITS)
+                )
+                outbox.start()
+                _outbox = outbox
+    return _outbox
+
+
+def peek_notification_outbox() -> Optional[NotificationOutbox]:
+    """The outbox if one was started, without starting it."""
+    return _outbox
@@ -0,0 +1,131 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+from recruitment_skills import (
+    YEARS_COLUMN, extract_skills, extract_years_required, feature_matrix, skill_coverage, years_fit
+)
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger('RecruitmentPrescreen')
+
+# Fields used when a profile dict has no page `content`
+_TEXT_FIELDS = ('headline', 'about', 'experience', 'education', 'skills')
+
+
+def profile_text(profile: Any) -> str:
+    """Plain text of one profile as sent by the extension (dict) or as a string."""
+    if isinstance(profile, str):
+        return profile
+    if isinstance(profile, dict):
+        if isinstance(profile.get('content'), str):
+            return profile['content']
+        parts = []
+        for field in _TEXT_FIELDS:
+            value = profile.get(field)
+            if isinstance(value, list):
+                parts.extend(str(item) for item in value)
+            elif value:
+                parts.append(str(value))
+        return '\n'.join(parts)
+    return ''
+
+
+def make_vectorizer() -> 'TfidfVectorizer':
+    # scikit-learn takes ~0.4s to import, so it is loaded on first use (or by the warmup hook)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words='english', sublinear_tf=True, dtype=np.float32)
+
+
+def _fit_transform(texts: List[str]):
+    """TF-IDF matrix of ``texts``; ValueError if they hold no words outside the stop list."""
+    try:
+        return make_vectorizer().fit_transform(texts)
+    except ValueError as e:
+        # sklearn: "empty vocabulary; perhaps the documents only contain stop words"
+        raise ValueError('profiles and job description contain no searchable words') from e
+
+
+def similarity_scores(texts: List[str], job_description: str) -> np.ndarray:
+    """Cosine similarity of every text to the job description in one sparse pass.
+
+    The vocabulary is fitted on the candidate set plus the job description
+    so IDF weights reflect what is distinctive within this pool.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    matrix = _fit_transform(texts + [job_description])
+    return cosine_similarity(matrix[:-1], matrix[-1]).ravel()
+
+
+def similarity_matrix(texts: List[str], job_texts: List[str]) -> np.ndarray:
+    """(len(texts), len(job_texts)) cosine similarities from one TF-IDF fit over both sets."""
+    from sklearn.metrics.pairwise import cosine_similarity
+    if not texts or not job_texts:
+        return np.zeros((len(texts), len(job_texts)), dtype=np.float32)
+    matrix = _fit_transform(texts + job_texts)
+    return cosine_similarity(matrix[:len(texts)], matrix[len(texts):])
+
+
+def rank_by_similarity(similarities: np.ndarray, top_k: Optional[int] = None,
+                       threshold: Optional[float] = None) -> List[int]:
+    """Indices that pass the cutoffs, best match first.
+
+    ``top_k`` keeps at most that many candidates; ``threshold`` drops anything
+    below that similarity. With neither set every index is returned, ranked.
+    """
+    candidates = np.arange(len(similarities))
+    if threshold is not None:
+        candidates = candidates[similarities >= threshold]
+    if top_k is not None and top_k < len(candidates):
+        # argpartition keeps this O(n) before sorting only the shortlist
+        best = np.argpartition(-similarities[candidates], top_k - 1)[:top_k]
+        candidates = candidates[best]
+    order = np.argsort(-similarities[candidates], kind='stable')
+    return candidates[order].tolist()
+
+
+def prescreen_candidates(profiles: List[Any], job_description: str, top_k: Optional[int] = None,
+                         threshold: Optional[float] = None, job_entry: Any = None) -> Dict[str, Any]:
+    """Rank profiles against a job description without calling the LLM.
+
+    Returns the shortlist (ranked, with similarities) plus the similarity of
+    every input profile, so callers can report why a profile was skipped.
+    Shortlisted profiles also get deterministic signals from the skill
+    taxonomy: the share of the JD's skills they mention and their years of
+    experience. ``job_entry`` is a registered JobDescriptionEntry whose
+    skills and years are reused.
+    """
+    start = time.perf_counter()
+    texts = [profile_text(profile) for profile in profiles]
+    similarities = similarity_scores(texts, job_description)
+    shortlist = rank_by_similarity(similarities, top_k=top_k, threshold=threshold)
+    if job_entry is not None:
+        required_skills, years_required = job_entry.required_skills, job_entry.years_required
+    else:
+        required_skills, years_required = extract_skills(job_description), extract_years_required(job_description)
+    features = feature_matrix([texts[index] for index in shortlist])
+    coverage = skill_coverage(features, required_skills)
+    experience = years_fit(features, years_required)
+    elapsed = time.perf_counter() - start
+    logger.info(f"🔎 Pre-screened {len(profiles)} profiles in {elapsed:.3f}s, shortlisted {len(shortlist)}")
+    return {
+        'shortlist': [
+            {
+                'index': index,
+                'rank': rank + 1,
+                'similarity': round(float(similarities[index]), 4),
+                'skill_coverage': round(float(coverage[rank]), 4),
+                'years_experience': round(float(features[rank, YEARS_COLUMN]), 1),
+                'years_fit': round(float(experience[rank]), 4),
+            }
+            for rank, index in enumerate(shortlist)
+        ],
+        'similarities': [round(float(value), 4) for value in similarities],
+        'elapsed_seconds': round(elapsed, 4),
+    }
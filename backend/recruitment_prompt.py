@@ -0,0 +1,269 @@
+import math
+import os
+import re
+import threading
+from collections import Counter, deque
+from typing import Any, Dict, List, Tuple
+
+from recruitment_cleaning import clean_text
+from recruitment_common import percentile
+
+# Configuration (overridable through .env)
+# Profile text budget for the agent query and the pipeline (was a 5000 character cut)
+PROFILE_TOKEN_BUDGET = int(os.getenv('PROFILE_TOKEN_BUDGET', 1250))
+# Profile text budget inside the scoring prompt (was a 2000 character cut)
+SCORE_TOKEN_BUDGET = int(os.getenv('SCORE_TOKEN_BUDGET', 500))
+# Rough characters per token for Gemini on English prose; used instead of a tokenizer
+CHARS_PER_TOKEN = float(os.getenv('PROMPT_CHARS_PER_TOKEN', 4))
+
+# LinkedIn navigation, upsell and engagement chrome, matched against whole lines
+_BOILERPLATE_PATTERN = re.compile(
+    r'(?:'
+    r'\d+ notifications? total|\d+ new (?:network updates )?notifications?|n?ew feed updates notifications'
+    r'|skip to (?:search|main content)|keyboard shortcuts|close jump menu'
+    r'|home|my network|jobs|messaging|notifications|me|for business|try premium.*|reactivate premium'
+    r'|open to|add profile section|enhance profile|resources|get started|suggested for you|private to you'
+    r'|analytics|show all(?: \d+)?(?: \w+)*|show (?:more|less)|…?see (?:more|less)|…more|contact info'
+    r'|message|follow|following|connect|more|create a post|posts|comments|activity|past \d+ days'
+    r'|confirm current position|loaded \d+ posts? posts|•? ?you|like|comment|repost|send'
+    r'|[\d,.]+k? (?:followers|connections?|profile views|post impressions|search appearances|reactions?|comments?|reposts?)'
+    r'|\d+\+? connections|\d+[smhdwy](?:o)?(?: • .*)?|\d+ (?:seconds?|minutes?|hours?|days?|weeks?|months?|years?) ago'
+    r'|discover who.s viewed your profile\.|check out who.s engaging with your posts\.'
+    r'|see how often you appear in search results\.'
+    r'|keeping your profile up-to-date helps you attract the right opportunities\.'
+    r'|tell internal hirers you.re interested in jobs at your current company'
+    r'|share that you.re hiring and attract qualified candidates\.'
+    r'|showcase your services as a section on your profile.*'
+    r'|are you still working at .*\?|status is (?:online|offline|reachable)'
+    r'|people (?:also viewed|you may know)|you might like|explore premium profiles|pages for you'
+    r'|about accessibility talent solutions.*|linkedin corporation © \d+|visit our help center\.?'
+    r'|\d+|[•·|]'
+    r')',
+    re.IGNORECASE
+)
+# Lines with at least this many words are dropped when most of their
+# word trigrams already appeared (repeated About blocks, re-joined paragraphs)
+_SHINGLE_MIN_WORDS = 8
+_SHINGLE_OVERLAP = 0.8
+# Remaining budget below which lower-priority sections are skipped
+_MIN_SECTION_CHARS = 40
+# Number of recent prompts kept for size percentiles
+_SIZE_WINDOW = 500
+
+_stats_lock = threading.Lock()
+# Per prompt kind ('profile' for the agent/pipeline text, 'score' for the scoring prompt)
+_stats: Dict[str, Counter] = {}
+_recent_tokens: Dict[str, deque] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def budget_chars(token_budget: int) -> int:
+    return int(token_budget * CHARS_PER_TOKEN)
+
+
+def is_boilerplate(line: str) -> bool:
+    return _BOILERPLATE_PATTERN.fullmatch(line.strip()) is not None
+
+
+class _LineFilter:
+    """Drops boilerplate and lines whose content was already emitted."""
+
+    def __init__(self):
+        self.seen_lines = set()
+        self.seen_shingles = set()
+        self.boilerplate = 0
+        self.duplicates = 0
+
+    def keep(self, line: str) -> bool:
+        if is_boilerplate(line):
+            self.boilerplate += 1
+            return False
+        key = ' '.join(line.lower().split())
+        if key in self.seen_lines:
+            self.duplicates += 1
+            return False
+        words = key.split()
+        shingles = _shingles(words)
+        if len(words) >= _SHINGLE_MIN_WORDS and shingles:
+            overlap = sum(1 for shingle in shingles if shingle in self.seen_shingles) / len(shingles)
+            if overlap >= _SHINGLE_OVERLAP:
+                self.duplicates += 1
+                return False
+        self.seen_lines.add(key)
+        self.seen_shingles.update(shingles)
+        return True
+
+    def filter(self, text: str) -> List[str]:
+        return [line.strip() for line in text.splitlines() if line.strip() and self.keep(line)]
+
+
+def _shingles(words: List[str]) -> set:
+    return {hash(tuple(words[i:i + 3])) for i in range(len(words) - 2)}
+
+
+def _clip(text: str, max_chars: int) -> Tuple[str, bool]:
+    """Cut at a line or word boundary so the text fits max_chars."""
+    if len(text) <= max_chars:
+        return text, False
+    cut = text[:max_chars]
+    boundary = max(cut.rfind('\n'), cut.rfind(' '))
+    if boundary > max_chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip(), True
+
+
+def clip_text(text: str, max_chars: int) -> str:
+    """``text`` cut to max_chars at a line or word boundary, marked with an ellipsis when cut."""
+    clipped, truncated = _clip(text, max_chars)
+    return f"{clipped}…" if truncated else clipped
+
+
+def digest_text(text: str, max_chars: int) -> str:
+    """``text`` on one line, clipped to max_chars at a word boundary."""
+    return clip_text(' '.join((text or '').split()), max_chars)
+
+
+def _format_experience(items: List[Any]) -> List[str]:
+    lines = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        title, company = item.get('title', ''), item.get('company', '')
+        head = ' at '.join(part for part in (title, company) if part)
+        details = ', '.join(part for part in (item.get('duration'), item.get('location')) if part)
+        line = f"- {head} ({details})" if details else f"- {head}"
+        if item.get('description'):
+            line += f": {' '.join(item['description'].split())}"
+        if head or item.get('description'):
+            lines.append(line)
+    return lines
+
+
+def _format_education(items: List[Any]) -> List[str]:
+    lines = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        parts = [item.get(key) for key in ('degree', 'school', 'duration') if item.get(key)]
+        if parts:
+            lines.append(f"- {', '.join(parts)}")
+    return lines
+
+
+def _profile_sections(profile: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(label, text) pairs in priority order: headline, about, experience, skills, education."""
+    sections = []
+    if isinstance(profile.get('name'), str) and profile['name'].strip():
+        sections.append(('Name', profile['name'].strip()))
+    if isinstance(profile.get('headline'), str) and profile['headline'].strip():
+        sections.append(('Headline', ' '.join(profile['headline'].split())))
+    if isinstance(profile.get('about'), str) and profile['about'].strip():
+        sections.append(('About', clean_text(profile['about'])))
+    if isinstance(profile.get('experience'), list):
+        experience = _format_experience(profile['experience'])
+        if experience:
+            sections.append(('Experience', '\n'.join(experience)))
+    if isinstance(profile.get('skills'), list):
+        skills = [str(skill).strip() for skill in profile['skills'] if str(skill).strip()]
+        if skills:
+            sections.append(('Skills', ', '.join(dict.fromkeys(skills))))
+    if isinstance(profile.get('education'), list):
+        education = _format_education(profile['education'])
+        if education:
+            sections.append(('Education', '\n'.join(education)))
+    return sections
+
+
+def build_profile_prompt(profile: Any, token_budget: int = PROFILE_TOKEN_BUDGET,
+                         kind: str = 'profile') -> Tuple[str, Dict[str, Any]]:
+    """Profile text for the LLM, highest-signal sections first, fitted to ``token_budget``.
+
+    Structured fields (headline, about, experience, skills, education) are
+    emitted first; the page text follows with LinkedIn chrome and already
+    covered lines removed. Returns ``(text, stats)``.
+    """
+    if isinstance(profile, str):
+        profile = {'content': profile}
+    elif not isinstance(profile, dict):
+        profile = {'content': str(profile or '')}
+
+    line_filter = _LineFilter()
+    remaining = budget_chars(token_budget)
+    blocks = []
+    truncated = False
+    input_chars = 0
+
+    for label, text in _profile_sections(profile):
+        input_chars += len(text)
+        lines = line_filter.filter(text)
+        if not lines or remaining < _MIN_SECTION_CHARS:
+            truncated = truncated or bool(lines)
+            continue
+        separator = ' ' if len(lines) == 1 and label not in ('Experience', 'Education') else '\n'
+        block, clipped = _clip(f"{label}:{separator}" + '\n'.join(lines), remaining)
+        truncated = truncated or clipped
+        blocks.append(block)
+        remaining -= len(block) + 1
+
+    content = profile.get('content')
+    if isinstance(content, str) and content.strip():
+        content = clean_text(content)
+        input_chars += len(content)
+        lines = line_filter.filter(content)
+        if lines and remaining >= _MIN_SECTION_CHARS:
+            header = 'Profile page:\n' if blocks else ''
+            block, clipped = _clip(header + '\n'.join(lines), remaining)
+            truncated = truncated or clipped
+            blocks.append(block)
+        elif lines:
+            truncated = True
+
+    text = '\n'.join(blocks)
+    stats = {
+        'input_chars': input_chars,
+        'output_chars': len(text),
+        'estimated_tokens': estimate_tokens(text),
+        'token_budget': token_budget,
+        'boilerplate_lines': line_filter.boilerplate,
+        'duplicate_lines': line_filter.duplicates,
+        'truncated': truncated,
+    }
+    _record(kind, stats)
+    return text, stats
+
+
+def fit_text(text: str, token_budget: int) -> Tuple[str, Dict[str, Any]]:
+    """Plain-text variant of build_profile_prompt for content that is already assembled."""
+    return build_profile_prompt({'content': text}, token_budget, kind='score')
+
+
+def _record(kind: str, stats: Dict[str, Any]) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(kind, Counter())
+        counters['prompts_built'] += 1
+        counters['input_chars'] += stats['input_chars']
+        counters['output_chars'] += stats['output_chars']
+        counters['estimated_tokens'] += stats['estimated_tokens']
+        counters['boilerplate_lines'] += stats['boilerplate_lines']
+        counters['duplicate_lines'] += stats['duplicate_lines']
+        counters['truncated_prompts'] += int(stats['truncated'])
+        _recent_tokens.setdefault(kind, deque(maxlen=_SIZE_WINDOW)).append(stats['estimated_tokens'])
+
+
+def get_prompt_stats() -> Dict[str, Any]:
+    """Prompt size counters per kind, with the share of input removed and recent token percentiles."""
+    with _stats_lock:
+        snapshot = {kind: (dict(counters), list(_recent_tokens.get(kind, ()))) for kind, counters in _stats.items()}
+    result: Dict[str, Any] = {'budgets': {'profile_tokens': PROFILE_TOKEN_BUDGET, 'score_tokens': SCORE_TOKEN_BUDGET}}
+    for kind, (stats, recent) in snapshot.items():
+        built = stats['prompts_built']
+        input_chars = stats['input_chars']
+        stats['avg_estimated_tokens'] = round(stats['estimated_tokens'] / built, 1) if built else 0.0
+        stats['reduction_ratio'] = round(1 - stats['output_chars'] / input_chars, 3) if input_chars else 0.0
+        stats['recent_tokens'] = {'p50': percentile(recent, 50), 'p95': percentile(recent, 95),
+                                  'max': max(recent, default=0)}
+        result[kind] = stats
+    return result
@@ -0,0 +1,294 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from recruitment_metrics import span
+from recruitment_prompt import estimate_tokens
+from recruitment_ratelimit import TokenBucket
+from recruitment_resilience import RequestDeadlineExceeded, remaining
+
+logger = logging.getLogger('RecruitmentQuota')
+
+T = TypeVar('T')
+
+# Configuration (overridable through .env)
+# Set these a little under the project's Gemini quota (defaults: gemini-2.0-flash, paid tier 1)
+LLM_QUOTA_ENABLED = os.getenv('LLM_QUOTA_ENABLED', 'true').lower() == 'true'
+LLM_QUOTA_RPM = float(os.getenv('LLM_QUOTA_RPM', 2000))
+LLM_QUOTA_TPM = float(os.getenv('LLM_QUOTA_TPM', 4000000))
+# Burst allowance of both buckets, in seconds of quota
+LLM_QUOTA_BURST_SECONDS = float(os.getenv('LLM_QUOTA_BURST_SECONDS', 6))
+# Tokens reserved for the response until the real count is known
+LLM_QUOTA_RESPONSE_TOKENS = int(os.getenv('LLM_QUOTA_RESPONSE_TOKENS', 1024))
+# Concurrent model calls: starts at the maximum, halves on a 429 and grows back by ~1 per round of calls
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 32))
+LLM_MIN_CONCURRENCY = int(os.getenv('LLM_MIN_CONCURRENCY', 1))
+# Concurrent identical calculate_profile_score calls share one model call
+LLM_SINGLE_FLIGHT_ENABLED = os.getenv('LLM_SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+# Longest a call waits for quota when no request deadline bounds it
+LLM_QUOTA_MAX_WAIT_SECONDS = float(os.getenv('LLM_QUOTA_MAX_WAIT_SECONDS', 60))
+
+
+class QuotaWaitTimeout(TimeoutError):
+    """A model call could not get quota within its timeout."""
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Local quota timeouts and 429 responses (google-api-core's ``code``)."""
+    return isinstance(error, QuotaWaitTimeout) or getattr(error, 'code', None) == 429
+
+
+class QuotaSlot:
+    """Admission for one model call; ``timeout`` is what remains of the call's timeout after queueing."""
+
+    def __init__(self, timeout: Optional[float], waited: float = 0.0, reserved_tokens: int = 0):
+        self.timeout = timeout
+        self.admitted_at = time.monotonic()
+        self.waited = waited
+        self.reserved_tokens = reserved_tokens
+        self.used_tokens: Optional[int] = None
+
+    def record(self, prompt: str, response: Any = None, text: str = '') -> None:
+        """Actual token use: the response's usage metadata when present, else an estimate."""
+        usage = getattr(response, 'usage_metadata', None)
+        total = getattr(usage, 'total_token_count', None)
+        self.used_tokens = int(total) if total else estimate_tokens(prompt) + estimate_tokens(text or '')
+
+
+class QuotaGovernor:
+    """Process-wide admission control for model calls.
+
+    A call first takes a concurrency slot (first come, first served), then one request from the RPM
+    bucket and its estimated tokens from the TPM bucket, waiting at most
+    its timeout overall. The concurrency limit is adaptive (AIMD): each
+    success adds ``1/limit``, a 429 halves it, between LLM_MIN_CONCURRENCY
+    and LLM_MAX_CONCURRENCY. Like TCP's once per round trip, only calls
+    admitted after the last decrease can halve it again, so one burst of
+    429s counts once. Reserved tokens the response did not use are refunded.
+    """
+
+    def __init__(self, rpm: float = LLM_QUOTA_RPM, tpm: float = LLM_QUOTA_TPM,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, min_concurrency: int = LLM_MIN_CONCURRENCY,
+                 burst_seconds: float = LLM_QUOTA_BURST_SECONDS):
+        self.requests = TokenBucket(rpm / 60, capacity=max(1.0, rpm / 60 * burst_seconds))
+        self.tokens = TokenBucket(tpm / 60, capacity=max(1.0, tpm / 60 * burst_seconds))
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        # Waiting calls in arrival order; only the head may take a freed slot
+        self._waiters: deque = deque()
+        self._cond = threading.Condition()
+        self._stats = {'admitted': 0, 'queued': 0, 'wait_timeouts': 0, 'throttled': 0, 'decreases': 0,
+                       'wait_seconds': 0.0, 'max_wait_seconds': 0.0, 'refunded_tokens': 0}
+
+    def _take_concurrency(self, ends_at: float) -> bool:
+        ticket = object()
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while self._waiters[0] is not ticket or self.in_flight >= int(self.limit):
+                    left = ends_at - time.monotonic()
+                    if left <= 0:
+                        return False
+                    self._cond.wait(left)
+                self.in_flight += 1
+                return True
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def _release_concurrency(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def admit(self, prompt: str, timeout: Optional[float]) -> QuotaSlot:
+        """Wait for a slot and quota for one call of ``prompt``; raises QuotaWaitTimeout."""
+        wait_limit = LLM_QUOTA_MAX_WAIT_SECONDS if timeout is None else timeout
+        start = time.monotonic()
+        ends_at = start + wait_limit
+        reserved = min(estimate_tokens(prompt) + LLM_QUOTA_RESPONSE_TOKENS, int(self.tokens.capacity))
+
+        admitted = self._take_concurrency(ends_at)
+        if admitted:
+            admitted = self.requests.acquire(1, timeout=max(0.0, ends_at - time.monotonic()))
+            if admitted:
+                admitted = self.tokens.acquire(reserved, timeout=max(0.0, ends_at - time.monotonic()))
+                if not admitted:
+                    self.requests.refund(1)
+            if not admitted:
+                self._release_concurrency()
+
+        waited = time.monotonic() - start
+        with self._cond:
+            if waited > 0.001:
+                self._stats['queued'] += 1
+            self._stats['wait_seconds'] += waited
+            self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+            self._stats['admitted' if admitted else 'wait_timeouts'] += 1
+        if not admitted:
+            raise QuotaWaitTimeout(f"No model quota within {wait_limit:.1f}s")
+        return QuotaSlot(None if timeout is None else max(0.0, timeout - waited), waited, reserved)
+
+    def release(self, slot: QuotaSlot, error: Optional[BaseException] = None) -> None:
+        """Finish ``slot``: refund unused tokens and adapt the concurrency limit."""
+        if slot.used_tokens is not None and slot.used_tokens < slot.reserved_tokens:
+            self.tokens.refund(slot.reserved_tokens - slot.used_tokens)
+            with self._cond:
+                self._stats['refunded_tokens'] += slot.reserved_tokens - slot.used_tokens
+        with self._cond:
+            self.in_flight -= 1
+            if error is not None and is_rate_limited(error):
+                self._stats['throttled'] += 1
+                if slot.admitted_at > self._last_decrease and self.limit > self.min_concurrency:
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self._last_decrease = time.monotonic()
+                    self._stats['decreases'] += 1
+                    logger.warning(f"⚠️ Model rate limited, concurrency limit down to {int(self.limit)}")
+            elif error is None:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, prompt: str, timeout: Optional[float]) -> Iterator[QuotaSlot]:
+        with span("llm.quota_wait"):
+            slot = self.admit(prompt, timeout)
+        try:
+            yield slot
+        except BaseException as e:
+            self.release(slot, e)
+            raise
+        self.release(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['concurrency_limit'] = int(self.limit)
+            stats['in_flight'] = self.in_flight
+        total = stats['admitted'] + stats['wait_timeouts']
+        stats['avg_wait_seconds'] = round(stats['wait_seconds'] / total, 4) if total else 0.0
+        stats['wait_seconds'] = round(stats['wait_seconds'], 4)
+        stats['max_wait_seconds'] = round(stats['max_wait_seconds'], 4)
+        stats['requests_available'] = round(self.requests.available(), 2)
+        stats['tokens_available'] = round(self.tokens.available())
+        return stats
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution.
+
+    The first caller (the leader) runs the function; callers arriving
+    while it is in flight wait for its result or exception instead of
+    running their own. Nothing is kept once the leader finishes.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key: str, func: Callable[[], T]) -> Tuple[T, bool]:
+        """``(result, shared)``; ``shared`` is True when another caller's execution was reused.
+
+        Followers wait within their own request deadline. If the leader ran
+        out of its deadline, a follower with time left runs the call itself.
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                self._stats['leaders' if leader else 'coalesced'] += 1
+
+            if leader:
+                try:
+                    flight.result = func()
+                    return flight.result, False
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+
+            with span("single_flight.wait"):
+                finished = flight.done.wait(remaining())
+            if not finished:
+                raise RequestDeadlineExceeded("Request deadline exceeded waiting for an identical in-flight call")
+            if isinstance(flight.error, RequestDeadlineExceeded):
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._flights))
+
+
+_governor: Optional[QuotaGovernor] = None
+_governor_lock = threading.Lock()
+_score_flights = SingleFlight()
+
+
+def get_quota_governor() -> Optional[QuotaGovernor]:
+    """Process-wide governor, or None when LLM_QUOTA_ENABLED is false."""
+    global _governor
+    if not LLM_QUOTA_ENABLED:
+        return None
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = QuotaGovernor()
+                logger.info(f"🚦 Model quota: {LLM_QUOTA_RPM:g} RPM, {LLM_QUOTA_TPM:g} TPM, "
+                            f"up to {LLM_MAX_CONCURRENCY} concurrent calls")
+    return _governor
+
+
+def peek_quota_governor() -> Optional[QuotaGovernor]:
+    """The governor if a model call has created it, without creating it."""
+    return _governor
+
+
+def get_score_flights() -> Optional[SingleFlight]:
+    """Coalesces concurrent identical calculate_profile_score calls (keyed by the result cache key).
+
+    None when LLM_SINGLE_FLIGHT_ENABLED is false.
+    """
+    return _score_flights if LLM_SINGLE_FLIGHT_ENABLED else None
+
+
+@contextmanager
+def quota_slot(prompt: str, timeout: Optional[float]) -> Iterator[QuotaSlot]:
+    """Governed admission for one model call; a pass-through slot when quota is disabled."""
+    governor = get_quota_governor()
+    if governor is None:
+        yield QuotaSlot(timeout)
+        return
+    with governor.slot(prompt, timeout) as slot:
+        yield slot
+
+
+def get_quota_stats() -> Dict[str, Any]:
+    """Governor and single-flight counters, for /quota/stats and /metrics."""
+    governor = peek_quota_governor()
+    return {
+        'enabled': LLM_QUOTA_ENABLED,
+        'governor': governor.stats() if governor is not None else {},
+        'single_flight': _score_flights.stats(),
+    }
@@ -0,0 +1,175 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from recruitment_prompt import clip_text
+from recruitment_skills import extract_skills, extract_years_required
+
+logger = logging.getLogger('RecruitmentRegistry')
+
+# Configuration (overridable through .env)
+JD_REGISTRY_PATH = os.getenv(
+    'JD_REGISTRY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_registry.db')
+)
+# Upper bound on the job description text of each role in a multi-role matching prompt
+JD_PROMPT_MAX_CHARS = int(os.getenv('JD_PROMPT_MAX_CHARS', 2000))
+
+_JOB_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+def normalize_job_description(text: str) -> str:
+    """Strip each line, collapse inner whitespace and drop blank/duplicate lines."""
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if line and line.lower() not in seen:
+            seen.add(line.lower())
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def job_key_for(text: str) -> str:
+    """ID a JD gets when registered without one; also keys unregistered JDs."""
+    digest = hashlib.sha256(normalize_job_description(text).lower().encode('utf-8')).hexdigest()
+    return f'jd_{digest[:12]}'
+
+
+def build_prompt_fragment(normalized_text: str, skills: List[str], years: int) -> str:
+    """Compact job requirements block used for each role of a multi-role matching prompt.
+
+    Single-profile analyses send the JD text itself, so a JD gives the same
+    prompt and cache key whether it comes as ``job_id`` or as text.
+    """
+    header = []
+    if skills:
+        header.append(f"Required skills: {', '.join(skills)}")
+    if years:
+        header.append(f"Minimum experience: {years}+ years")
+    body = clip_text(normalized_text, JD_PROMPT_MAX_CHARS)
+    return '\n'.join(header + [body]) if header else body
+
+
+@dataclass
+class JobDescriptionEntry:
+    """A registered job description and everything precomputed from it."""
+    job_id: str
+    title: str
+    text: str
+    normalized_text: str
+    required_skills: List[str]
+    years_required: int
+    prompt_fragment: str
+    created_at: float
+
+    def to_dict(self, include_text: bool = False) -> Dict[str, Any]:
+        data = {
+            'job_id': self.job_id,
+            'title': self.title,
+            'required_skills': self.required_skills,
+            'years_required': self.years_required,
+            'prompt_fragment': self.prompt_fragment,
+            'created_at': self.created_at,
+        }
+        if include_text:
+            data['text'] = self.text
+        return data
+
+
+def build_entry(job_id: str, title: str, text: str, created_at: float) -> JobDescriptionEntry:
+    normalized = normalize_job_description(text)
+    skills = extract_skills(normalized)
+    years = extract_years_required(normalized)
+    return JobDescriptionEntry(
+        job_id=job_id,
+        title=title,
+        text=text,
+        normalized_text=normalized,
+        required_skills=skills,
+        years_required=years,
+        prompt_fragment=build_prompt_fragment(normalized, skills, years),
+        created_at=created_at,
+    )
+
+
+class JobDescriptionRegistry:
+    """Job descriptions stored under stable IDs, with derived data held in memory.
+
+    Only the source text is persisted; normalization, skills, years and the
+    prompt fragment are rebuilt once per JD on load. TF-IDF is not cached:
+    similarities are fitted on each candidate pool together with the JD, so
+    IDF weights and thresholds mean the same as for a JD sent as text.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, JobDescriptionEntry] = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS job_descriptions ('
+            ' job_id TEXT PRIMARY KEY,'
+            ' title TEXT NOT NULL,'
+            ' text TEXT NOT NULL,'
+            ' created_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+        for job_id, title, text, created_at in self._conn.execute(
+                'SELECT job_id, title, text, created_at FROM job_descriptions'):
+            self._entries[job_id] = build_entry(job_id, title, text, created_at)
+        logger.info(f"Loaded {len(self._entries)} job description(s) from {db_path}")
+
+    def register(self, text: str, title: str = '', job_id: Optional[str] = None) -> JobDescriptionEntry:
+        """Store a JD; without an explicit ID the ID is derived from its normalized text."""
+        if not text or not text.strip():
+            raise ValueError('Job description text is empty')
+        if job_id is None:
+            job_id = job_key_for(text)
+        elif not _JOB_ID_PATTERN.match(job_id):
+            raise ValueError('job_id may only contain letters, digits, "_", "." and "-"')
+
+        entry = build_entry(job_id, title, text, time.time())
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO job_descriptions (job_id, title, text, created_at) VALUES (?, ?, ?, ?)',
+                (entry.job_id, entry.title, entry.text, entry.created_at)
+            )
+            self._conn.commit()
+            self._entries[job_id] = entry
+        logger.info(f"📌 Registered job description {job_id} ({len(entry.required_skills)} skills)")
+        return entry
+
+    def get(self, job_id: str) -> Optional[JobDescriptionEntry]:
+        return self._entries.get(job_id)
+
+    def list(self) -> List[JobDescriptionEntry]:
+        return sorted(self._entries.values(), key=lambda entry: entry.created_at)
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            if self._entries.pop(job_id, None) is None:
+                return False
+            self._conn.execute('DELETE FROM job_descriptions WHERE job_id = ?', (job_id,))
+            self._conn.commit()
+        return True
+
+
+_registry: Optional[JobDescriptionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> JobDescriptionRegistry:
+    """Process-wide registry, loaded on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = JobDescriptionRegistry(JD_REGISTRY_PATH)
+    return _registry
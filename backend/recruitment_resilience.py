@@ -0,0 +1,256 @@
+import contextvars
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from recruitment_metrics import record_deadline_exceeded, record_llm_hedge, record_llm_retry
+
+logger = logging.getLogger('RecruitmentResilience')
+
+T = TypeVar('T')
+
+# Configuration (overridable through .env)
+# Time budget of one analysis (one /analyze request, batch item or queued job), all model calls included
+REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', 120))
+# Timeout of a single model call; each attempt also gets at most what is left of the deadline
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv('LLM_CALL_TIMEOUT_SECONDS', 30))
+LLM_MAX_ATTEMPTS = int(os.getenv('LLM_MAX_ATTEMPTS', 3))
+# Backoff before retry n is uniform in [0, min(MAX, BASE * 2**n)] ("full jitter")
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', 0.5))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', 8))
+# Hedging: when a call outlives the LLM_HEDGE_QUANTILE latency of recent calls, send a second one
+LLM_HEDGE_ENABLED = os.getenv('LLM_HEDGE_ENABLED', 'false').lower() == 'true'
+LLM_HEDGE_QUANTILE = float(os.getenv('LLM_HEDGE_QUANTILE', 0.95))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20))
+LLM_HEDGE_MAX_WORKERS = int(os.getenv('LLM_HEDGE_MAX_WORKERS', 32))
+
+# HTTP statuses worth another attempt: timeouts, rate limiting and server-side failures
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class RequestDeadlineExceeded(TimeoutError):
+    """The analysis ran out of its REQUEST_DEADLINE_SECONDS budget."""
+
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar('recruitment_deadline', default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float] = None) -> Iterator[float]:
+    """Bound everything run inside to ``seconds`` (REQUEST_DEADLINE_SECONDS); nested deadlines only ever shrink.
+
+    Yields the absolute deadline on the time.monotonic() clock. Like the
+    analysis trace this is a context variable, so threads started inside
+    (batch workers, hedged calls) open their own or receive explicit timeouts.
+    """
+    outer = _deadline.get()
+    deadline = time.monotonic() + (REQUEST_DEADLINE_SECONDS if seconds is None else seconds)
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left of the current deadline, None outside of one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(where: str) -> None:
+    """Raise RequestDeadlineExceeded if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        record_deadline_exceeded(where)
+        raise RequestDeadlineExceeded(f"Request deadline exceeded before {where}")
+
+
+def attempt_timeout(where: str) -> float:
+    """Timeout for the next model call: LLM_CALL_TIMEOUT_SECONDS, capped by the deadline."""
+    check_deadline(where)
+    left = remaining()
+    return LLM_CALL_TIMEOUT_SECONDS if left is None else min(LLM_CALL_TIMEOUT_SECONDS, left)
+
+
+def error_reason(error: BaseException) -> str:
+    """Short metrics label for a failed model call."""
+    if isinstance(error, TimeoutError):
+        return 'timeout'
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return f'status_{code}'
+    return type(error).__name__
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection errors and RETRYABLE_STATUS responses; never an exhausted deadline.
+
+    google-api-core exceptions carry the HTTP status as ``code``.
+    """
+    if isinstance(error, RequestDeadlineExceeded):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return getattr(error, 'code', None) in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int, rng: Any = random, base: float = LLM_BACKOFF_BASE_SECONDS,
+                  max_delay: float = LLM_BACKOFF_MAX_SECONDS, min_share: float = 0.0) -> float:
+    """Jittered exponential backoff before retry number ``attempt`` (0-based).
+
+    The delay is drawn between ``min_share`` and all of the exponential
+    step: full jitter by default, as for LLM retries. The sheet writer and
+    the notification outbox pass their own ``base`` and ``max_delay`` and
+    keep half the step as a floor, so a failing sink or webhook is never
+    retried immediately.
+    """
+    return min(max_delay, base * 2 ** min(attempt, 16)) * rng.uniform(min_share, 1.0)
+
+
+def next_retry_delay(error: BaseException, attempt: int, purpose: str) -> Optional[float]:
+    """Backoff before retrying a failed ``attempt``, or None if the error should be raised.
+
+    Raises RequestDeadlineExceeded (chained to ``error``) when the failure
+    used up the deadline, so callers report the deadline and not the
+    per-call timeout that happened to hit it.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        record_deadline_exceeded(f"llm.{purpose}")
+        raise RequestDeadlineExceeded(f"Request deadline exceeded during {purpose} call") from error
+    if not is_retryable(error) or attempt + 1 >= LLM_MAX_ATTEMPTS:
+        return None
+    delay = backoff_delay(attempt)
+    if left is not None and delay >= left:
+        return None
+    record_llm_retry(purpose, error_reason(error))
+    logger.warning(f"⚠️ {purpose} call failed ({error_reason(error)}), retry {attempt + 1} in {delay:.2f}s")
+    return delay
+
+
+class LatencyTracker:
+    """Recent successful call latencies per purpose, for the hedge delay."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, purpose: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(purpose)
+            if samples is None:
+                samples = self._samples[purpose] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def quantile(self, purpose: str, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(purpose, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {purpose: len(samples) for purpose, samples in self._samples.items()}
+        return {purpose: {'samples': count,
+                          'p50_seconds': round(self.quantile(purpose, 0.5), 4),
+                          'p95_seconds': round(self.quantile(purpose, 0.95), 4)}
+                for purpose, count in counts.items()}
+
+
+_latencies = LatencyTracker()
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=LLM_HEDGE_MAX_WORKERS, thread_name_prefix='llm-hedge')
+    return _hedge_pool
+
+
+def hedge_delay(purpose: str) -> Optional[float]:
+    """How long a ``purpose`` call may run before it is hedged; None while hedging is off or unknown."""
+    if not LLM_HEDGE_ENABLED:
+        return None
+    return _latencies.quantile(purpose, LLM_HEDGE_QUANTILE, LLM_HEDGE_MIN_SAMPLES)
+
+
+def _hedged(attempt: Callable[[float], T], timeout: float, delay: float, purpose: str) -> T:
+    """Run ``attempt``; if it outlives ``delay``, race a second copy and return the first success.
+
+    The slower copy is not interrupted (threads cannot be), but it runs
+    under its own timeout, so it finishes within ``timeout`` at worst.
+    """
+    pool = _get_hedge_pool()
+    ends_at = time.monotonic() + timeout
+    primary = pool.submit(attempt, timeout)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+    record_llm_hedge(purpose, 'fired')
+    hedge = pool.submit(attempt, max(0.0, ends_at - time.monotonic()))
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, ends_at - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError(f"{purpose} call and its hedge timed out after {timeout:.1f}s")
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    record_llm_hedge(purpose, 'won')
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+
+def call_with_retries(attempt: Callable[[float], T], purpose: str) -> T:
+    """Run ``attempt(timeout)`` within the request deadline, retrying and hedging per configuration.
+
+    ``attempt`` makes one model call that must give up after ``timeout``
+    seconds. Retryable failures back off with jitter for up to
+    LLM_MAX_ATTEMPTS attempts; anything else, or a spent deadline, raises.
+    """
+    for attempt_number in itertools.count():
+        timeout = attempt_timeout(f"llm.{purpose}")
+        delay = hedge_delay(purpose)
+        start = time.perf_counter()
+        try:
+            if delay is not None and delay < timeout:
+                result = _hedged(attempt, timeout, delay, purpose)
+            else:
+                result = attempt(timeout)
+        except Exception as e:
+            pause = next_retry_delay(e, attempt_number, purpose)
+            if pause is None:
+                raise
+            time.sleep(pause)
+            continue
+        _latencies.observe(purpose, time.perf_counter() - start)
+        return result
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    """Configuration and recent latency per purpose, for /metrics."""
+    return {
+        'deadline_seconds': REQUEST_DEADLINE_SECONDS,
+        'call_timeout_seconds': LLM_CALL_TIMEOUT_SECONDS,
+        'max_attempts': LLM_MAX_ATTEMPTS,
+        'hedge_enabled': LLM_HEDGE_ENABLED,
+        'latency': _latencies.stats(),
+    }
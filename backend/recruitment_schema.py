@@ -0,0 +1,159 @@
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from recruitment_cleaning import clean_text
+
+# Configuration (overridable through .env)
+MAX_REQUEST_BYTES = int(os.getenv('MAX_REQUEST_BYTES', 8 * 1024 * 1024))
+MAX_CONTENT_CHARS = int(os.getenv('PROFILE_MAX_CONTENT_CHARS', 20000))
+
+# Canonical profile schema: field -> max characters for scalars
+PROFILE_TEXT_LIMITS = {
+    'type': 32,
+    'name': 200,
+    'headline': 500,
+    'about': 5000,
+    'error': 500,
+}
+# List fields: field -> (max items, {item field: max characters}); None means a list of strings
+PROFILE_LIST_LIMITS = {
+    'experience': (30, {'title': 300, 'company': 300, 'duration': 100, 'location': 200, 'description': 2000}),
+    'education': (20, {'school': 300, 'degree': 300, 'duration': 100}),
+    'skills': (100, None),
+}
+_SKILL_MAX_CHARS = 100
+# Legacy copies of the page body sent by older extension builds, in order of preference
+_CONTENT_SOURCES = (('content',), ('rawContent', 'fullPage'), ('pageContent', 'text'))
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+_dropped_fields = Counter()
+_truncated_fields = Counter()
+
+
+class PayloadTooLarge(ValueError):
+    """Request body exceeds MAX_REQUEST_BYTES once decompressed."""
+
+
+def decode_body(raw: bytes, content_encoding: Optional[str] = None) -> bytes:
+    """Request body bytes, inflating ``Content-Encoding: gzip`` bodies.
+
+    Decompression is bounded by MAX_REQUEST_BYTES so a small gzip bomb can't
+    allocate unbounded memory.
+    """
+    encoding = (content_encoding or '').strip().lower()
+    _count('requests')
+    _count('bytes_received', len(raw))
+    if encoding in ('gzip', 'x-gzip'):
+        _count('gzip_requests')
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            raw = inflater.decompress(raw, MAX_REQUEST_BYTES + 1)
+        except zlib.error as e:
+            _count('rejected_bodies')
+            raise ValueError(f'Invalid gzip body: {e}')
+        # Stopping at the size cap also leaves eof unset; that case is reported as oversized below
+        if not inflater.eof and len(raw) <= MAX_REQUEST_BYTES:
+            _count('rejected_bodies')
+            raise ValueError('Truncated gzip body')
+    elif encoding not in ('', 'identity'):
+        _count('rejected_bodies')
+        raise ValueError(f'Unsupported Content-Encoding: {content_encoding}')
+
+    if len(raw) > MAX_REQUEST_BYTES:
+        _count('oversized_bodies')
+        raise PayloadTooLarge(f'Request body exceeds {MAX_REQUEST_BYTES} bytes')
+    _count('bytes_decoded', len(raw))
+    return raw
+
+
+def record_parse_time(seconds: float) -> None:
+    _count('parse_microseconds', int(seconds * 1e6))
+
+
+def normalize_profile(payload: Any) -> Any:
+    """Reduce an extension payload to the compact canonical profile.
+
+    Keeps one copy of the page text (``content``, falling back to the legacy
+    ``rawContent.fullPage`` / ``pageContent.text`` / ``rawHtml``), clips every
+    field to its limit and drops everything else. Strings pass through.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    _count('profiles_normalized')
+
+    profile: Dict[str, Any] = {}
+    for field, limit in PROFILE_TEXT_LIMITS.items():
+        value = payload.get(field)
+        if isinstance(value, str) and value.strip():
+            profile[field] = _clip(field, value.strip(), limit)
+
+    for field, (max_items, item_limits) in PROFILE_LIST_LIMITS.items():
+        items = payload.get(field)
+        if not isinstance(items, list):
+            continue
+        if len(items) > max_items:
+            with _stats_lock:
+                _truncated_fields[field] += 1
+            items = items[:max_items]
+        if item_limits is None:
+            profile[field] = [_clip(field, str(item).strip(), _SKILL_MAX_CHARS)
+                              for item in items if isinstance(item, str) and item.strip()]
+        else:
+            profile[field] = [
+                {key: _clip(f'{field}.{key}', str(item[key]).strip(), limit)
+                 for key, limit in item_limits.items() if item.get(key)}
+                for item in items if isinstance(item, dict)
+            ]
+
+    content = _page_content(payload)
+    if content:
+        profile['content'] = _clip('content', content, MAX_CONTENT_CHARS)
+    if 'name' not in profile:
+        intro_name = (payload.get('intro') or {}).get('name') if isinstance(payload.get('intro'), dict) else None
+        if isinstance(intro_name, str) and intro_name.strip():
+            profile['name'] = _clip('name', intro_name.strip(), PROFILE_TEXT_LIMITS['name'])
+
+    # Anything outside the canonical schema (legacy page copies, unknown keys)
+    with _stats_lock:
+        for field in payload:
+            if field not in profile and field not in PROFILE_TEXT_LIMITS and field not in PROFILE_LIST_LIMITS:
+                _dropped_fields[field] += 1
+    return profile
+
+
+def get_schema_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+        stats['dropped_fields'] = dict(_dropped_fields)
+        stats['truncated_fields'] = dict(_truncated_fields)
+    return stats
+
+
+def _page_content(payload: Dict[str, Any]) -> str:
+    for path in _CONTENT_SOURCES:
+        value = payload
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, str) and value.strip():
+            return value
+    raw_html = payload.get('rawHtml')
+    if isinstance(raw_html, str) and raw_html.strip():
+        return clean_text(raw_html)
+    return ''
+
+
+def _clip(field: str, value: str, limit: int) -> str:
+    if len(value) <= limit:
+        return value
+    with _stats_lock:
+        _truncated_fields[field] += 1
+    return value[:limit]
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
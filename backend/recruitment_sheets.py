@@ -0,0 +1,301 @@
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from recruitment_common import add_owner_column, process_alive
+from recruitment_resilience import backoff_delay
+
+logger = logging.getLogger('RecruitmentSheets')
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Configuration (overridable through .env)
+# "google" appends to GOOGLE_SPREADSHEET_ID; "csv" / "sqlite" write local files for offline runs
+SHEETS_SINK = os.getenv('SHEETS_SINK', 'google' if os.getenv('GOOGLE_SPREADSHEET_ID') else 'csv')
+SHEETS_RANGE = os.getenv('SHEETS_RANGE', 'Sheet1!A1')
+SHEETS_CREDENTIALS_PATH = os.getenv('SHEETS_CREDENTIALS_PATH', 'credentials.json')
+SHEETS_LOCAL_PATH = os.getenv('SHEETS_LOCAL_PATH', os.path.join(_BACKEND_DIR, 'recruitment_sheet'))
+SHEETS_SPOOL_PATH = os.getenv('SHEETS_SPOOL_PATH', os.path.join(_BACKEND_DIR, 'recruitment_sheets_spool.db'))
+# Flush when this many rows are pending, or after SHEETS_FLUSH_SECONDS at the latest
+SHEETS_BATCH_SIZE = int(os.getenv('SHEETS_BATCH_SIZE', 50))
+SHEETS_FLUSH_SECONDS = float(os.getenv('SHEETS_FLUSH_SECONDS', 5))
+SHEETS_MAX_BACKOFF_SECONDS = float(os.getenv('SHEETS_MAX_BACKOFF_SECONDS', 300))
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+# Google Sheets rejects cells longer than this
+MAX_CELL_CHARS = 50000
+
+
+class RowSink:
+    """Destination for spreadsheet rows; ``append_rows`` writes one batch or raises."""
+
+    name = 'base'
+
+    def append_rows(self, rows: List[List[str]]) -> None:
+        raise NotImplementedError
+
+
+class GoogleSheetsSink(RowSink):
+    """Appends to a Google Sheet through one Sheets service built on first use."""
+
+    name = 'google'
+
+    def __init__(self, spreadsheet_id: str, sheet_range: str = SHEETS_RANGE,
+                 credentials_path: str = SHEETS_CREDENTIALS_PATH):
+        if not spreadsheet_id:
+            raise ValueError('GOOGLE_SPREADSHEET_ID is not set')
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_range = sheet_range
+        self.credentials_path = credentials_path
+        self._service = None
+
+    def _get_service(self):
+        if self._service is None:
+            from google.oauth2.credentials import Credentials
+            from googleapiclient.discovery import build
+            creds = Credentials.from_authorized_user_file(self.credentials_path, SCOPES)
+            self._service = build('sheets', 'v4', credentials=creds, cache_discovery=False)
+        return self._service
+
+    def append_rows(self, rows: List[List[str]]) -> None:
+        self._get_service().spreadsheets().values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=self.sheet_range,
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': rows}
+        ).execute()
+
+
+class CsvSink(RowSink):
+    name = 'csv'
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append_rows(self, rows: List[List[str]]) -> None:
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+
+
+class SqliteSink(RowSink):
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sheet_rows ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' row TEXT NOT NULL,'
+            ' written_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def append_rows(self, rows: List[List[str]]) -> None:
+        now = time.time()
+        self._conn.executemany('INSERT INTO sheet_rows (row, written_at) VALUES (?, ?)',
+                               [(json.dumps(row), now) for row in rows])
+        self._conn.commit()
+
+
+def to_cell(value: Any) -> str:
+    if value is None:
+        return ''
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text[:MAX_CELL_CHARS]
+
+
+class SheetWriter:
+    """Buffers rows in a SQLite spool and flushes them to a sink in batches.
+
+    ``enqueue`` only writes the spool, so callers never wait on the sink.
+    A background thread sends up to ``batch_size`` rows per ``append_rows``
+    call once that many are pending or ``flush_seconds`` have passed, and
+    deletes them from the spool only after the sink accepted them. Failed
+    flushes are retried with jittered exponential backoff; rows left in the
+    spool by a crash or restart are sent on the next start.
+
+    Several processes (WSGI workers) may share one spool. A flush first
+    claims its batch with one conditional UPDATE, tagging the rows with
+    this writer's ``claim`` token and process ID, so no row is sent by two
+    writers; rows claimed by a process that has died are released on start.
+    """
+
+    def __init__(self, sink: RowSink, spool_path: str, batch_size: int = SHEETS_BATCH_SIZE,
+                 flush_seconds: float = SHEETS_FLUSH_SECONDS,
+                 max_backoff_seconds: float = SHEETS_MAX_BACKOFF_SECONDS):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Serializes flushes so an explicit flush() never sends the worker's batch twice
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._conn = sqlite3.connect(spool_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS spool ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' row TEXT NOT NULL,'
+            ' created_at REAL NOT NULL)'
+        )
+        add_owner_column(self._conn, 'spool')
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(spool)')}
+        if 'claim' not in columns:
+            self._conn.execute('ALTER TABLE spool ADD COLUMN claim TEXT')
+        self._claim = uuid.uuid4().hex
+        orphaned = [(owner,) for (owner,) in self._conn.execute(
+            'SELECT DISTINCT owner FROM spool WHERE owner IS NOT NULL')
+            if owner != os.getpid() and not process_alive(owner)]
+        self._conn.executemany('UPDATE spool SET owner = NULL, claim = NULL WHERE owner = ?', orphaned)
+        self._conn.commit()
+        self._pending = self._count_pending()
+        self._stats = {'enqueued': 0, 'flushed_rows': 0, 'flush_calls': 0, 'flush_failures': 0}
+        self._last_error: Optional[str] = None
+        self._last_flush: Optional[float] = None
+        self._failures_in_row = 0
+        if self._pending:
+            logger.info(f"📄 Resuming {self._pending} spooled sheet row(s)")
+        self._thread = threading.Thread(target=self._run, name='sheet-writer', daemon=True)
+        self._thread.start()
+
+    def enqueue(self, row: List[Any]) -> None:
+        cells = [to_cell(value) for value in row]
+        with self._wakeup:
+            self._conn.execute('INSERT INTO spool (row, created_at) VALUES (?, ?)',
+                               (json.dumps(cells), time.time()))
+            self._conn.commit()
+            self._pending += 1
+            self._stats['enqueued'] += 1
+            if self._pending >= self.batch_size:
+                self._wakeup.notify()
+
+    def _count_pending(self) -> int:
+        """Rows this writer may still send: unclaimed ones and its own; caller holds the lock."""
+        return self._conn.execute('SELECT COUNT(*) FROM spool WHERE claim IS NULL OR claim = ?',
+                                  (self._claim,)).fetchone()[0]
+
+    def _claim_batch(self) -> List[tuple]:
+        """Rows this writer already claimed, topped up to batch_size with unclaimed ones; caller holds the lock."""
+        # One statement, so a row claimed by another writer in the meantime is skipped
+        self._conn.execute(
+            'UPDATE spool SET claim = ?, owner = ? WHERE id IN ('
+            ' SELECT id FROM spool WHERE claim IS NULL ORDER BY id'
+            ' LIMIT MAX(0, ? - (SELECT COUNT(*) FROM spool WHERE claim = ?)))',
+            (self._claim, os.getpid(), self.batch_size, self._claim)
+        )
+        self._conn.commit()
+        return self._conn.execute('SELECT id, row FROM spool WHERE claim = ? ORDER BY id LIMIT ?',
+                                  (self._claim, self.batch_size)).fetchall()
+
+    def flush(self) -> int:
+        """Send one batch now; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._claim_batch()
+                if not batch:
+                    # Other writers sharing the spool may have sent what this one counted
+                    self._pending = self._count_pending()
+                    return 0
+
+            rows = [json.loads(row) for _, row in batch]
+            self.sink.append_rows(rows)
+
+            with self._lock:
+                self._conn.execute('DELETE FROM spool WHERE claim = ? AND id <= ?', (self._claim, batch[-1][0]))
+                self._conn.commit()
+                self._pending = self._count_pending()
+                self._stats['flushed_rows'] += len(batch)
+                self._stats['flush_calls'] += 1
+                self._last_flush = time.time()
+            return len(batch)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the worker after it drains what it can within ``timeout``."""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return
+        # Hand rows this writer claimed but could not send back to the other writers
+        with self._lock:
+            self._conn.execute('UPDATE spool SET owner = NULL, claim = NULL WHERE claim = ?', (self._claim,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'sink': self.sink.name,
+                'pending': self._pending,
+                'consecutive_failures': self._failures_in_row,
+                'last_error': self._last_error,
+                'last_flush_age_seconds': round(time.time() - self._last_flush, 1) if self._last_flush else None,
+            })
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if not self._stopping and self._pending < self.batch_size:
+                    self._wakeup.wait(self.flush_seconds)
+                stopping = self._stopping
+            try:
+                # Drain full batches back to back; a partial batch means the spool is empty
+                while self.flush() == self.batch_size:
+                    pass
+                self._failures_in_row = 0
+            except Exception as e:
+                self._failures_in_row += 1
+                with self._lock:
+                    self._stats['flush_failures'] += 1
+                    self._last_error = str(e)
+                delay = backoff_delay(self._failures_in_row, base=1.0, max_delay=self.max_backoff_seconds,
+                                      min_share=0.5)
+                logger.warning(f"⚠️ Sheet flush to {self.sink.name} failed ({e}); retrying in {delay:.1f}s")
+                if stopping:
+                    return
+                with self._wakeup:
+                    self._wakeup.wait_for(lambda: self._stopping, timeout=delay)
+                continue
+            if stopping:
+                return
+
+
+def create_sink(kind: str = SHEETS_SINK) -> RowSink:
+    if kind == 'google':
+        return GoogleSheetsSink(os.getenv('GOOGLE_SPREADSHEET_ID'))
+    if kind == 'csv':
+        return CsvSink(SHEETS_LOCAL_PATH + '.csv')
+    if kind == 'sqlite':
+        return SqliteSink(SHEETS_LOCAL_PATH + '.db')
+    raise ValueError(f'Unknown SHEETS_SINK: {kind}')
+
+
+_writer: Optional[SheetWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_sheet_writer() -> SheetWriter:
+    """Process-wide writer for SHEETS_SINK, started on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = SheetWriter(create_sink(), SHEETS_SPOOL_PATH)
+                logger.info(f"📄 Sheet writer started ({_writer.sink.name} sink)")
+    return _writer
+
+
+def peek_sheet_writer() -> Optional[SheetWriter]:
+    """The writer if one was started, without starting it."""
+    return _writer
@@ -0,0 +1,299 @@
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Canonical skill name -> spellings that count as that skill. Multi-word aliases match
+# across any punctuation/whitespace ("node js", "node-js", "ci/cd"). Aliases written
+# with capitals are also ordinary English words ("go the extra mile", "react to"):
+# in running text they only count when capitalised, as in "Go" or "ML".
+SKILL_ALIASES = {
+    'Python': ['python'],
+    'Java': ['java'],
+    'JavaScript': ['javascript', 'js', 'ecmascript'],
+    'TypeScript': ['typescript'],
+    'Go': ['golang', 'Go'],
+    'Rust': ['Rust'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp'],
+    '.NET': ['dotnet', 'asp.net', 'net core', 'net framework'],
+    'Kotlin': ['kotlin'],
+    'Swift': ['Swift'],
+    'Scala': ['scala'],
+    'Ruby': ['ruby', 'ruby on rails', 'Rails'],
+    'PHP': ['php', 'laravel'],
+    'NodeJS': ['nodejs', 'node.js', 'node js'],
+    'Angular': ['angular', 'angularjs'],
+    'React': ['React', 'reactjs', 'react.js'],
+    'React Native': ['react native'],
+    'Vue': ['vue', 'vuejs', 'vue.js'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'FastAPI': ['fastapi'],
+    'Spring': ['Spring', 'spring boot', 'springboot'],
+    'GraphQL': ['graphql'],
+    'REST APIs': ['restful', 'rest api', 'rest apis'],
+    'gRPC': ['grpc'],
+    'Microservices': ['microservices', 'microservice'],
+    'AWS': ['aws', 'amazon web services'],
+    'Azure': ['Azure'],
+    'GCP': ['gcp', 'google cloud', 'google cloud platform'],
+    'Docker': ['docker'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'Terraform': ['terraform'],
+    'CI/CD': ['ci cd', 'cicd', 'jenkins', 'github actions', 'gitlab ci'],
+    'Linux': ['linux'],
+    'SQL': ['sql', 'mysql', 'postgres', 'postgresql'],
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'Elasticsearch': ['elasticsearch', 'elastic search', 'opensearch'],
+    'Kafka': ['kafka'],
+    'Spark': ['Spark', 'pyspark', 'apache spark'],
+    'Airflow': ['airflow'],
+    'Snowflake': ['snowflake'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'scikit-learn': ['scikit learn', 'sklearn'],
+    'TensorFlow': ['tensorflow'],
+    'PyTorch': ['pytorch', 'Torch'],
+    'Machine Learning': ['machine learning', 'ML'],
+    'Deep Learning': ['deep learning'],
+    'NLP': ['nlp', 'natural language processing'],
+    'Computer Vision': ['computer vision'],
+    'Data Science': ['data science', 'data scientist'],
+    'Generative AI': ['generative ai', 'genai', 'llm', 'llms', 'large language models'],
+    'RAG': ['RAG', 'retrieval augmented generation'],
+    'Vector Databases': ['vectordb', 'vector db', 'vector database', 'vector databases', 'pinecone'],
+    'Data Structures & Algorithms': ['data structures', 'algorithms', 'data structure'],
+    'System Design': ['system design', 'distributed systems'],
+    'Agile': ['agile', 'scrum'],
+}
+
+# Column order of skill feature vectors
+SKILLS = list(SKILL_ALIASES)
+SKILL_INDEX = {skill: i for i, skill in enumerate(SKILLS)}
+FEATURE_NAMES = SKILLS + ['years_experience', 'skill_count']
+YEARS_COLUMN = len(SKILLS)
+
+# Words; dots and +/# stay inside a token ("node.js", "c++") but not at its ends
+_TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*', re.IGNORECASE)
+_END = ''  # trie key marking "an alias ends here"; never a token
+_CASED_END = ' '  # same, for an alias that must be capitalised in the text
+
+_YEARS_PATTERN = re.compile(r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b', re.IGNORECASE)
+
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+           'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+# The scan is anchored on "YYYY - " so the start month is looked up only behind actual matches
+_DATE_RANGE_PATTERN = re.compile(
+    r'\b(?P<y1>(?:19|20)\d{2})\s*(?:-|–|—|to)\s*(?:(?P<present>present|current|now|today)\b|'
+    r'(?:(?P<m2>[a-z]{3})[a-z]*\.?\s+|(?P<m2n>0?[1-9]|1[0-2])/)?(?P<y2>(?:19|20)\d{2})\b)',
+    re.IGNORECASE
+)
+_START_MONTH_PATTERN = re.compile(r'(?:\b(?P<m1>[a-z]{3})[a-z]*\.?\s+|\b(?P<m1n>0?[1-9]|1[0-2])/)$', re.IGNORECASE)
+# LinkedIn's own duration labels, e.g. "4 yrs 3 mos", "1 yr", "8 mos"
+_DURATION_PATTERN = re.compile(
+    r'\b(?:(?P<years>\d{1,2})\s*yrs?\b(?:\s*(?P<months>\d{1,2})\s*mos?\b)?|(?P<only_months>\d{1,2})\s*mos?\b)',
+    re.IGNORECASE
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _capitalised(words: Sequence[str]) -> bool:
+    return all(word[0].isupper() for word in words)
+
+
+class SkillMatcher:
+    """All aliases compiled into one trie over words, matched in a single pass.
+
+    Text is tokenized once; only tokens that start some alias are expanded,
+    and at each of those the longest alias wins ("react native" over
+    "react"), so cost is linear in the text and independent of the number
+    of aliases. Aliases go through the same tokenizer as the text, so
+    punctuation and spacing variants of multi-word aliases match alike.
+    Aliases containing capitals only match capitalised words.
+    """
+
+    def __init__(self, aliases: Dict[str, Sequence[str]]):
+        self.skills = list(aliases)
+        self._root: Dict[str, dict] = {}
+        for index, spellings in enumerate(aliases.values()):
+            for alias in spellings:
+                tokens = tokenize(alias)
+                if not tokens:
+                    raise ValueError(f'Alias {alias!r} has no word characters')
+                node = self._root
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END if alias == alias.lower() else _CASED_END, index)
+
+    def find(self, text: str, ignore_case: bool = False) -> List[int]:
+        """Indices into ``self.skills`` mentioned in ``text``, in order of first mention.
+
+        ``ignore_case`` also matches lowercase spellings of capitalised
+        aliases, for text that is a skill name rather than prose.
+        """
+        words = _TOKEN_PATTERN.findall(text)
+        tokens = [word.lower() for word in words]
+        root = self._root
+        found = {}
+        resume = 0
+
+        def accept(node: dict, start: int, end: int) -> Optional[int]:
+            if _END in node:
+                return node[_END]
+            if _CASED_END in node and (ignore_case or _capitalised(words[start:end])):
+                return node[_CASED_END]
+            return None
+
+        for start in [i for i, token in enumerate(tokens) if token in root]:
+            if start < resume:
+                continue
+            node = root[tokens[start]]
+            best, end = accept(node, start, start + 1), start + 1
+            position = start + 1
+            while position < len(tokens):
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                position += 1
+                match = accept(node, start, position)
+                if match is not None:
+                    best, end = match, position
+            if best is not None:
+                found.setdefault(best, None)
+                resume = end
+        return list(found)
+
+    def vector(self, text: str) -> np.ndarray:
+        """0/1 presence of every skill, in ``self.skills`` order."""
+        vector = np.zeros(len(self.skills), dtype=np.uint8)
+        vector[self.find(text)] = 1
+        return vector
+
+
+_matcher = SkillMatcher(SKILL_ALIASES)
+
+
+def extract_skills(text: str, ignore_case: bool = False) -> List[str]:
+    """Canonical skills mentioned in text, in order of first mention.
+
+    ``ignore_case`` is for a bare skill name such as a search filter, where
+    "go" cannot be the English verb.
+    """
+    return [SKILLS[index] for index in _matcher.find(text, ignore_case=ignore_case)]
+
+
+def extract_years_required(text: str) -> int:
+    """Largest "N years" / "N+ yrs" figure in a job description, 0 if none."""
+    years = [int(match.group(1)) for match in _YEARS_PATTERN.finditer(text)]
+    return max((value for value in years if value <= 40), default=0)
+
+
+def _month(match: Optional[re.Match], name: str) -> Optional[int]:
+    """Month number from a ``name`` (month word) or ``name + 'n'`` (numeric) group, if any."""
+    if match is None:
+        return None
+    if match.group(name):
+        return _MONTHS.get(match.group(name).lower())
+    if match.group(name + 'n'):
+        return int(match.group(name + 'n'))
+    return None
+
+
+def parse_date_ranges(text: str, today: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+    """Employment periods in ``text`` as ``(start, end)`` month numbers, end exclusive.
+
+    Understands "Jan 2020 - Present", "Mar 2019 – Jun 2022", "03/2019 - 06/2022"
+    and "2018 - 2021". A month-less end counts up to January of that year;
+    a month-qualified end includes that month, as LinkedIn does. Reversed,
+    future or implausibly long ranges are dropped.
+    """
+    year, month = today or time.localtime()[:2]
+    now = year * 12 + month
+    ranges = []
+    for match in _DATE_RANGE_PATTERN.finditer(text):
+        before = _START_MONTH_PATTERN.search(text, max(0, match.start() - 12), match.start())
+        start_month, end_month = _month(before, 'm1'), _month(match, 'm2')
+        start = int(match.group('y1')) * 12 + (start_month or 1) - 1
+        if match.group('present'):
+            end = now
+        else:
+            end = int(match.group('y2')) * 12 + (end_month if end_month is not None else 0)
+        if start < end <= now and end - start <= 50 * 12:
+            ranges.append((start, end, start_month is not None or end_month is not None))
+    # Profiles list jobs with months and education with bare years; if any range has months, trust only those
+    if any(has_month for _, _, has_month in ranges):
+        ranges = [item for item in ranges if item[2]]
+    return [(start, end) for start, end, _ in ranges]
+
+
+def merged_months(ranges: Sequence[Tuple[int, int]]) -> int:
+    """Months covered by the union of ``ranges``, so overlapping jobs count once."""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def experience_months(text: str, today: Optional[Tuple[int, int]] = None) -> int:
+    """Months of experience described by ``text``.
+
+    Date ranges win when present (overlaps merged). Otherwise LinkedIn's
+    "N yrs M mos" labels are summed, and failing those the largest
+    "N+ years" claim is used.
+    """
+    ranges = parse_date_ranges(text, today)
+    if ranges:
+        return merged_months(ranges)
+    months = 0
+    for match in _DURATION_PATTERN.finditer(text):
+        if match.group('only_months'):
+            months += int(match.group('only_months'))
+        else:
+            months += int(match.group('years')) * 12 + int(match.group('months') or 0)
+    if months:
+        return min(months, 50 * 12)
+    return extract_years_required(text) * 12
+
+
+def extract_years_from_experience(text: str) -> int:
+    """Whole years of experience described by ``text``."""
+    return experience_months(text) // 12
+
+
+def feature_matrix(texts: Sequence[str], today: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """(len(texts), len(FEATURE_NAMES)) float32 matrix: skill presence, years of experience, skill count."""
+    matrix = np.zeros((len(texts), len(FEATURE_NAMES)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        matrix[row, _matcher.find(text)] = 1.0
+        matrix[row, YEARS_COLUMN] = experience_months(text, today) / 12
+    matrix[:, YEARS_COLUMN + 1] = matrix[:, :YEARS_COLUMN].sum(axis=1)
+    return matrix
+
+
+def skill_coverage(features: np.ndarray, required_skills: Sequence[str]) -> np.ndarray:
+    """Share of ``required_skills`` each row of ``features`` has; 1.0 when nothing is required."""
+    columns = [SKILL_INDEX[skill] for skill in required_skills if skill in SKILL_INDEX]
+    if not columns:
+        return np.ones(len(features), dtype=np.float32)
+    return features[:, columns].mean(axis=1)
+
+
+def years_fit(features: np.ndarray, years_required: int) -> np.ndarray:
+    """Years of experience over years required, capped at 1.0; 1.0 when nothing is required."""
+    if years_required <= 0:
+        return np.ones(len(features), dtype=np.float32)
+    return np.minimum(features[:, YEARS_COLUMN] / years_required, 1.0)
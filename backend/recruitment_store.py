@@ -0,0 +1,271 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from recruitment_skills import extract_skills
+
+logger = logging.getLogger('RecruitmentStore')
+
+# Configuration (overridable through .env)
+CANDIDATE_STORE_ENABLED = os.getenv('CANDIDATE_STORE_ENABLED', 'true').lower() == 'true'
+CANDIDATE_STORE_PATH = os.getenv(
+    'CANDIDATE_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recruitment_candidates.db')
+)
+SEARCH_DEFAULT_LIMIT = int(os.getenv('SEARCH_DEFAULT_LIMIT', 50))
+SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', 500))
+
+# Sort name -> (column, cursor value type); every sort breaks ties on id, newest first
+SORTS = {'score': ('score', int), 'recent': ('analyzed_at', float)}
+_MAX_SKILL_CHARS = 100
+_SUMMARY_COLUMNS = 'c.id, c.candidate_key, c.job_key, c.name, c.headline, c.score, c.skills, c.analyzed_at'
+_DETAIL_COLUMNS = _SUMMARY_COLUMNS + ', c.analysis, c.qualifications, c.message'
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS candidates ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+    ' candidate_key TEXT NOT NULL,'
+    ' job_key TEXT NOT NULL,'
+    ' name TEXT NOT NULL,'
+    ' headline TEXT NOT NULL,'
+    ' score INTEGER NOT NULL,'
+    ' skills TEXT NOT NULL,'
+    ' profile_text TEXT NOT NULL,'
+    ' analysis TEXT NOT NULL,'
+    ' qualifications TEXT NOT NULL,'
+    ' message TEXT NOT NULL,'
+    ' analyzed_at REAL NOT NULL,'
+    ' UNIQUE (candidate_key, job_key))',
+    'CREATE INDEX IF NOT EXISTS idx_candidates_job_score ON candidates(job_key, score DESC, id DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_candidates_job_recent ON candidates(job_key, analyzed_at DESC, id DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_candidates_score ON candidates(score DESC, id DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_candidates_recent ON candidates(analyzed_at DESC, id DESC)',
+    'CREATE TABLE IF NOT EXISTS candidate_skills ('
+    ' candidate_id INTEGER NOT NULL,'
+    ' skill TEXT NOT NULL,'
+    ' PRIMARY KEY (candidate_id, skill)) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills(skill, candidate_id)',
+    # External-content FTS: the text lives once, in candidates; triggers keep the index in sync
+    'CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5('
+    ' name, headline, profile_text, skills, analysis, qualifications,'
+    " content='candidates', content_rowid='id', tokenize='porter unicode61')",
+    'CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN'
+    ' INSERT INTO candidates_fts(rowid, name, headline, profile_text, skills, analysis, qualifications)'
+    ' VALUES (new.id, new.name, new.headline, new.profile_text, new.skills, new.analysis, new.qualifications);'
+    ' END',
+    'CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN'
+    ' INSERT INTO candidates_fts(candidates_fts, rowid, name, headline, profile_text, skills, analysis, qualifications)'
+    " VALUES ('delete', old.id, old.name, old.headline, old.profile_text, old.skills, old.analysis,"
+    ' old.qualifications);'
+    ' END',
+    'CREATE TRIGGER IF NOT EXISTS candidates_au AFTER UPDATE ON candidates BEGIN'
+    ' INSERT INTO candidates_fts(candidates_fts, rowid, name, headline, profile_text, skills, analysis, qualifications)'
+    " VALUES ('delete', old.id, old.name, old.headline, old.profile_text, old.skills, old.analysis,"
+    ' old.qualifications);'
+    ' INSERT INTO candidates_fts(rowid, name, headline, profile_text, skills, analysis, qualifications)'
+    ' VALUES (new.id, new.name, new.headline, new.profile_text, new.skills, new.analysis, new.qualifications);'
+    ' END',
+)
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical lowercase skill name, so ``golang`` and ``Go`` find the same candidates."""
+    canonical = extract_skills(skill, ignore_case=True)
+    return (canonical[0] if len(canonical) == 1 else skill).strip().lower()[:_MAX_SKILL_CHARS]
+
+
+def profile_skills(profile: Dict[str, Any], profile_text: str) -> List[str]:
+    """Listed skills plus known skills mentioned anywhere in the profile text, normalized and deduplicated."""
+    skills = []
+    listed = profile.get('skills') if isinstance(profile, dict) else None
+    for skill in listed or []:
+        if isinstance(skill, str) and skill.strip():
+            skills.append(normalize_skill(skill))
+    skills.extend(skill.lower() for skill in extract_skills(profile_text))
+    return list(dict.fromkeys(skills))
+
+
+def fts_query(text: str) -> str:
+    """Free text as an FTS5 query: every word required, quoted so punctuation isn't syntax."""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+def encode_cursor(sort: str, row: Dict[str, Any]) -> str:
+    return f"{row[SORTS[sort][0]]}:{row['id']}"
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple[Any, int]:
+    value, _, row_id = cursor.rpartition(':')
+    try:
+        return SORTS[sort][1](value), int(row_id)
+    except ValueError:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+
+class CandidateStore:
+    """SQLite store of analysis results, one row per (candidate, job).
+
+    Re-analysing a candidate for the same job replaces the row. Profile
+    text, skills and the LLM's analysis are full-text indexed with FTS5;
+    normalized skills also go to a side table so "has skill X" is an index
+    lookup. Listing is ordered by score or recency with the ID as tie
+    breaker and paginated by keyset (``cursor`` = last row's sort value and
+    ID), so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._stats = {'recorded': 0, 'searches': 0}
+        self._search_seconds = 0.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        count = self._conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+        logger.info(f"🗂️ Candidate store ready with {count} candidate(s) at {db_path}")
+
+    def record(self, candidate_key: str, job_key: str, profile: Dict[str, Any], profile_text: str,
+               result: Dict[str, Any]) -> int:
+        """Insert or replace the analysis of one candidate for one job; returns the row ID."""
+        intro = profile.get('intro') or {} if isinstance(profile, dict) else {}
+        name = str(profile.get('name') or intro.get('name') or 'Candidate') if isinstance(profile, dict) else 'Candidate'
+        headline = str(profile.get('headline') or intro.get('headline') or '') if isinstance(profile, dict) else ''
+        skills = profile_skills(profile, profile_text)
+        values = (
+            name, headline, int(result.get('matchScore') or 0), json.dumps(skills), profile_text,
+            str(result.get('match_analysis') or ''), str(result.get('key_qualifications') or ''),
+            str(result.get('message') or ''), time.time(),
+        )
+        with self._lock:
+            row_id = self._conn.execute(
+                'INSERT INTO candidates (candidate_key, job_key, name, headline, score, skills, profile_text,'
+                ' analysis, qualifications, message, analyzed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+                ' ON CONFLICT (candidate_key, job_key) DO UPDATE SET name = excluded.name,'
+                ' headline = excluded.headline, score = excluded.score, skills = excluded.skills,'
+                ' profile_text = excluded.profile_text, analysis = excluded.analysis,'
+                ' qualifications = excluded.qualifications, message = excluded.message,'
+                ' analyzed_at = excluded.analyzed_at'
+                ' RETURNING id',
+                (candidate_key, job_key) + values
+            ).fetchone()[0]
+            self._conn.execute('DELETE FROM candidate_skills WHERE candidate_id = ?', (row_id,))
+            self._conn.executemany('INSERT OR IGNORE INTO candidate_skills (candidate_id, skill) VALUES (?, ?)',
+                                   [(row_id, skill) for skill in skills])
+            self._conn.commit()
+            self._stats['recorded'] += 1
+        return row_id
+
+    def search(self, job_key: Optional[str] = None, skills: Optional[List[str]] = None, text: str = '',
+               min_score: Optional[int] = None, sort: str = 'score', limit: int = SEARCH_DEFAULT_LIMIT,
+               cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of candidates and the cursor for the next page (None on the last one).
+
+        Filters combine with AND: ``job_key``, every skill in ``skills``,
+        the free-text ``text`` (matched against profile text, skills and the
+        LLM analysis) and ``min_score``.
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {list(SORTS)}")
+        limit = max(1, min(int(limit), SEARCH_MAX_LIMIT))
+        column = SORTS[sort][0]
+
+        where, params = [], []
+        source = 'candidates c'
+        query = fts_query(text or '')
+        if query:
+            source = 'candidates_fts f JOIN candidates c ON c.id = f.rowid'
+            where.append('candidates_fts MATCH ?')
+            params.append(query)
+        if job_key:
+            where.append('c.job_key = ?')
+            params.append(job_key)
+        for skill in skills or []:
+            where.append('EXISTS (SELECT 1 FROM candidate_skills s WHERE s.candidate_id = c.id AND s.skill = ?)')
+            params.append(normalize_skill(skill))
+        if min_score is not None:
+            where.append('c.score >= ?')
+            params.append(int(min_score))
+        if cursor:
+            where.append(f'(c.{column}, c.id) < (?, ?)')
+            params.extend(decode_cursor(sort, cursor))
+
+        sql = (f'SELECT {_SUMMARY_COLUMNS} FROM {source}'
+               + (f" WHERE {' AND '.join(where)}" if where else '')
+               + f' ORDER BY c.{column} DESC, c.id DESC LIMIT ?')
+        start = time.perf_counter()
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit + 1]).fetchall()
+            self._stats['searches'] += 1
+            self._search_seconds += time.perf_counter() - start
+        page = [self._to_dict(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(sort, page[-1]) if len(rows) > limit else None
+        return page, next_cursor
+
+    def iter_search(self, max_results: Optional[int] = None, page_size: int = SEARCH_MAX_LIMIT,
+                    **filters) -> Iterator[Dict[str, Any]]:
+        """Every match of ``search(**filters)``, fetched page by page so memory stays flat."""
+        cursor = filters.pop('cursor', None)
+        filters.pop('limit', None)
+        emitted = 0
+        while True:
+            page, cursor = self.search(limit=page_size, cursor=cursor, **filters)
+            for row in page:
+                if max_results is not None and emitted >= max_results:
+                    return
+                emitted += 1
+                yield row
+            if cursor is None:
+                return
+
+    def get(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f'SELECT {_DETAIL_COLUMNS} FROM candidates c WHERE c.id = ?',
+                                     (candidate_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            candidates, jobs = self._conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT job_key) FROM candidates').fetchone()
+            page_count = self._conn.execute('PRAGMA page_count').fetchone()[0]
+            page_size = self._conn.execute('PRAGMA page_size').fetchone()[0]
+            stats = dict(self._stats)
+            searches = stats['searches']
+            stats.update({
+                'candidates': candidates,
+                'jobs': jobs,
+                'db_bytes': page_count * page_size,
+                'avg_search_ms': round(self._search_seconds / searches * 1e3, 3) if searches else 0.0,
+            })
+        return stats
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data['skills'] = json.loads(data['skills'])
+        return data
+
+
+_store: Optional[CandidateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store() -> Optional[CandidateStore]:
+    """Process-wide store, or None when CANDIDATE_STORE_ENABLED is false."""
+    global _store
+    if not CANDIDATE_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CandidateStore(CANDIDATE_STORE_PATH)
+    return _store
@@ -1,16 +1,22 @@
-import google.generativeai as genai
-from typing import Dict, Any
-import os
+import re
+import time
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-import pdb
+from recruitment_cleaning import has_markup, html_to_text
+from recruitment_cache import get_result_cache, make_cache_key
+from recruitment_metrics import record_llm_call, span
+from recruitment_models import generate_text, get_model
+from recruitment_notifications import candidate_key, get_notification_outbox
+from recruitment_prompt import SCORE_TOKEN_BUDGET, fit_text
+from recruitment_quota import get_score_flights, quota_slot
+from recruitment_resilience import attempt_timeout, next_retry_delay
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-2.0-flash')
+# Bump whenever the scoring prompt or its parsing changes so cached results are not reused
+PROMPT_VERSION = 'score-v2'
+MULTI_ROLE_PROMPT_VERSION = 'match-v1'
 
 def process_profile_data(profile_data: Any) -> Dict[str, Any]:
     """Convert profile data to proper format."""
@@ -24,20 +30,21 @@ def process_profile_data(profile_data: Any) -> Dict[str, Any]:
         }
     return profile_data
 
-def calculate_profile_score(profile_content: str, job_description: str) -> tuple[int, str, str, str]:
-    """Calculate profile score and analysis sections."""
-    #pdb.set_trace()  # Debug: Score calculation start
-    
-    # Convert profile_data to proper format
-    #formatted_profile = process_profile_data(profile_data)
-    
-    # Clean and truncate profile content
+def prepare_score_content(profile_content: str) -> str:
+    """Clean profile content and fit it to the scoring prompt budget."""
     if isinstance(profile_content, str):
-        profile_content = BeautifulSoup(profile_content, 'html.parser').get_text()
-        # Limit content length and clean up whitespace
-        profile_content = ' '.join(profile_content.split())[:2000]
-    
-    prompt = f"""
+        # Content from prepare_profile_content is already plain text, so this
+        # only parses when a caller hands over raw HTML
+        if has_markup(profile_content):
+            profile_content = html_to_text(profile_content)
+        # Drop page chrome and fit the scoring token budget, keeping the
+        # highest-priority lines that prepare_profile_content put first
+        profile_content, _ = fit_text(profile_content, SCORE_TOKEN_BUDGET)
+    return profile_content
+
+def build_score_prompt(profile_content: str, job_description: str) -> str:
+    """Scoring prompt; bump PROMPT_VERSION when changing it."""
+    return f"""
     As an expert recruiter, analyze this candidate's profile against the job requirements.
     Format your ENTIRE response using Markdown syntax with EXACTLY these sections:
     
@@ -69,14 +76,9 @@ def calculate_profile_score(profile_content: str, job_description: str) -> tuple
     ### Personalized Message
     [Write outreach message]
     """
-    
-    response = model.generate_content(prompt)
-    #pdb.set_trace()  # Debug: After AI response
-    
-    if not response or not response.text:
-        raise Exception("Empty response from Gemini")
-        
-    text = response.text
+
+def parse_score_response(text: str) -> tuple[int, str, str, str]:
+    """Split the scoring markdown into (score, analysis, qualifications, message)."""
     score = max(0, min(100, extract_score(text)))
     
     # Extract sections more carefully
@@ -99,6 +101,258 @@ def calculate_profile_score(profile_content: str, job_description: str) -> tuple
         cleaned_sections['message'].replace('### Personalized Message', '').strip()
     )
 
+def calculate_profile_score(profile_content: str, job_description: str,
+                            use_cache: bool = True) -> tuple[int, str, str, str]:
+    """Calculate profile score and analysis sections.
+
+    Results are cached by content hash; ``use_cache=False`` skips the lookup
+    and refreshes the cached entry. Concurrent calls for the same profile
+    and job share one model call.
+    """
+    #pdb.set_trace()  # Debug: Score calculation start
+    
+    # Convert profile_data to proper format
+    #formatted_profile = process_profile_data(profile_data)
+    
+    with span("score.prepare"):
+        profile_content = prepare_score_content(profile_content)
+
+    cache = get_result_cache()
+    cache_key = make_cache_key(profile_content, job_description, PROMPT_VERSION, get_model().name)
+    if cache is not None and use_cache:
+        with span("score.cache_lookup"):
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return tuple(cached)
+
+    def score() -> tuple[int, str, str, str]:
+        response_text = generate_text(build_score_prompt(profile_content, job_description), purpose="score")
+        #pdb.set_trace()  # Debug: After AI response
+
+        if not response_text:
+            raise Exception("Empty response from Gemini")
+
+        with span("score.parse"):
+            result = parse_score_response(response_text)
+        if cache is not None:
+            cache.set(cache_key, list(result))
+        return result
+
+    flights = get_score_flights()
+    if flights is None:
+        return score()
+    result, _ = flights.do(cache_key, score)
+    return result
+
+def build_multi_role_prompt(profile_content: str, roles: list[tuple[str, str]]) -> str:
+    """One prompt scoring a profile against several ``(label, job description)`` roles.
+
+    Bump MULTI_ROLE_PROMPT_VERSION when changing it.
+    """
+    role_blocks = "\n\n".join(f"Role {label}:\n{job_description}" for label, job_description in roles)
+    return f"""
+    As an expert recruiter, score this candidate's profile against each of the roles below independently.
+    Format your ENTIRE response using Markdown syntax, with one block per role in the order given:
+
+    {role_blocks}
+
+    Complete Profile Content:
+    {profile_content}
+
+    For EACH role respond with:
+
+    ## Role [label]
+    ### Match Score
+    **Score:** [number between 0-100]
+    ### Match Analysis
+    [Two or three sentences explaining the match percentage]
+    ### Key Qualifications
+    - [Bullet points of qualifications matching this role]
+    """
+
+def parse_multi_role_response(text: str, labels: list[str]) -> dict[str, tuple[int, str, str]]:
+    """``label -> (score, analysis, key_qualifications)`` for every role block found in ``text``."""
+    blocks = re.split(r'^\s*##\s+Role\s+', text, flags=re.MULTILINE)[1:]
+    results = {}
+    for block in blocks:
+        label = block.split(None, 1)[0].strip(':*') if block.strip() else ''
+        if label not in labels or label in results:
+            continue
+        analysis_start = block.find('### Match Analysis')
+        qualifications_start = block.find('### Key Qualifications')
+        analysis = block[analysis_start:qualifications_start] if analysis_start >= 0 else ''
+        qualifications = block[qualifications_start:] if qualifications_start >= 0 else ''
+        results[label] = (
+            max(0, min(100, extract_score(block))),
+            analysis.replace('### Match Analysis', '').strip(),
+            qualifications.replace('### Key Qualifications', '').strip(),
+        )
+    return results
+
+def calculate_multi_role_scores(profile_content: str, job_descriptions: list[str],
+                                use_cache: bool = True) -> list[tuple[int, str, str]]:
+    """Score one profile against several job descriptions with a single LLM call.
+
+    Returns one ``(score, analysis, key_qualifications)`` per job description,
+    in order. Roles the model left out of its answer are scored on their own
+    with calculate_profile_score. Cached like calculate_profile_score, keyed
+    on the whole role set.
+    """
+    with span("score.prepare"):
+        profile_content = prepare_score_content(profile_content)
+
+    cache = get_result_cache()
+    cache_key = make_cache_key(profile_content, '\x00'.join(job_descriptions), MULTI_ROLE_PROMPT_VERSION,
+                               get_model().name)
+    if cache is not None and use_cache:
+        with span("score.cache_lookup"):
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return [tuple(item) for item in cached]
+
+    labels = [f"R{i + 1}" for i in range(len(job_descriptions))]
+    response_text = generate_text(
+        build_multi_role_prompt(profile_content, list(zip(labels, job_descriptions))), purpose="score_multi"
+    )
+    if not response_text:
+        raise Exception("Empty response from Gemini")
+
+    with span("score.parse"):
+        parsed = parse_multi_role_response(response_text, labels)
+    results = []
+    for label, job_description in zip(labels, job_descriptions):
+        if label in parsed:
+            results.append(parsed[label])
+        else:
+            score, analysis, qualifications, _ = calculate_profile_score(profile_content, job_description,
+                                                                         use_cache=use_cache)
+            results.append((score, analysis, qualifications))
+    if cache is not None:
+        cache.set(cache_key, [list(item) for item in results])
+    return results
+
+class MarkdownSectionStream:
+    """Incrementally split streamed markdown into ``###``/``####`` sections.
+
+    ``feed`` returns the sections completed by the new chunk, i.e. those whose
+    next header has arrived; ``finish`` flushes the last one.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._name = None
+        self._lines: list[str] = []
+        self.text = ''
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self.text += chunk
+        self._pending += chunk
+        *lines, self._pending = self._pending.split('\n')
+        completed = []
+        for line in lines:
+            header = line.strip()
+            if header.startswith('###'):
+                completed.extend(self._close())
+                self._name = header.lstrip('#').strip()
+            else:
+                self._lines.append(line)
+        return completed
+
+    def finish(self) -> list[tuple[str, str]]:
+        if self._pending:
+            self._lines.append(self._pending)
+            self._pending = ''
+        return self._close()
+
+    def _close(self) -> list[tuple[str, str]]:
+        name, content = self._name, '\n'.join(self._lines).strip()
+        self._name, self._lines = None, []
+        return [(name, content)] if name and content else []
+
+def _section_events(chunks, stream: MarkdownSectionStream):
+    """Turn markdown chunks into score/section events."""
+    score_sent = False
+    for chunk in chunks:
+        for name, content in stream.feed(chunk):
+            if name == 'Match Score' and not score_sent:
+                score_sent = True
+                yield 'score', {'matchScore': max(0, min(100, extract_score(content)))}
+            yield 'section', {'name': name, 'content': content}
+    for name, content in stream.finish():
+        yield 'section', {'name': name, 'content': content}
+
+def _strip_prefix(text: str, prefix: str) -> str:
+    text = text.strip()
+    return text[len(prefix):].strip() if text.startswith(prefix) else text
+
+def score_markdown(score: int, analysis: str, qualifications: str, message: str) -> str:
+    """The scoring markdown a parse_score_response tuple came from, to replay a cached result as sections.
+
+    Every header is written out; parse_score_response keeps the Match
+    Analysis header in ``analysis`` and the last word of the Qualifications
+    Analysis header in ``qualifications``, so those are stripped first.
+    """
+    sections = [
+        ('### Match Score', f"**Score:** {score}"),
+        ('### Match Analysis', _strip_prefix(analysis, '### Match Analysis')),
+        ('### Qualifications Analysis', _strip_prefix(qualifications, 'Analysis')),
+        ('### Personalized Message', message.strip()),
+    ]
+    return '\n'.join(f"{header}\n{body}" for header, body in sections)
+
+def stream_profile_score(profile_content: str, job_description: str, use_cache: bool = True):
+    """Streaming variant of calculate_profile_score.
+
+    Yields ``('score', {'matchScore'})`` as soon as the score line arrives,
+    ``('section', {'name', 'content'})`` as each markdown section completes,
+    and finally ``('scored', (score, analysis, qualifications, message))``
+    with the same tuple calculate_profile_score returns.
+    """
+    profile_content = prepare_score_content(profile_content)
+
+    model = get_model()
+    cache = get_result_cache()
+    cache_key = make_cache_key(profile_content, job_description, PROMPT_VERSION, model.name)
+    if cache is not None and use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield from _section_events([score_markdown(*cached)], MarkdownSectionStream())
+            yield 'scored', tuple(cached)
+            return
+
+    stream = MarkdownSectionStream()
+    prompt = build_score_prompt(profile_content, job_description)
+    start = time.perf_counter()
+    attempt = 0
+    try:
+        while True:
+            try:
+                with quota_slot(prompt, attempt_timeout("llm.score_stream")) as slot:
+                    response = model.generate_content(prompt, stream=True, request_options={'timeout': slot.timeout})
+                    yield from _section_events((chunk.text or '' for chunk in response), stream)
+                    slot.record(prompt, text=stream.text)
+                break
+            except Exception as e:
+                # Sections already sent to the client cannot be taken back, so only retry before the first chunk
+                delay = None if stream.text else next_retry_delay(e, attempt, "score_stream")
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+    except Exception:
+        record_llm_call("score_stream", len(prompt), len(stream.text), time.perf_counter() - start, success=False)
+        raise
+    # Measured to the last chunk, so it includes time the client spent consuming events
+    record_llm_call("score_stream", len(prompt), len(stream.text), time.perf_counter() - start)
+
+    if not stream.text:
+        raise Exception("Empty response from Gemini")
+
+    result = parse_score_response(stream.text)
+    if cache is not None:
+        cache.set(cache_key, list(result))
+    yield 'scored', result
+
 def extract_score(text: str) -> int:
     """Helper function to extract score from text."""
     try:
@@ -125,9 +379,24 @@ def generate_outreach_message(name: str, score: int, message_section: str) -> st
     Recruitment Team
     """
 
-def send_notifications(profile_data: str, score: int, message_section: str) -> bool:
-    """Send email and SMS notifications for high-scoring candidates."""
+def send_notifications(profile_data: str, score: int, message_section: str,
+                       candidate: Optional[str] = None, job_key: str = 'unknown') -> bool:
+    """Queue email and SMS notifications for a high-scoring candidate.
+
+    Delivery happens on the outbox workers, so this returns right away.
+    ``candidate`` (see candidate_key) and ``job_key`` form the dedup key;
+    returns False when every channel had already notified this candidate
+    for this job.
+    """
     #pdb.set_trace()  # Debug: Notification sending
-    
-    print(f"Sent notifications for profile: {profile_data}")
-    return True
+
+    notification = {
+        'candidate': profile_data.split('\n', 1)[0][:200] if isinstance(profile_data, str) else 'Candidate',
+        'score': score,
+        'message': message_section,
+    }
+    queued = get_notification_outbox().enqueue(
+        notification, candidate or candidate_key(profile_data), job_key
+    )
+    print(f"Queued notifications for profile on {queued or 'no new'} channel(s)")
+    return bool(queued)
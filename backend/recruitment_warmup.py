@@ -0,0 +1,79 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('RecruitmentWarmup')
+
+# Configuration (overridable through .env)
+# "background" warms up in a thread (/ready is 503 until done), "sync" before serving, "off" lazily on first use
+WARMUP_MODE = os.getenv('WARMUP_MODE', 'background')
+WARMUP_MODES = ('background', 'sync', 'off')
+
+
+class Warmup:
+    """Named startup steps run once per process, with readiness reporting.
+
+    Steps run in order; a failing step is logged and recorded but does not
+    stop the ones after it, and leaves the process not ready. Until
+    ``start`` is called with a mode other than ``off`` the process counts
+    as ready: everything initializes lazily on first use instead.
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        self.steps = list(steps)
+        self._lock = threading.Lock()
+        self._state = 'idle'
+        self._started_at: Optional[float] = None
+        self._seconds: Optional[float] = None
+        self._step_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+
+    def start(self, mode: str = WARMUP_MODE) -> None:
+        if mode not in WARMUP_MODES:
+            raise ValueError(f"WARMUP_MODE must be one of {list(WARMUP_MODES)}")
+        if mode == 'off':
+            return
+        with self._lock:
+            if self._state != 'idle':
+                return
+            self._state = 'running'
+            self._started_at = time.perf_counter()
+        if mode == 'sync':
+            self._run()
+        else:
+            threading.Thread(target=self._run, name='warmup', daemon=True).start()
+
+    def _run(self) -> None:
+        for name, step in self.steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                logger.error(f"❌ Warmup step {name} failed: {e}")
+                logger.error(traceback.format_exc())
+                with self._lock:
+                    self._errors[name] = str(e)
+            with self._lock:
+                self._step_seconds[name] = round(time.perf_counter() - start, 4)
+        with self._lock:
+            self._seconds = round(time.perf_counter() - self._started_at, 4)
+            self._state = 'failed' if self._errors else 'ready'
+        logger.info(f"🔥 Warmup {self._state} in {self._seconds:.2f}s: {self._step_seconds}")
+
+    @property
+    def ready(self) -> bool:
+        return self._state in ('idle', 'ready')
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'ready': self._state in ('idle', 'ready'),
+                'state': self._state,
+                'pid': os.getpid(),
+                'seconds': self._seconds,
+                'steps': dict(self._step_seconds),
+                'errors': dict(self._errors),
+            }
@@ -0,0 +1,14 @@
+"""WSGI entry point for multi-process servers, e.g.
+
+    gunicorn --workers 4 --threads 8 --bind 0.0.0.0:5000 wsgi:app
+
+Every worker process builds its own app and warms up in the background
+(WARMUP_MODE); point the load balancer's readiness check at /ready, which
+answers 503 until that worker is warm. Don't use --preload: the job queue,
+notification outbox and sheet writer run threads, which do not survive a
+fork. Workers share the SQLite files; job and notification claims are
+atomic across processes.
+"""
+from recruitment_ai import create_app
+
+app = create_app()
@@ -58,16 +58,8 @@ async function extractLinkedInProfile() {
     try {
         await waitForElements(['h1', 'main', '.pv-top-card']);
         
-        // Get all profile sections
-        const allContent = {};
-        const sections = document.querySelectorAll('section.artdeco-card');
-        sections.forEach(section => {
-            const sectionId = section.id || 'section_' + Math.random().toString(36).substr(2, 9);
-            allContent[sectionId] = getAllVisibleText(section);
-        });
-
-        // Basic profile info
-        const introCard = document.querySelector('.pv-top-card');
+        // Compact canonical profile: structured fields plus ONE copy of the page text.
+        // The backend normalizes anything else away, so don't pay to send it.
         const profileData = {
             type: 'linkedin',
             name: document.querySelector('h1')?.innerText?.trim() || '',
@@ -88,18 +80,7 @@ async function extractLinkedInProfile() {
             skills: Array.from(document.querySelectorAll('#skills ~ div .pvs-list .pvs-entity')).map(skill => 
                 skill.querySelector('.t-bold span')?.innerText?.trim() || ''
             ).filter(Boolean),
-            rawContent: {
-                intro: getAllVisibleText(introCard),
-                sections: allContent,
-                fullPage: document.body.innerText
-            },
-            // Include the entire page content in multiple formats
-            content: document.body.innerText,
-            pageContent: {
-                text: document.body.innerText,
-                markdown: convertToMarkdown(document.body),
-                sections: allContent
-            }
+            content: document.body.innerText
         };
 
         console.log('Extracted LinkedIn Profile:', profileData);
@@ -111,8 +92,7 @@ async function extractLinkedInProfile() {
         return {
             type: 'linkedin',
             error: error.message,
-            content: document.body.innerText,
-            rawHtml: document.documentElement.innerHTML
+            content: document.body.innerText
         };
     }
 }
@@ -101,28 +101,48 @@ document.addEventListener('DOMContentLoaded', function() {
         throw new Error('Could not extract profile data after multiple attempts');
       }
 
-      // Send to backend for analysis
-      const response = await fetch('http://localhost:5000/analyze', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ profile: profileData, jobDescription: jobText })
-      });
+      // Stream the analysis so sections render while Gemini is still generating
+      const matchElement = document.getElementById('match-percentage');
+      const matchValue = document.getElementById('match-value');
+      const matchLabel = document.getElementById('match-label');
+      const debugInfo = document.getElementById('debug-info');
+
+      const showScore = (score) => {
+        const matchPercentage = Number.isInteger(score) ? score : 0;
+        matchElement.style.width = `${matchPercentage}%`;
+        matchValue.textContent = `${matchPercentage}%`;
+        return matchPercentage;
+      };
 
-      const data = await response.json();
+      // Pipeline mode streams sections; agent mode would only send the final result
+      const body = { profile: profileData, jobDescription: jobText, mode: 'pipeline' };
+      const data = await streamAnalysis(body, (event, payload) => {
+        if (event === 'score') {
+          showScore(payload.matchScore);
+        } else if (event === 'section') {
+          if (payload.name === 'Match Analysis') {
+            matchLabel.innerHTML = sanitizeAndRender(payload.content);
+          } else if (payload.name === 'Key Qualifications') {
+            qualificationsContent.innerHTML = sanitizeAndRender(payload.content);
+          } else if (payload.name === 'Personalized Message') {
+            messageContent.innerHTML = sanitizeAndRender(payload.content);
+          } else {
+            return;
+          }
+        } else {
+          return;
+        }
+        // First useful section arrived: reveal results while the rest streams in
+        loader.classList.add('hidden');
+        results.classList.remove('hidden');
+      });
       console.log('Analysis response:', data); // Debug logging
       
       // Ensure matchScore is a valid number
-      const matchPercentage = Number.isInteger(data.matchScore) ? data.matchScore : 0;
+      const matchPercentage = showScore(data.matchScore);
       console.log('Match percentage:', matchPercentage); // Debug logging
-      
-      const matchElement = document.getElementById('match-percentage');
-      const matchValue = document.getElementById('match-value');
-      const matchLabel = document.getElementById('match-label');
-      const debugInfo = document.getElementById('debug-info');
 
       // Update UI elements with validation and fallbacks
-      matchElement.style.width = `${matchPercentage}%`;
-      matchValue.textContent = `${matchPercentage}%`;
       matchLabel.innerHTML = data.match_analysis ? 
         sanitizeAndRender(data.match_analysis) : 
         'Score calculation failed';
@@ -153,6 +173,62 @@ document.addEventListener('DOMContentLoaded', function() {
     }
   });
 
+  // Gzip JSON request bodies when the browser supports CompressionStream;
+  // the page text compresses roughly 5-10x.
+  async function encodeJsonBody(body) {
+    const json = JSON.stringify(body);
+    if (typeof CompressionStream === 'undefined') {
+      return { body: json, headers: {} };
+    }
+    const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+    return {
+      body: await new Response(stream).arrayBuffer(),
+      headers: { 'Content-Encoding': 'gzip' }
+    };
+  }
+
+  // POST to /analyze_stream and dispatch Server-Sent Events as they arrive.
+  // Resolves with the final `result` payload (same shape as /analyze).
+  async function streamAnalysis(body, onEvent) {
+    const encoded = await encodeJsonBody(body);
+    const response = await fetch('http://localhost:5000/analyze_stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream', ...encoded.headers },
+      body: encoded.body
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Analysis request failed (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const message = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = 'message';
+        let data = '';
+        message.split('\n').forEach(line => {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        const payload = data ? JSON.parse(data) : {};
+
+        if (event === 'result') return payload;
+        if (event === 'error') throw new Error(payload.details || payload.error || 'Analysis failed');
+        onEvent(event, payload);
+      }
+    }
+    throw new Error('Analysis stream ended without a result');
+  }
+
   function showError(message) {
     const errorDiv = document.createElement('div');
     errorDiv.className = 'error-message';